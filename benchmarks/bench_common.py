@@ -0,0 +1,183 @@
+"""
+Bench Common - Statistik Latency & Perbandingan dengan Baseline
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Dipakai oleh bench_tools.py, bench_scenarios.py, dan bench_load.py:
+- summarize(): p50/p95/p99, mean, dan throughput dari sampel latency
+- LatencyHistogram: histogram log-linear ala HdrHistogram (memori tetap)
+- compare(): bandingkan report dengan baseline JSON, tandai regresi
+- print_comparison(): tabel perbandingan untuk CLI / CI
+
+Format report: {nama_benchmark: {"p50_ms": ..., "p95_ms": ..., "p99_ms": ...,
+"mean_ms": ..., "throughput_per_s": ..., "n": ...}}
+"""
+
+import json
+import math
+import threading
+
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+THROUGHPUT_METRIC = "throughput_per_s"
+
+
+def percentile(ordered, q: float) -> float:
+    """Percentile nearest-rank dari list yang sudah diurutkan."""
+    if not ordered:
+        return 0.0
+    index = max(math.ceil(q * len(ordered)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def summarize(samples, wall_seconds: float = None) -> dict:
+    """
+    Ringkas sampel latency (detik) menjadi statistik benchmark.
+
+    Args:
+        samples: List latency per operasi (detik)
+        wall_seconds: Total waktu wall-clock (default: jumlah sampel)
+    """
+    ordered = sorted(samples)
+    total = wall_seconds if wall_seconds is not None else sum(ordered)
+    return {
+        "n": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 4) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 4),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 4),
+        "throughput_per_s": round(len(ordered) / total, 2) if total > 0 else 0.0,
+    }
+
+
+class LatencyHistogram():
+    """
+    Histogram latency log-linear ala HdrHistogram.
+
+    Nilai disimpan dalam mikrodetik pada bucket 2^k yang masing-masing
+    dibagi `sub_buckets` bagian linear, sehingga error relatif quantile
+    <= 1/sub_buckets berapapun rentang nilainya, dengan memori tetap.
+    Thread-safe; bisa di-merge antar virtual user.
+    """
+
+    def __init__(self, sub_buckets: int = 128):
+        self.sub_buckets = sub_buckets
+        self._sub_bits = sub_buckets.bit_length() - 1
+        self._counts = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def _index(self, value_us: int):
+        magnitude = max(value_us.bit_length() - self._sub_bits - 1, 0)
+        return magnitude, value_us >> magnitude
+
+    def record(self, seconds: float):
+        value_us = max(int(seconds * 1_000_000), 0)
+        index = self._index(value_us)
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.max_us = max(self.max_us, value_us)
+            self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+
+    def merge(self, other: "LatencyHistogram"):
+        with other._lock:
+            counts = dict(other._counts)
+            count, min_us, max_us = other.count, other.min_us, other.max_us
+        with self._lock:
+            for index, n in counts.items():
+                self._counts[index] = self._counts.get(index, 0) + n
+            self.count += count
+            self.max_us = max(self.max_us, max_us)
+            if min_us is not None:
+                self.min_us = min_us if self.min_us is None else min(self.min_us, min_us)
+
+    def percentile_ms(self, q: float) -> float:
+        """Quantile (0..1) dalam milidetik (batas atas bucket)."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = max(math.ceil(q * self.count), 1)
+            seen = 0
+            for magnitude, sub in sorted(self._counts):
+                seen += self._counts[(magnitude, sub)]
+                if seen >= target:
+                    upper = ((sub + 1) << magnitude) - 1
+                    return min(upper, self.max_us) / 1000
+            return self.max_us / 1000
+
+    def to_dict(self) -> dict:
+        spectrum = (0.5, 0.75, 0.9, 0.95, 0.99, 0.999, 0.9999)
+        return {
+            "count": self.count,
+            "min_ms": (self.min_us or 0) / 1000,
+            "max_ms": self.max_us / 1000,
+            "percentiles_ms": {f"p{q * 100:g}": round(self.percentile_ms(q), 3) for q in spectrum},
+        }
+
+
+def load_report(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_report(report: dict, path: str):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.10) -> list:
+    """
+    Bandingkan report dengan baseline.
+
+    Latency naik atau throughput turun lebih dari `tolerance` (relatif)
+    dianggap regresi. Benchmark yang tidak ada di baseline dilewati.
+
+    Returns:
+        list of dict: name, metric, baseline, current, change, regressed
+    """
+    rows = []
+    for name, stats in current.items():
+        base = baseline.get(name)
+        if not isinstance(stats, dict) or not isinstance(base, dict):
+            continue
+        for metric in LATENCY_METRICS + (THROUGHPUT_METRIC,):
+            if metric not in stats or not base.get(metric):
+                continue
+            change = (stats[metric] - base[metric]) / base[metric]
+            if metric == THROUGHPUT_METRIC:
+                regressed = change < -tolerance
+            else:
+                regressed = change > tolerance
+            rows.append({
+                "name": name,
+                "metric": metric,
+                "baseline": base[metric],
+                "current": stats[metric],
+                "change": change,
+                "regressed": regressed,
+            })
+    return rows
+
+
+def print_report(title: str, report: dict):
+    print("=" * 78)
+    print(title)
+    print("=" * 78)
+    print(f"{'benchmark':<36}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>12}")
+    for name, stats in report.items():
+        print(f"{name:<36}{stats['p50_ms']:>10.4f}{stats['p95_ms']:>10.4f}"
+              f"{stats['p99_ms']:>10.4f}{stats['throughput_per_s']:>12,.1f}")
+    print("=" * 78)
+
+
+def print_comparison(rows: list) -> bool:
+    """Cetak tabel perbandingan. Returns: True jika ada regresi."""
+    print(f"{'benchmark':<36}{'metric':<18}{'baseline':>10}{'current':>10}{'change':>9}")
+    for row in rows:
+        flag = "  ❌ REGRESI" if row["regressed"] else ""
+        print(f"{row['name']:<36}{row['metric']:<18}{row['baseline']:>10.4g}"
+              f"{row['current']:>10.4g}{row['change']:>+9.1%}{flag}")
+    regressions = [row for row in rows if row["regressed"]]
+    print(f"\n{len(regressions)} regresi dari {len(rows)} metrik")
+    return bool(regressions)
@@ -0,0 +1,37 @@
+"""
+Bench Compare - Bandingkan Hasil Benchmark dengan Baseline
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Membandingkan p50/p95/p99 latency dan throughput dari report JSON
+(bench_tools.py / bench_scenarios.py --json) dengan baseline tersimpan.
+Exit code 1 jika ada regresi, sehingga bisa dipakai sebagai gate
+sebelum deploy.
+
+Usage:
+    python benchmarks/bench_compare.py current.json baseline.json
+    python benchmarks/bench_compare.py current.json baseline.json --tolerance 0.2
+"""
+
+import argparse
+import sys
+
+from bench_common import compare, load_report, print_comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan report benchmark dengan baseline")
+    parser.add_argument("current", help="Report JSON hasil run terbaru")
+    parser.add_argument("baseline", help="Report JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Toleransi regresi relatif")
+    args = parser.parse_args()
+
+    rows = compare(load_report(args.current), load_report(args.baseline), args.tolerance)
+    if not rows:
+        print("Tidak ada benchmark yang sama antara report dan baseline.")
+        return
+    if print_comparison(rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
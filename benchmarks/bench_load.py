@@ -0,0 +1,267 @@
+"""
+Load Test - Virtual User Concurrent terhadap Orchestrator In-Process
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Mensimulasikan N virtual user (thread) yang terus-menerus mengirim order
+dengan campuran skenario yang bisa diatur, melawan CREW_POOL asli dengan
+stub LLM (FakeLLM) yang latency-nya mengikuti distribusi tertentu.
+
+Beban dinaikkan bertahap (--users 1,2,4,8,...). Untuk setiap level:
+- Histogram latency ala HDR (keseluruhan dan per skenario)
+- Throughput, error rate (per tipe exception)
+- Queue depth: antrian CrewPool, backlog executor LatencyGuard,
+  LLM call in-flight (disampling setiap --sample-ms)
+
+Saturation point: level pertama di mana throughput tidak lagi naik
+signifikan, error rate melewati batas, atau p99 melonjak.
+
+Usage:
+    python benchmarks/bench_load.py --users 1,2,4,8,16 --duration 30
+    python benchmarks/bench_load.py --mix commerce=2,ride=1 --llm-latency lognormal:800:0.6
+    python benchmarks/bench_load.py --users 8,16,32 --pool-size 8 --llm-error-rate 0.02 --json load.json
+"""
+
+import argparse
+import builtins
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+
+# Environment offline harus diset sebelum modul src di-import
+_BENCH_DIR = tempfile.mkdtemp(prefix="hoomi-load-")
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-dummy-key")
+os.environ.setdefault("HOOMI_MEMORY_DB", os.path.join(_BENCH_DIR, "memory.db"))
+os.environ.setdefault("HOOMI_ORDER_DB", os.path.join(_BENCH_DIR, "orders.db"))
+os.environ.setdefault("HOOMI_ACCOUNTING", "0")
+os.environ.setdefault("HOOMI_TRACE", "0")
+os.environ.setdefault("HOOMI_STREAM", "0")
+
+from bench_common import LatencyHistogram, save_report  # noqa: E402
+from bench_scenarios import SCENARIO_INPUTS, auto_answer  # noqa: E402
+from fake_llm import FakeLLM, latency_distribution  # noqa: E402
+
+
+def parse_mix(spec: str) -> dict:
+    """'commerce=2,delivery=1,ride=1' -> bobot per skenario."""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIO_INPUTS:
+            raise ValueError(f"Skenario tidak dikenal: '{name}'")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+class LoadLevel():
+    """Hasil pengukuran satu level jumlah virtual user."""
+
+    def __init__(self, users: int, scenarios):
+        self.users = users
+        self.histogram = LatencyHistogram()
+        self.by_scenario = {scenario: LatencyHistogram() for scenario in scenarios}
+        self.errors = {}
+        self.completed = 0
+        self.queue_samples = []
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, scenario: str, seconds: float, error: BaseException = None):
+        with self._lock:
+            self.completed += 1
+            if error is not None:
+                name = type(error).__name__
+                self.errors[name] = self.errors.get(name, 0) + 1
+        if error is None:
+            self.histogram.record(seconds)
+            self.by_scenario[scenario].record(seconds)
+
+    def to_dict(self) -> dict:
+        errors = sum(self.errors.values())
+        queue = {}
+        for key in ("crew_pool", "latency_guard", "llm_in_flight"):
+            values = [sample[key] for sample in self.queue_samples] or [0]
+            queue[key] = {"mean": round(sum(values) / len(values), 2), "max": max(values)}
+        return {
+            "users": self.users,
+            "completed": self.completed,
+            "throughput_per_s": round(self.completed / self.elapsed, 3) if self.elapsed else 0.0,
+            "error_rate": round(errors / self.completed, 4) if self.completed else 0.0,
+            "errors": dict(self.errors),
+            "latency": self.histogram.to_dict(),
+            "latency_by_scenario": {k: v.to_dict() for k, v in self.by_scenario.items() if v.count},
+            "queue_depth": queue,
+        }
+
+
+def run_level(users: int, duration: float, mix: dict, think_ms: float, budget_s: float,
+              sample_ms: float, fake: FakeLLM, guard, seed: int) -> LoadLevel:
+    from hoomi_events import run_events
+    from hoomi_latency import scenario_budget
+    from hoomi_main import CREW_POOL, approve_payment
+    from hoomi_orders import open_scenario_order, order_scope
+
+    level = LoadLevel(users, mix)
+    scenarios, weights = list(mix), list(mix.values())
+    stop_at = time.monotonic() + duration
+    stopped = threading.Event()
+
+    def virtual_user(index: int):
+        rng = random.Random(seed * 1000 + index)
+        seq = 0
+        while time.monotonic() < stop_at:
+            scenario = rng.choices(scenarios, weights)[0]
+            started = time.perf_counter()
+            error = None
+            try:
+                inputs = dict(SCENARIO_INPUTS[scenario])
+                inputs["order_id"] = open_scenario_order(scenario, inputs, f"vu{index}").order_id
+                inputs["user_id"] = f"vu{index}"
+                with CREW_POOL.acquire(scenario, user_id=f"vu{index}") as crew, \
+                        scenario_budget(budget_s), \
+                        run_events(f"load-{users}-{index}-{seq}", scenario), \
+                        order_scope(inputs["order_id"]):
+                    crew.kickoff(inputs=inputs)
+                    approve_payment(inputs["order_id"])
+            except Exception as e:
+                error = e
+            level.record(scenario, time.perf_counter() - started, error)
+            seq += 1
+            if think_ms:
+                time.sleep(rng.expovariate(1 / think_ms) / 1000)
+
+    def sampler():
+        while not stopped.wait(sample_ms / 1000):
+            level.queue_samples.append({
+                "crew_pool": CREW_POOL.waiting(),
+                "latency_guard": guard.backlog() if guard is not None else 0,
+                "llm_in_flight": fake.in_flight,
+            })
+
+    threads = [threading.Thread(target=virtual_user, args=(i,), daemon=True, name=f"hoomi-vu-{i}")
+               for i in range(users)]
+    sampler_thread = threading.Thread(target=sampler, daemon=True, name="hoomi-load-sampler")
+
+    started = time.perf_counter()
+    sampler_thread.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    level.elapsed = time.perf_counter() - started
+    stopped.set()
+    sampler_thread.join()
+    return level
+
+
+def find_saturation(levels: list, min_gain: float = 0.10, max_error_rate: float = 0.01,
+                    p99_factor: float = 3.0) -> dict:
+    """
+    Tentukan saturation point dari hasil per level.
+
+    Level dianggap jenuh jika dibanding level sebelumnya throughput naik
+    kurang dari `min_gain` (relatif), atau error rate > `max_error_rate`,
+    atau p99 > `p99_factor` x p99 level pertama.
+    """
+    if not levels:
+        return None
+    base_p99 = levels[0]["latency"]["percentiles_ms"]["p99"] or None
+    for prev, level in zip(levels, levels[1:]):
+        reasons = []
+        if level["throughput_per_s"] < prev["throughput_per_s"] * (1 + min_gain):
+            reasons.append("throughput tidak naik")
+        if level["error_rate"] > max_error_rate:
+            reasons.append(f"error rate {level['error_rate']:.1%}")
+        p99 = level["latency"]["percentiles_ms"]["p99"]
+        if base_p99 and p99 > base_p99 * p99_factor:
+            reasons.append(f"p99 {p99:,.0f} ms > {p99_factor:g}x baseline")
+        if reasons:
+            return {
+                "saturated_at_users": level["users"],
+                "max_sustainable_users": prev["users"],
+                "max_throughput_per_s": max(prev["throughput_per_s"], level["throughput_per_s"]),
+                "reasons": reasons,
+            }
+    return {"saturated_at_users": None, "max_sustainable_users": levels[-1]["users"],
+            "max_throughput_per_s": levels[-1]["throughput_per_s"], "reasons": []}
+
+
+def print_level(level: dict):
+    p = level["latency"]["percentiles_ms"]
+    queue = level["queue_depth"]
+    print(f"{level['users']:>5} VU  {level['throughput_per_s']:>8.2f}/s  "
+          f"p50 {p['p50']:>9,.0f}  p99 {p['p99']:>9,.0f}  p99.9 {p['p99.9']:>9,.0f} ms  "
+          f"err {level['error_rate']:>6.1%}  "
+          f"queue pool {queue['crew_pool']['mean']:>5.1f}/{queue['crew_pool']['max']:<3} "
+          f"guard {queue['latency_guard']['max']:<3} llm {queue['llm_in_flight']['max']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test orchestrator Hoomi (in-process, stub LLM)")
+    parser.add_argument("--users", default="1,2,4,8,16", help="Level virtual user, dipisah koma")
+    parser.add_argument("--duration", type=float, default=30, help="Durasi per level (detik)")
+    parser.add_argument("--mix", default="commerce=1,delivery=1,ride=1", help="Bobot skenario")
+    parser.add_argument("--llm-latency", default="lognormal:800:0.5",
+                        help="Distribusi latency stub LLM (const/uniform/exp/lognormal, ms)")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Probabilitas error per LLM call")
+    parser.add_argument("--think-ms", type=float, default=0, help="Mean think time antar request per user")
+    parser.add_argument("--pool-size", type=int, help="Override CREW_POOL.max_size per skenario")
+    parser.add_argument("--guard-workers", type=int, default=32, help="Worker executor LatencyGuard")
+    parser.add_argument("--no-guard", action="store_true", help="Tanpa LatencyGuard")
+    parser.add_argument("--budget-s", type=float, default=300, help="Budget waktu per skenario")
+    parser.add_argument("--sample-ms", type=float, default=100, help="Interval sampling queue depth")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    from hoomi_events import install as install_events
+    from hoomi_latency import LatencyGuard, LatencyPolicy
+    from hoomi_main import CREW_POOL
+
+    mix = parse_mix(args.mix)
+    fake = FakeLLM(latency=latency_distribution(args.llm_latency, args.seed),
+                   error_rate=args.llm_error_rate, seed=args.seed).install()
+    guard = None
+    if not args.no_guard:
+        guard = LatencyGuard(LatencyPolicy.from_env(), max_workers=args.guard_workers).install()
+    install_events()
+    if args.pool_size:
+        CREW_POOL.max_size = args.pool_size
+
+    # HITL auto-approve untuk semua virtual user
+    builtins.input = auto_answer()
+
+    print("=" * 110)
+    print(f"🔥 LOAD TEST  mix={args.mix}  llm={args.llm_latency}  err={args.llm_error_rate:.1%}  "
+          f"pool={CREW_POOL.max_size}  guard_workers={args.guard_workers if guard else '-'}")
+    print("=" * 110)
+
+    levels = []
+    with open(os.devnull, "w") as devnull:
+        for users in [int(u) for u in args.users.split(",") if u.strip()]:
+            with redirect_stdout(devnull):
+                level = run_level(users, args.duration, mix, args.think_ms, args.budget_s,
+                                  args.sample_ms, fake, guard, args.seed).to_dict()
+            levels.append(level)
+            print_level(level)
+
+    saturation = find_saturation(levels)
+    print("=" * 110)
+    if saturation["saturated_at_users"] is None:
+        print(f"✅ Belum jenuh sampai {saturation['max_sustainable_users']} VU "
+              f"({saturation['max_throughput_per_s']:.2f} order/s)")
+    else:
+        print(f"📈 Saturation point: {saturation['saturated_at_users']} VU "
+              f"({', '.join(saturation['reasons'])}); maksimum sehat {saturation['max_sustainable_users']} VU, "
+              f"{saturation['max_throughput_per_s']:.2f} order/s")
+
+    if args.json:
+        save_report({"config": vars(args), "levels": levels, "saturation": saturation,
+                     "fake_llm": dict(fake.stats), "crew_pool": dict(CREW_POOL.stats)}, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Benchmark Skenario - End-to-End Commerce, Delivery, dan Ride secara Offline
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Menjalankan crew asli dari hoomi_main (CREW_POOL, hierarchical process,
+tools, memory) dengan:
+- FakeLLM (replay file atau scripted ReAct) sebagai pengganti Gemini
+- HITL auto-approve (input() dijawab otomatis; pembayaran disetujui
+  lewat hoomi_main.approve_payment seperti di CLI)
+- Layer produksi (latency guard, events, accounting) kecuali --bare
+
+Setiap skenario dijalankan --warmup kali (tidak diukur) lalu --runs kali.
+Hasil: p50/p95/p99 latency, throughput, LLM/tool call per run.
+
+Usage:
+    python benchmarks/bench_scenarios.py --runs 20
+    python benchmarks/bench_scenarios.py --replay benchmarks/replay.json --llm-latency-ms 300
+    python benchmarks/bench_scenarios.py --json scenarios.json
+    python benchmarks/bench_scenarios.py --baseline baseline_scenarios.json
+"""
+
+import argparse
+import builtins
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, redirect_stdout
+
+# Environment offline harus diset sebelum modul src di-import
+_BENCH_DIR = tempfile.mkdtemp(prefix="hoomi-bench-")
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-dummy-key")
+os.environ.setdefault("HOOMI_MEMORY_DB", os.path.join(_BENCH_DIR, "memory.db"))
+os.environ.setdefault("HOOMI_ORDER_DB", os.path.join(_BENCH_DIR, "orders.db"))
+os.environ.setdefault("HOOMI_ACCOUNTING_LOG", os.path.join(_BENCH_DIR, "accounting.jsonl"))
+os.environ.setdefault("HOOMI_TRACE", "0")
+os.environ.setdefault("HOOMI_STREAM", "0")
+
+from bench_common import compare, load_report, print_comparison, print_report, save_report, summarize  # noqa: E402
+from fake_llm import FakeLLM, load_replay  # noqa: E402
+
+# Input contoh per skenario (format sama dengan hoomi_main.scenario_*)
+SCENARIO_INPUTS = {
+    "commerce": {
+        "product_query": "nasi goreng pedas",
+        "user_location": "Jl. Sudirman No. 123, Jakarta Pusat",
+        "destination": "Jl. Sudirman No. 123, Jakarta Pusat",
+        "product_info": "nasi goreng pedas",
+        "total_amount": "50,000",
+        "recipient_id": "MERCHANT_TBD",
+        "payment_description": "Pembelian nasi goreng pedas + Delivery",
+    },
+    "delivery": {
+        "pickup_address": "Jl. Thamrin No. 1, Jakarta",
+        "destination_address": "Jl. Gatot Subroto No. 52, Jakarta",
+        "package_description": "Dokumen",
+        "total_amount": "25,000",
+        "recipient_id": "DELIVERY_SERVICE",
+        "payment_description": "Pengiriman Dokumen",
+    },
+    "ride": {
+        "pickup_location": "Stasiun Sudirman",
+        "destination": "Bandara Soekarno-Hatta",
+        "passenger_count": "2",
+        "total_amount": "35,000",
+        "recipient_id": "RIDE_SERVICE",
+        "payment_description": "Perjalanan untuk 2 penumpang",
+    },
+}
+
+
+def auto_answer(approval: str = "yes", feedback: str = ""):
+    """
+    Fungsi pengganti input() untuk HITL otomatis.
+
+    Prompt approval "(yes/no)" (mis. pembayaran) dijawab `approval`; prompt
+    lain (feedback human_input CrewAI) dijawab `feedback`, default "" (Enter)
+    = terima hasil tanpa feedback tambahan.
+    """
+    return lambda prompt="": approval if "(yes/no)" in str(prompt) else feedback
+
+
+@contextmanager
+def auto_approve(approval: str = "yes", feedback: str = ""):
+    """Jawab semua prompt HITL secara otomatis (lihat auto_answer)."""
+    original = builtins.input
+    builtins.input = auto_answer(approval, feedback)
+    try:
+        yield
+    finally:
+        builtins.input = original
+
+
+class ToolCallCounter():
+    """Middleware penghitung tool call (thread-safe)."""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, call, proceed):
+        with self._lock:
+            self.count += 1
+        return proceed()
+
+
+def install_stack(bare: bool):
+    """Pasang layer produksi seperti hoomi_main.main()."""
+    if bare:
+        return
+    from hoomi_accounting import install_accounting
+    from hoomi_events import install as install_events
+    from hoomi_latency import LatencyGuard, LatencyPolicy
+    from hoomi_tracing import install_tracing
+
+    LatencyGuard(LatencyPolicy.from_env()).install()
+    install_events()
+    install_tracing()
+    install_accounting()
+
+
+def run_scenario(scenario: str, runs: int, warmup: int, fake: FakeLLM, tools: ToolCallCounter,
+                 budget_s: float, verbose: bool) -> dict:
+    from hoomi_events import hitl_input, run_events
+    from hoomi_latency import scenario_budget
+    from hoomi_main import CREW_POOL, approve_payment
+    from hoomi_orders import open_scenario_order, order_scope
+
+    samples = []
+    llm_calls = tool_calls = 0
+    sink = sys.stdout if verbose else open(os.devnull, "w")
+
+    try:
+        started = None
+        for i in range(warmup + runs):
+            if i == warmup:
+                started = time.perf_counter()
+                llm_before, tools_before = fake.stats["calls"], tools.count
+
+            # Satu order baru per run, seperti hoomi_main
+            inputs = dict(SCENARIO_INPUTS[scenario])
+            inputs["order_id"] = open_scenario_order(scenario, inputs, "bench").order_id
+            inputs["user_id"] = "bench"
+            t = time.perf_counter()
+            with redirect_stdout(sink), \
+                    CREW_POOL.acquire(scenario, user_id="bench") as crew, \
+                    scenario_budget(budget_s), \
+                    run_events(f"bench-{scenario}-{i}", scenario), \
+                    order_scope(inputs["order_id"]), \
+                    auto_approve(), hitl_input():
+                crew.kickoff(inputs=inputs)
+                approve_payment(inputs["order_id"])
+            if i >= warmup:
+                samples.append(time.perf_counter() - t)
+
+        wall = time.perf_counter() - started
+        llm_calls = fake.stats["calls"] - llm_before
+        tool_calls = tools.count - tools_before
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+
+    stats = summarize(samples, wall)
+    stats["llm_calls_per_run"] = round(llm_calls / runs, 2)
+    stats["tool_calls_per_run"] = round(tool_calls / runs, 2)
+    return stats
+
+
+def run(scenarios, runs: int, warmup: int, replay: str = None, llm_latency_ms: float = 0,
+        bare: bool = False, budget_s: float = 300, verbose: bool = False) -> dict:
+    from hoomi_hooks import TOOL, register_middleware
+
+    latency = (lambda: llm_latency_ms / 1000) if llm_latency_ms else None
+    fake = FakeLLM(replay=load_replay(replay), latency=latency).install()
+    tools = ToolCallCounter()
+    register_middleware(tools, kinds=(TOOL,), priority=999)
+    install_stack(bare)
+
+    report = {}
+    for scenario in scenarios:
+        report[f"scenario/{scenario}"] = run_scenario(scenario, runs, warmup, fake, tools, budget_s, verbose)
+    report["_fake_llm"] = dict(fake.stats)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end skenario Hoomi (offline)")
+    parser.add_argument("--scenarios", default="commerce,delivery,ride")
+    parser.add_argument("--runs", type=int, default=10, help="Run terukur per skenario")
+    parser.add_argument("--warmup", type=int, default=1, help="Run warm-up per skenario")
+    parser.add_argument("--replay", help="File replay LLM (lihat fake_llm.RecordingLLM)")
+    parser.add_argument("--llm-latency-ms", type=float, default=0, help="Delay simulasi per LLM call")
+    parser.add_argument("--bare", action="store_true", help="Tanpa latency guard/events/accounting")
+    parser.add_argument("--verbose", action="store_true", help="Tampilkan output verbose CrewAI")
+    parser.add_argument("--json", help="Simpan hasil ke file JSON (bisa dipakai sebagai baseline)")
+    parser.add_argument("--baseline", help="Bandingkan dengan baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Toleransi regresi relatif")
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    report = run(scenarios, args.runs, args.warmup, args.replay, args.llm_latency_ms,
+                 args.bare, verbose=args.verbose)
+
+    print_report("🧪 SCENARIO BENCHMARK (offline LLM, HITL auto-approve)",
+                 {k: v for k, v in report.items() if k.startswith("scenario/")})
+    for name, stats in report.items():
+        if name.startswith("scenario/"):
+            print(f"{name:<36} LLM call/run {stats['llm_calls_per_run']:>6}   "
+                  f"tool call/run {stats['tool_calls_per_run']:>6}")
+    fake = report["_fake_llm"]
+    print(f"FakeLLM: {fake['calls']} call ({fake['replay_hits']} replay, {fake['scripted']} scripted)")
+
+    if args.json:
+        save_report(report, args.json)
+
+    if args.baseline:
+        rows = compare(report, load_report(args.baseline), args.tolerance)
+        if print_comparison(rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark Startup - Waktu Import & Waktu Respon Pertama
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Mengukur untuk hoomi_main.py dan main.py (Meeting Prep):
+1. Import time   - waktu `import <modul>` di proses baru
+2. First response - waktu dari start proses sampai prompt/menu pertama tampil
+3. Heavy import  - waktu `import crewai` sebagai pembanding (jika terinstall)
+
+Setiap pengukuran dijalankan di subprocess baru (cold start) sebanyak
+--runs kali, lalu dilaporkan median/min/max.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# Marker output pertama yang dianggap "respon pertama" per entry point
+ENTRY_POINTS = {
+    "hoomi_main": ("hoomi_main.py", "PILIH LAYANAN", "0\n"),
+    "main": ("main.py", "Welcome to the Meeting Prep Crew", "\n\n\n"),
+}
+
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault("GOOGLE_API_KEY", "benchmark-dummy-key")
+    env["PYTHONUNBUFFERED"] = "1"
+    return env
+
+
+def measure_import(module: str) -> float:
+    """Waktu import satu modul di proses baru (detik)."""
+    code = (
+        "import time, sys; t = time.perf_counter(); "
+        f"import {module}; "
+        "sys.stdout.write(repr(time.perf_counter() - t))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=SRC_DIR, env=_env(),
+        capture_output=True, text=True, check=True
+    ).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def measure_first_response(script: str, marker: str, stdin_data: str) -> float:
+    """Waktu dari spawn proses sampai `marker` muncul di stdout (detik)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, script], cwd=SRC_DIR, env=_env(),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    elapsed = None
+    try:
+        for line in proc.stdout:
+            if marker in line:
+                elapsed = time.perf_counter() - start
+                break
+        proc.stdin.write(stdin_data)
+        proc.stdin.flush()
+    except (BrokenPipeError, OSError):
+        pass
+    finally:
+        proc.kill()
+        proc.wait()
+
+    if elapsed is None:
+        raise RuntimeError(f"Marker '{marker}' tidak ditemukan pada output {script}")
+    return elapsed
+
+
+def _summary(samples):
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 2),
+        "min_ms": round(min(samples) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+        "runs": len(samples),
+    }
+
+
+def run(runs: int) -> dict:
+    report = {}
+    for name, (script, marker, stdin_data) in ENTRY_POINTS.items():
+        report[name] = {
+            "import": _summary([measure_import(name) for _ in range(runs)]),
+            "first_response": _summary(
+                [measure_first_response(script, marker, stdin_data) for _ in range(runs)]
+            ),
+        }
+
+    try:
+        report["crewai_import"] = _summary([measure_import("crewai") for _ in range(runs)])
+    except subprocess.CalledProcessError:
+        report["crewai_import"] = None  # crewai tidak terinstall di environment ini
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark startup Hoomi & Meeting Prep")
+    parser.add_argument("--runs", type=int, default=5, help="Jumlah cold start per pengukuran")
+    parser.add_argument("--json", help="Simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    report = run(args.runs)
+
+    print("=" * 60)
+    print("⏱️  STARTUP BENCHMARK")
+    print("=" * 60)
+    for name, result in report.items():
+        if result is None:
+            print(f"{name:<16} (tidak tersedia)")
+        elif "import" in result:
+            print(f"{name:<16} import: {result['import']['median_ms']:>9.2f} ms   "
+                  f"first response: {result['first_response']['median_ms']:>9.2f} ms")
+        else:
+            print(f"{name:<16} import: {result['median_ms']:>9.2f} ms")
+    print("=" * 60)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
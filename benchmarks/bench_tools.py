@@ -0,0 +1,96 @@
+"""
+Benchmark Tools - Microbenchmark Setiap Tool di hoomi_tools.py
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Untuk setiap tool di HOOMI_TOOLS diukur tiga jalur pemanggilan:
+1. raw      - fungsi asli (tanpa dispatcher)
+2. dispatch - tool.func melalui dispatcher hoomi_hooks (middleware aktif)
+3. crewai   - tool.run() CrewAI (validasi argumen + dispatcher)
+
+Argumen contoh diambil dari fake_llm.TOOL_SAMPLE_ARGS; "{order_id}" diisi
+order contoh di order store sementara sehingga tool order (pay_wallet,
+track_delivery, assign_order_driver) mengukur jalur order yang ditemukan.
+
+Usage:
+    python benchmarks/bench_tools.py --iterations 20000
+    python benchmarks/bench_tools.py --json tools.json
+    python benchmarks/bench_tools.py --baseline baseline_tools.json --tolerance 0.15
+"""
+
+import argparse
+import builtins
+import os
+import sys
+import tempfile
+import time
+
+# Order store sementara harus diset sebelum modul src di-import
+os.environ.setdefault("HOOMI_ORDER_DB", os.path.join(tempfile.mkdtemp(prefix="hoomi-tools-"), "orders.db"))
+
+from bench_common import compare, load_report, print_comparison, print_report, save_report, summarize  # noqa: E402
+from fake_llm import sample_args  # noqa: E402
+
+
+def measure(func, kwargs: dict, iterations: int, warmup: int = 100) -> dict:
+    """Latency per panggilan `func(**kwargs)` sebanyak `iterations` kali."""
+    for _ in range(warmup):
+        func(**kwargs)
+
+    samples = []
+    clock = time.perf_counter
+    started = clock()
+    for _ in range(iterations):
+        t = clock()
+        func(**kwargs)
+        samples.append(clock() - t)
+    return summarize(samples, clock() - started)
+
+
+def run(iterations: int) -> dict:
+    from hoomi_hooks import original_func
+    from hoomi_orders import get_order_store
+    from hoomi_tools import HOOMI_TOOLS
+
+    order = get_order_store().create_order("bench", "commerce", "Nasi Goreng", amount_idr=50000,
+                                           destination="Jl. Sudirman No. 123, Jakarta Pusat")
+    # Tool HITL tidak boleh menunggu stdin selama benchmark
+    original_input = builtins.input
+    builtins.input = lambda prompt="": "yes"
+    report = {}
+    try:
+        for tool in HOOMI_TOOLS:
+            kwargs = sample_args(tool.name, order.order_id)
+            if kwargs is None:
+                continue
+            name = original_func(tool).__name__
+            report[f"{name}/raw"] = measure(original_func(tool), kwargs, iterations)
+            report[f"{name}/dispatch"] = measure(tool.func, kwargs, iterations)
+            if hasattr(tool, "run"):
+                report[f"{name}/crewai"] = measure(tool.run, kwargs, max(iterations // 10, 1))
+    finally:
+        builtins.input = original_input
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark tool Hoomi")
+    parser.add_argument("--iterations", type=int, default=10000, help="Panggilan per tool")
+    parser.add_argument("--json", help="Simpan hasil ke file JSON (bisa dipakai sebagai baseline)")
+    parser.add_argument("--baseline", help="Bandingkan dengan baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Toleransi regresi relatif")
+    args = parser.parse_args()
+
+    report = run(args.iterations)
+    print_report("🔧 TOOL MICROBENCHMARK", report)
+
+    if args.json:
+        save_report(report, args.json)
+
+    if args.baseline:
+        rows = compare(report, load_report(args.baseline), args.tolerance)
+        if print_comparison(rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark VRP - Waktu Solve Batching Multi-Stop vs Jumlah Order
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Order sintetis dibangkitkan berkelompok di sekitar beberapa merchant di
+Jakarta (seperti jam makan siang), lalu hoomi_vrp.plan_batch di-solve untuk
+setiap ukuran batch. Selain latency, dicatat juga kualitas solusi: jumlah
+driver terpakai dan penghematan km dibanding satu trip per order.
+
+Usage:
+    python benchmarks/bench_vrp.py --sizes 10 25 50 100 200 --repeats 5
+    python benchmarks/bench_vrp.py --json vrp.json
+    python benchmarks/bench_vrp.py --baseline baseline_vrp.json --tolerance 0.15
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from bench_common import compare, load_report, print_comparison, print_report, save_report, summarize
+import fake_llm  # noqa: F401 - menambahkan src/ ke sys.path
+
+JAKARTA_CENTER = (-6.2000, 106.8200)
+
+
+def synth_orders(n: int, rng: random.Random) -> list:
+    from hoomi_vrp import VRPOrder
+
+    merchants = [
+        (JAKARTA_CENTER[0] + rng.uniform(-0.08, 0.08), JAKARTA_CENTER[1] + rng.uniform(-0.08, 0.08))
+        for _ in range(max(1, n // 8))
+    ]
+    orders = []
+    for i in range(n):
+        lat, lon = rng.choice(merchants)
+        ready = rng.uniform(0, 30)
+        orders.append(VRPOrder(
+            f"ORD{i:05d}", (lat, lon), (lat + rng.uniform(-0.05, 0.05), lon + rng.uniform(-0.05, 0.05)),
+            size=rng.choice((1, 1, 1, 2)), ready_min=ready, due_min=ready + rng.uniform(40, 75),
+        ))
+    return orders
+
+
+def run(sizes: list, repeats: int, time_limit_s: float, seed: int = 7) -> dict:
+    from hoomi_vrp import plan_batch
+
+    rng = random.Random(seed)
+    report = {}
+    for n in sizes:
+        samples, quality = [], []
+        for _ in range(repeats):
+            orders = synth_orders(n, rng)
+            t = time.perf_counter()
+            result = plan_batch(orders, time_limit_s=time_limit_s)
+            samples.append(time.perf_counter() - t)
+            quality.append(dict(result["stats"], unassigned=len(result["unassigned"])))
+        stats = summarize(samples)
+        stats["vehicles_used"] = round(sum(q["vehicles_used"] for q in quality) / repeats, 1)
+        stats["savings_pct"] = round(sum(q["savings_pct"] for q in quality) / repeats, 1)
+        stats["unassigned"] = round(sum(q["unassigned"] for q in quality) / repeats, 1)
+        report[f"vrp/{n}_orders"] = stats
+        print(f"   {n:>5} order: p50 {stats['p50_ms']:.1f} ms, {stats['vehicles_used']} driver, "
+              f"hemat {stats['savings_pct']}% km")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark solve time VRP Hoomi")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 25, 50, 100, 200], help="Jumlah order per batch")
+    parser.add_argument("--repeats", type=int, default=5, help="Batch acak per ukuran")
+    parser.add_argument("--time-limit", type=float, default=0.5, help="Batas waktu local search (detik)")
+    parser.add_argument("--json", help="Simpan hasil ke file JSON (bisa dipakai sebagai baseline)")
+    parser.add_argument("--baseline", help="Bandingkan dengan baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Toleransi regresi relatif")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.repeats, args.time_limit)
+    print_report("🛵 VRP SOLVE TIME", report)
+
+    if args.json:
+        save_report(report, args.json)
+
+    if args.baseline:
+        rows = compare(report, load_report(args.baseline), args.tolerance)
+        if print_comparison(rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
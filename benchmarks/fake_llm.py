@@ -0,0 +1,298 @@
+"""
+Fake LLM - Replay / Scripted LLM untuk Benchmark Offline
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Dipasang sebagai middleware hoomi_hooks paling dalam (priority 1000):
+LLM call tetap melewati semua layer (latency guard, tracing, accounting),
+tetapi tidak pernah sampai ke Gemini. Respon diambil dari:
+
+1. Replay file - respon yang direkam dari run asli (RecordingLLM), di-key
+   dengan hash label LLM + isi messages
+2. Scripted policy - respon format ReAct CrewAI yang dibuat dari prompt:
+   - Manager: "Delegate work to coworker" sekali per task, lalu Final Answer
+   - Agent: panggil sampai `max_tool_calls` tool Hoomi yang tersedia
+     (argumen contoh dari TOOL_SAMPLE_ARGS, "{order_id}" diisi order run
+     yang sedang berjalan), lalu Final Answer
+
+Latency LLM dapat disimulasikan dengan callable `latency() -> detik`
+(lihat latency_distribution) dan error provider dengan `error_rate`.
+"""
+
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from hoomi_hooks import LLM_CALL, register_middleware  # noqa: E402
+from hoomi_orders import current_order_id  # noqa: E402
+from hoomi_tracing import messages_text  # noqa: E402
+
+# Order contoh jika tidak ada order_scope aktif
+SAMPLE_ORDER_ID = "ORD123456"
+
+# Argumen contoh per nama tool CrewAI (juga dipakai bench_tools.py, lihat sample_args)
+TOOL_SAMPLE_ARGS = {
+    "Check Product Stock": {"product_name": "Nasi Goreng", "merchant_id": "MERCH001"},
+    "Search Product Catalog": {"query": "nasi goreng pedas", "category": "food"},
+    "Geocode Address": {"address": "Jl. Sudirman No. 123, Jakarta Pusat"},
+    "Calculate Delivery Route": {
+        "pickup_lat": -6.2088, "pickup_lon": 106.8456, "dest_lat": -6.1751, "dest_lon": 106.8650
+    },
+    "Find Nearest Driver": {"latitude": -6.2088, "longitude": 106.8456, "vehicle_type": "motorcycle"},
+    "Find Shared Ride Pool": {
+        "pickup_lat": -6.2088, "pickup_lon": 106.8456, "dest_lat": -6.1751, "dest_lon": 106.8650,
+        "passenger_count": 1
+    },
+    "Plan Multi-Stop Delivery Batch": {
+        "orders": '[{"order_id": "ORD1", "pickup_lat": -6.2088, "pickup_lon": 106.8456, "dest_lat": -6.1751, '
+                  '"dest_lon": 106.8650}, {"order_id": "ORD2", "pickup_lat": -6.2090, "pickup_lon": 106.8460, '
+                  '"dest_lat": -6.1820, "dest_lon": 106.8300, "due_min": 45}]'
+    },
+    "Process Payment - Requires User Approval": {
+        "amount": 50000, "recipient": "MERCH001", "description": "Pembayaran Nasi Goreng + Delivery",
+        "order_id": "{order_id}"
+    },
+    "Get User GPS Location - Requires Permission": {},
+    "Track Delivery Real-Time": {"order_id": "{order_id}"},
+    "Assign Driver to Order": {"order_id": "{order_id}", "driver_id": "DRV123"},
+    "Send Notification to User": {
+        "user_id": "USER123", "message": "Driver sudah dalam perjalanan!", "notification_type": "info"
+    },
+}
+
+DELEGATE_TOOL = "Delegate work to coworker"
+
+# Kata kunci task -> kata kunci role coworker yang dipilih manager
+_DELEGATION_HINTS = (
+    (("bayar", "payment", "pembayaran", "wallet", "transaksi"), "merchant"),
+    (("produk", "product", "katalog", "beli"), "storefront"),
+    (("rute", "route", "driver", "antar", "jemput", "kirim", "delivery", "ride"), "fleet"),
+)
+
+_TOOL_NAME_RE = re.compile(r"^Tool Name: (.+?)\s*$", re.M)
+_ACTION_RE = re.compile(r"^Action: (.+?)\s*$", re.M)
+_COWORKERS_RE = re.compile(r"following coworkers: (.+?)\n")
+_TASK_RE = re.compile(r"Current Task: (.+?)(?:\n\n|\Z)", re.S)
+
+
+def sample_args(tool_name: str, order_id: str = None) -> dict:
+    """Argumen contoh tool dengan "{order_id}" diisi order run aktif (atau SAMPLE_ORDER_ID)."""
+    args = TOOL_SAMPLE_ARGS.get(tool_name)
+    if args is None:
+        return None
+    order_id = order_id or current_order_id() or SAMPLE_ORDER_ID
+    return {key: order_id if value == "{order_id}" else value for key, value in args.items()}
+
+
+class FakeLLMError(RuntimeError):
+    """Error provider yang disimulasikan (rate limit, 5xx, dsb)."""
+
+
+def latency_distribution(spec: str, seed: int = None):
+    """
+    Buat sampler latency LLM dari spesifikasi (milidetik).
+
+    Format:
+        const:800            - selalu 800 ms
+        uniform:200:1200     - uniform 200..1200 ms
+        exp:800              - eksponensial dengan mean 800 ms
+        lognormal:800:0.5    - lognormal dengan median 800 ms, sigma 0.5
+
+    Returns:
+        callable() -> detik, atau None jika spec kosong
+    """
+    if not spec:
+        return None
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+    rng = random.Random(seed)
+
+    if kind == "const":
+        return lambda: values[0] / 1000
+    if kind == "uniform":
+        return lambda: rng.uniform(values[0], values[1]) / 1000
+    if kind == "exp":
+        return lambda: rng.expovariate(1 / values[0]) / 1000
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        sigma = values[1] if len(values) > 1 else 0.5
+        return lambda: rng.lognormvariate(mu, sigma) / 1000
+    raise ValueError(f"Distribusi latency tidak dikenal: '{spec}'")
+
+
+def llm_key(label: str, messages) -> str:
+    """Key replay: hash label LLM + isi messages."""
+    digest = hashlib.sha1()
+    digest.update((label or "").encode())
+    digest.update(b"\0")
+    digest.update(messages_text(messages).encode())
+    return digest.hexdigest()
+
+
+def load_replay(path: str) -> dict:
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+class FakeLLM():
+    """
+    Pengganti LLM offline untuk benchmark.
+
+    Args:
+        replay: dict {llm_key: respon} (lihat RecordingLLM)
+        latency: Callable tanpa argumen -> detik delay per call (opsional)
+        max_tool_calls: Jumlah tool call agent sebelum Final Answer
+        error_rate: Probabilitas call gagal dengan FakeLLMError
+        seed: Seed random untuk error injection
+
+    Contoh:
+        fake = FakeLLM(replay=load_replay("replay.json")).install()
+        ...
+        fake.uninstall()
+    """
+
+    def __init__(self, replay: dict = None, latency=None, max_tool_calls: int = 2,
+                 error_rate: float = 0.0, seed: int = None):
+        self.replay = replay or {}
+        self.latency = latency
+        self.max_tool_calls = max_tool_calls
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._unregister = None
+        self.in_flight = 0
+        self.stats = {"calls": 0, "replay_hits": 0, "scripted": 0, "errors": 0}
+
+    def install(self, priority: int = 1000):
+        if self._unregister is None:
+            self._unregister = register_middleware(self, kinds=(LLM_CALL,), priority=priority)
+        return self
+
+    def uninstall(self):
+        if self._unregister is not None:
+            self._unregister()
+            self._unregister = None
+
+    def __call__(self, call, proceed):
+        messages = call.kwargs.get("messages", call.args[0] if call.args else None)
+        with self._lock:
+            self.stats["calls"] += 1
+            self.in_flight += 1
+            failed = self.error_rate > 0 and self._rng.random() < self.error_rate
+        try:
+            if self.latency is not None:
+                delay = self.latency()
+                if delay > 0:
+                    time.sleep(delay)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+        if failed:
+            with self._lock:
+                self.stats["errors"] += 1
+            raise FakeLLMError(f"Simulasi error provider untuk LLM '{call.name}'")
+
+        response = self.replay.get(llm_key(call.name, messages))
+        with self._lock:
+            self.stats["replay_hits" if response is not None else "scripted"] += 1
+        if response is not None:
+            return response
+        return self.script(messages)
+
+    # ==========================================
+    # SCRIPTED POLICY
+    # ==========================================
+
+    def script(self, messages) -> str:
+        """Respon ReAct CrewAI berdasarkan prompt dan riwayat percakapan."""
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        prompt = "\n".join(m.get("content") or "" for m in messages if m.get("role") != "assistant")
+        history = "\n".join(m.get("content") or "" for m in messages if m.get("role") == "assistant")
+
+        used = _ACTION_RE.findall(history)
+        tools = _TOOL_NAME_RE.findall(prompt)
+
+        if DELEGATE_TOOL in tools:
+            if used:
+                return _final_answer("Semua langkah sudah didelegasikan dan diselesaikan oleh coworker.")
+            return _action(DELEGATE_TOOL, self._delegation(prompt))
+
+        if len(used) < self.max_tool_calls:
+            for name in tools:
+                if name in TOOL_SAMPLE_ARGS and name not in used:
+                    return _action(name, sample_args(name))
+
+        return _final_answer("Proses selesai. Ringkasan: produk tersedia, driver ditemukan, "
+                             "estimasi biaya Rp 35,000, menunggu konfirmasi pembayaran.")
+
+    def _delegation(self, prompt: str) -> dict:
+        task_match = _TASK_RE.search(prompt)
+        task = task_match.group(1).strip() if task_match else "Selesaikan task berikut."
+        coworkers_match = _COWORKERS_RE.search(prompt)
+        coworkers = [c.strip() for c in coworkers_match.group(1).split(",")] if coworkers_match else []
+
+        coworker = coworkers[0] if coworkers else "Fleet & Delivery Coordinator"
+        lowered = task.lower()
+        for keywords, role_hint in _DELEGATION_HINTS:
+            if any(keyword in lowered for keyword in keywords):
+                coworker = next((c for c in coworkers if role_hint in c.lower()), coworker)
+                break
+
+        return {"task": task[:500], "context": task[:1000], "coworker": coworker}
+
+
+def _action(tool_name: str, args: dict) -> str:
+    return (f"Thought: Saya perlu menggunakan {tool_name}\n"
+            f"Action: {tool_name}\n"
+            f"Action Input: {json.dumps(args)}")
+
+
+def _final_answer(text: str) -> str:
+    return f"Thought: I now know the final answer\nFinal Answer: {text}"
+
+
+class RecordingLLM():
+    """
+    Rekam respon LLM asli ke file replay (dipakai dengan FakeLLM).
+
+    Contoh:
+        recorder = RecordingLLM("benchmarks/replay.json").install()
+        ... jalankan skenario dengan GOOGLE_API_KEY asli ...
+        recorder.save()
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.recorded = load_replay(path)
+        self._lock = threading.Lock()
+        self._unregister = None
+
+    def install(self, priority: int = 1000):
+        if self._unregister is None:
+            self._unregister = register_middleware(self, kinds=(LLM_CALL,), priority=priority)
+        return self
+
+    def __call__(self, call, proceed):
+        result = proceed()
+        messages = call.kwargs.get("messages", call.args[0] if call.args else None)
+        if isinstance(result, str):
+            with self._lock:
+                self.recorded[llm_key(call.name, messages)] = result
+        return result
+
+    def save(self):
+        with self._lock, open(self.path, "w") as f:
+            json.dump(self.recorded, f, indent=1)
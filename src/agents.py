@@ -1,21 +1,23 @@
 from textwrap import dedent
 from crewai import Agent, LLM
-from tools import ExaSearchToolSet
+from hoomi_hooks import instrument_llm
+from tools import BriefingArchiveToolSet, ExaSearchToolSet
 import os
 
 class MeetingPrepAgents():
     def __init__(self):
         # Gunakan CrewAI's LLM class dengan format litellm yang benar
-        self.llm = LLM(
+        # Wrapped so the shared rate limiter (hoomi_ratelimit) sees every call
+        self.llm = instrument_llm(LLM(
             model="gemini/gemini-2.0-flash-exp",
             api_key=os.getenv("GOOGLE_API_KEY")
-        )
+        ), label="meeting_prep")
     
     def research_agent(self):
         return Agent(
             role="Research Specialist",
             goal='Conduct thorough research on people and companies involved in the meeting',
-            tools=ExaSearchToolSet.tools(),
+            tools=BriefingArchiveToolSet.tools() + ExaSearchToolSet.tools(),
             backstory=dedent("""\
                 As a Research Specialist, your mission is to uncover detailed information
                 about the individuals and entities participating in the meeting. Your insights
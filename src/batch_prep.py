@@ -0,0 +1,255 @@
+"""
+Batch meeting preparation from a calendar export.
+
+    python main.py --batch calendar.ics [output_dir]
+    python main.py --batch meetings.csv [output_dir]
+
+Meetings are read from an ICS file (VEVENT: SUMMARY, DTSTART, DESCRIPTION,
+ORGANIZER, ATTENDEE) or a CSV with title, start, participants, context and
+objective columns. Participants and companies are de-duplicated across the
+whole batch and researched once, then every meeting runs the rest of the
+pipeline on a thread pool capped by BATCH_MAX_CONCURRENCY (default 3).
+
+Each briefing is written to its own markdown file in output_dir (default
+./briefings), next to summary.md listing status, timings and shared research.
+Attendees matching BATCH_SELF_EMAIL (your own address) are skipped.
+"""
+
+import csv
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from hoomi_ratelimit import rate_limit_session
+from research_fanout import parse_participants, research_participants
+
+DEFAULT_OBJECTIVE = "Understand the participants' priorities and agree on concrete next steps"
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+_OBJECTIVE_RE = re.compile(r"^\s*(objective|goal|tujuan)\s*:\s*(.+)$", re.I | re.M)
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+CSV_COLUMNS = {
+    "title": ("title", "summary", "subject", "meeting"),
+    "start": ("start", "date", "start_time", "dtstart"),
+    "participants": ("participants", "attendees", "emails", "guests"),
+    "context": ("context", "description", "notes", "agenda"),
+    "objective": ("objective", "goal"),
+}
+
+
+class Meeting():
+    def __init__(self, title: str, start: datetime = None, participants=(),
+                 context: str = "", objective: str = ""):
+        """participants: one entry per attendee (a plain string is split on separators)."""
+        self.title = title or "Untitled meeting"
+        self.start = start
+        self.participants = participants if isinstance(participants, str) else "; ".join(participants)
+        self.context = context or self.title
+        self.objective = objective or DEFAULT_OBJECTIVE
+        self.subjects = parse_participants(participants)
+        self.path = None  # Briefing file, assigned by run_batch
+
+    def slug(self) -> str:
+        stamp = self.start.strftime("%Y%m%d-%H%M") + "-" if self.start else ""
+        return stamp + (_SLUG_RE.sub("-", self.title.lower()).strip("-")[:60] or "meeting")
+
+
+# ==========================================
+# CALENDAR PARSING
+# ==========================================
+
+def load_meetings(path: str, self_email: str = None) -> list:
+    self_email = (self_email or os.getenv("BATCH_SELF_EMAIL", "")).strip().lower()
+    with open(path, encoding="utf-8-sig") as f:
+        text = f.read()
+    if path.lower().endswith((".ics", ".ical")) or text.lstrip().startswith("BEGIN:VCALENDAR"):
+        return parse_ics(text, self_email)
+    return parse_csv(text, self_email)
+
+
+def parse_ics(text: str, self_email: str = "") -> list:
+    # Unfold continuation lines (RFC 5545 3.1)
+    lines = re.sub(r"\r?\n[ \t]", "", text).splitlines()
+    meetings, event, depth = [], None, 0
+    for line in lines:
+        upper = line.upper()
+        if upper == "BEGIN:VEVENT" and event is None:
+            event, depth = {"attendees": []}, 0
+        elif upper == "END:VEVENT" and event is not None and depth == 0:
+            meetings.append(_meeting_from_event(event, self_email))
+            event = None
+        elif event is not None and upper.startswith("BEGIN:"):
+            depth += 1  # Sub-component (VALARM, ...): its properties are not the event's
+        elif event is not None and upper.startswith("END:"):
+            depth = max(depth - 1, 0)
+        elif event is not None and depth == 0 and ":" in line:
+            head, value = line.split(":", 1)
+            name, _, params = head.partition(";")
+            name = name.upper()
+            if name in ("ATTENDEE", "ORGANIZER"):
+                cn = re.search(r"CN=\"?([^\";:]+)\"?", params)
+                email = re.sub(r"^mailto:", "", value, flags=re.I).strip()
+                event["attendees"].append(f'"{cn.group(1)}" <{email}>' if cn else email)
+            elif name in ("SUMMARY", "DESCRIPTION", "DTSTART"):
+                event[name] = _unescape(value)
+    return meetings
+
+
+def _meeting_from_event(event: dict, self_email: str) -> Meeting:
+    description = event.get("DESCRIPTION", "")
+    objective = _OBJECTIVE_RE.search(description)
+    attendees = []
+    for attendee in event["attendees"]:
+        if _is_self(attendee, self_email):
+            continue
+        if attendee not in attendees:
+            attendees.append(attendee)
+    return Meeting(
+        title=event.get("SUMMARY", ""),
+        start=_parse_date(event.get("DTSTART", "")),
+        participants=attendees,
+        context=description,
+        objective=objective.group(2).strip() if objective else "",
+    )
+
+
+def _is_self(participant: str, self_email: str) -> bool:
+    if not self_email:
+        return False
+    bracketed = re.search(r"<([^>]+)>", participant)
+    match = _EMAIL_RE.search(bracketed.group(1) if bracketed else participant)
+    return bool(match) and match.group(0).lower() == self_email
+
+
+def _unescape(value: str) -> str:
+    return value.replace("\\n", "\n").replace("\\N", "\n").replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+
+
+def parse_csv(text: str, self_email: str = "") -> list:
+    reader = csv.DictReader(text.splitlines())
+    headers = {h.strip().lower(): h for h in reader.fieldnames or []}
+    columns = {field: next((headers[name] for name in names if name in headers), None)
+               for field, names in CSV_COLUMNS.items()}
+    if not columns["participants"]:
+        raise ValueError(f"CSV needs one of the columns {CSV_COLUMNS['participants']}")
+
+    meetings = []
+    for row in reader:
+        def value(field):
+            return (row.get(columns[field]) or "").strip() if columns[field] else ""
+        participants = [p.strip() for p in re.split(r"[;,\n]+", value("participants"))
+                        if p.strip() and not _is_self(p, self_email)]
+        meetings.append(Meeting(value("title"), _parse_date(value("start")), participants,
+                                value("context"), value("objective")))
+    return meetings
+
+
+def _parse_date(value: str):
+    value = value.strip().rstrip("Z")
+    for fmt in ("%Y%m%dT%H%M%S", "%Y%m%d", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+# ==========================================
+# BATCH RUN
+# ==========================================
+
+def run_batch(meetings: list, output_dir: str = "briefings", max_concurrency: int = None) -> list:
+    """Prepare every meeting; returns one result dict per meeting, in input order."""
+    from task import MeetingPrepTasks
+    from agents import MeetingPrepAgents
+    from main import prepare_meeting
+
+    if max_concurrency is None:
+        max_concurrency = int(os.getenv("BATCH_MAX_CONCURRENCY", 3))
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = MeetingPrepTasks()
+    agents = MeetingPrepAgents()
+
+    # Research each participant/company once, whatever number of meetings it appears in
+    shared, contexts, appearances = {}, {}, {}
+    for meeting in meetings:
+        for subject in meeting.subjects:
+            shared.setdefault(subject.key, subject)
+            appearances[subject.key] = appearances.get(subject.key, 0) + 1
+            contexts.setdefault(subject.key, []).append(f"{meeting.title}: {meeting.context[:200]}")
+    contexts = {key: "\n".join(items) for key, items in contexts.items()}
+    repeated = sum(1 for count in appearances.values() if count > 1)
+    print(f"Researching {len(shared)} unique participants/companies for {len(meetings)} meetings "
+          f"({repeated} shared by several meetings)...")
+    research_started = time.perf_counter()
+    with rate_limit_session("batch-research", "batch"):
+        dossier = research_participants(agents.research_agent, tasks, list(shared.values()), contexts)
+    research_s = time.perf_counter() - research_started
+
+    used_names = set()
+    for meeting in meetings:
+        name, n = meeting.slug(), 2
+        while name in used_names:
+            name, n = f"{meeting.slug()}-{n}", n + 1
+        used_names.add(name)
+        meeting.path = os.path.join(output_dir, name + ".md")
+
+    def prepare(meeting):
+        started = time.perf_counter()
+        try:
+            # Batch meetings queue behind interactive sessions in the shared LLM rate limiter
+            with rate_limit_session(os.path.basename(meeting.path), "batch"):
+                briefing = prepare_meeting(tasks, agents, meeting.participants, meeting.context,
+                                           meeting.objective, dossier.subset(meeting.subjects))
+            with open(meeting.path, "w", encoding="utf-8") as f:
+                f.write(f"# {meeting.title}\n\n{briefing}\n")
+            return {"meeting": meeting, "status": "ok", "error": None,
+                    "duration_s": time.perf_counter() - started}
+        except Exception as e:
+            return {"meeting": meeting, "status": "failed", "error": str(e),
+                    "duration_s": time.perf_counter() - started}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(meetings) or 1)),
+                            thread_name_prefix="meeting-batch") as pool:
+        results = list(pool.map(prepare, meetings))
+
+    summary_path = os.path.join(output_dir, "summary.md")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        f.write(format_summary(results, len(shared), repeated, research_s))
+    print(f"Batch done: summary written to {summary_path}")
+    return results
+
+
+def format_summary(results: list, unique_subjects: int, shared_subjects: int, research_s: float) -> str:
+    ok = sum(1 for r in results if r["status"] == "ok")
+    lines = [
+        "# Meeting Prep Batch Summary",
+        "",
+        f"- Meetings: {len(results)} ({ok} prepared, {len(results) - ok} failed)",
+        f"- Participants/companies researched: {unique_subjects} ({shared_subjects} shared across meetings)",
+        f"- Shared research time: {research_s:.1f}s",
+        "",
+        "| Start | Meeting | Participants | Status | Time (s) | Briefing |",
+        "|---|---|---|---|---|---|",
+    ]
+    for r in results:
+        meeting = r["meeting"]
+        start = meeting.start.strftime("%Y-%m-%d %H:%M") if meeting.start else "-"
+        briefing = os.path.basename(meeting.path) if r["status"] == "ok" else r["error"]
+        lines.append(f"| {start} | {meeting.title} | {len(meeting.subjects)} | {r['status']} "
+                     f"| {r['duration_s']:.1f} | {briefing} |")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: list):
+    if not argv:
+        print("Usage: python main.py --batch <calendar.ics|meetings.csv> [output_dir]")
+        return
+    meetings = load_meetings(argv[0])
+    if not meetings:
+        print(f"No meetings found in {argv[0]}")
+        return
+    run_batch(meetings, argv[1] if len(argv) > 1 else "briefings")
@@ -0,0 +1,261 @@
+"""
+Local archive of finished meeting briefings, searched before Exa.
+
+Every run stores its participant findings and the final briefing in a small
+SQLite file. Each passage is tagged with the participant's email and company,
+so a later meeting with the same people can reuse what is already known:
+
+- Ranking: BM25 over passages, optionally blended with embeddings when
+  ARCHIVE_EMBEDDINGS=1 and sentence-transformers is installed
+  (ARCHIVE_EMBEDDING_MODEL, default all-MiniLM-L6-v2)
+- Filters: participant email and/or company, exact and case-insensitive
+- Freshness: passages older than ARCHIVE_MAX_AGE_DAYS (default 30) are
+  returned marked as stale so the agent re-checks them on Exa
+- BRIEFING_ARCHIVE_PATH overrides the location, BRIEFING_ARCHIVE=0 disables
+"""
+
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from collections import Counter
+
+DEFAULT_ARCHIVE_PATH = os.getenv(
+    "BRIEFING_ARCHIVE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".hoomi", "briefings.db")
+)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+
+def _terms(text: str) -> list:
+    return [w for w in _WORD_RE.findall(str(text or "").lower()) if len(w) > 1]
+
+
+class ArchiveHit():
+    def __init__(self, passage_id: int, text: str, subject: str, email: str, company: str,
+                 created_at: float, context: str, score: float, stale: bool):
+        self.passage_id = passage_id
+        self.text = text
+        self.subject = subject
+        self.email = email
+        self.company = company
+        self.created_at = created_at
+        self.context = context
+        self.score = score
+        self.stale = stale
+
+    @property
+    def age_days(self) -> float:
+        return (time.time() - self.created_at) / 86400
+
+    def format(self) -> str:
+        date = time.strftime("%Y-%m-%d", time.localtime(self.created_at))
+        who = ", ".join(part for part in (self.subject, self.email, self.company) if part) or "briefing"
+        flag = " STALE - verify on Exa" if self.stale else ""
+        return f"[archive {date}, {who}{flag}] (meeting: {self.context[:80]})\n{self.text}"
+
+
+class BriefingArchive():
+    def __init__(self, path: str = DEFAULT_ARCHIVE_PATH, max_age_days: float = 30,
+                 embeddings: bool = False, embedding_model: str = "all-MiniLM-L6-v2"):
+        self.path = path
+        self.max_age_days = max_age_days
+        self.embedding_model = embedding_model
+        self._encoder = _load_encoder(embedding_model) if embeddings else None
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS briefings (
+                id INTEGER PRIMARY KEY,
+                created_at REAL NOT NULL,
+                context TEXT NOT NULL,
+                objective TEXT NOT NULL,
+                participants TEXT NOT NULL,
+                briefing TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS passages (
+                id INTEGER PRIMARY KEY,
+                briefing_id INTEGER NOT NULL REFERENCES briefings(id),
+                subject TEXT,
+                email TEXT,
+                company TEXT,
+                text TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                embedding BLOB
+            );
+            CREATE INDEX IF NOT EXISTS passages_email ON passages(email);
+            CREATE INDEX IF NOT EXISTS passages_company ON passages(company);
+        """)
+        self._conn.commit()
+        self._index = None  # Lazily built in-memory BM25 index
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_age_days=float(os.getenv("ARCHIVE_MAX_AGE_DAYS", 30)),
+            embeddings=os.getenv("ARCHIVE_EMBEDDINGS", "0") == "1",
+            embedding_model=os.getenv("ARCHIVE_EMBEDDING_MODEL", "all-MiniLM-L6-v2"),
+        )
+
+    # ==========================================
+    # WRITE
+    # ==========================================
+
+    def add_briefing(self, meeting_context: str, meeting_objective: str, participants: str,
+                     briefing: str, dossier=None) -> int:
+        """Store a finished briefing; dossier entries become per-participant passages."""
+        now = time.time()
+        rows = []
+        if dossier is not None:
+            for entry in dossier.entries:
+                if entry["error"] or not entry["findings"].strip():
+                    continue
+                subject = entry["subject"]
+                company = subject.company if subject.kind == "person" else subject.name
+                for paragraph in _paragraphs(entry["findings"]):
+                    rows.append((subject.name, subject.email, company, paragraph))
+        for paragraph in _paragraphs(briefing):
+            rows.append((None, None, None, paragraph))
+
+        vectors = self._embed([row[3] for row in rows]) if self._encoder else [None] * len(rows)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO briefings (created_at, context, objective, participants, briefing) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (now, meeting_context, meeting_objective, participants, briefing))
+            briefing_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO passages (briefing_id, subject, email, company, text, created_at, embedding) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(briefing_id, name, _lower(email), _lower(company), text, now, vector)
+                 for (name, email, company, text), vector in zip(rows, vectors)])
+            self._conn.commit()
+            self._index = None
+        return briefing_id
+
+    # ==========================================
+    # SEARCH
+    # ==========================================
+
+    def search(self, query: str, email: str = None, company: str = None, limit: int = 5) -> list:
+        with self._lock:
+            index = self._index or self._build_index()
+        candidates = [p for p in index["passages"]
+                      if (not email or p["email"] == _lower(email))
+                      and (not company or p["company"] == _lower(company))]
+        if not candidates:
+            return []
+
+        query_terms = set(_terms(query))
+        if email:
+            query_terms |= set(_terms(email.split("@")[0]))
+        scores = {p["id"]: _bm25(p, query_terms, index) for p in candidates}
+        if self._encoder and any(p["embedding"] is not None for p in candidates):
+            top = max(scores.values()) or 1.0
+            query_vector = self._embed([query])[0]
+            for p in candidates:
+                similarity = _cosine(query_vector, p["embedding"]) if p["embedding"] is not None else 0.0
+                scores[p["id"]] = 0.5 * scores[p["id"]] / top + 0.5 * similarity
+
+        # A metadata filter alone is a strong enough match for participant lookups
+        threshold = 0.0 if (email or company) else 1e-9
+        ranked = sorted((p for p in candidates if scores[p["id"]] >= threshold),
+                        key=lambda p: (-scores[p["id"]], -p["created_at"]))
+        cutoff = time.time() - self.max_age_days * 86400
+        return [ArchiveHit(p["id"], p["text"], p["subject"], p["email"], p["company"], p["created_at"],
+                           p["context"], scores[p["id"]], p["created_at"] < cutoff)
+                for p in ranked[:limit]]
+
+    def _build_index(self) -> dict:
+        passages, df = [], Counter()
+        for row in self._conn.execute(
+                "SELECT p.id, p.subject, p.email, p.company, p.text, p.created_at, p.embedding, b.context "
+                "FROM passages p JOIN briefings b ON b.id = p.briefing_id"):
+            terms = Counter(_terms(row[4]))
+            df.update(terms.keys())
+            passages.append({
+                "id": row[0], "subject": row[1], "email": row[2], "company": row[3], "text": row[4],
+                "created_at": row[5], "embedding": array("f", row[6]) if row[6] else None,
+                "context": row[7], "tf": terms, "length": sum(terms.values()),
+            })
+        avg_len = sum(p["length"] for p in passages) / len(passages) if passages else 1
+        self._index = {"passages": passages, "df": df, "n": len(passages), "avg_len": avg_len or 1}
+        return self._index
+
+    def _embed(self, texts: list) -> list:
+        vectors = self._encoder.encode(texts, normalize_embeddings=True)
+        return [array("f", vector).tobytes() for vector in vectors]
+
+    def stats(self) -> dict:
+        with self._lock:
+            briefings = self._conn.execute("SELECT COUNT(*) FROM briefings").fetchone()[0]
+            passages = self._conn.execute("SELECT COUNT(*) FROM passages").fetchone()[0]
+        return {"briefings": briefings, "passages": passages}
+
+
+def _bm25(passage: dict, query_terms: set, index: dict, k1: float = 1.2, b: float = 0.75) -> float:
+    score = 0.0
+    for term in query_terms:
+        tf = passage["tf"].get(term)
+        if not tf:
+            continue
+        df = index["df"][term]
+        idf = math.log(1 + (index["n"] - df + 0.5) / (df + 0.5))
+        score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * passage["length"] / index["avg_len"]))
+    return score
+
+
+def _cosine(query_vector: bytes, vector: array) -> float:
+    # Both vectors are normalized at encode time
+    return sum(a * b for a, b in zip(array("f", query_vector), vector))
+
+
+def _load_encoder(model: str):
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None  # Embeddings are optional, BM25 alone still works
+    return SentenceTransformer(model)
+
+
+def _paragraphs(text: str) -> list:
+    return [p.strip() for p in _PARAGRAPH_RE.split(text or "") if len(p.strip()) > 20]
+
+
+def _lower(value):
+    return value.strip().lower() if value else None
+
+
+def format_hits(hits: list, query: str) -> str:
+    if not hits:
+        return f"No archived briefings match '{query}'. Research it with the Exa search tool."
+    stale = sum(1 for hit in hits if hit.stale)
+    header = f"{len(hits)} archived passages for '{query}'"
+    if stale:
+        header += f" ({stale} stale: re-check those on Exa)"
+    return header + "\n\n" + "\n\n".join(hit.format() for hit in hits)
+
+
+_shared_archive = None
+_shared_lock = threading.Lock()
+
+
+def get_briefing_archive() -> BriefingArchive:
+    global _shared_archive
+    with _shared_lock:
+        if _shared_archive is None:
+            _shared_archive = BriefingArchive.from_env()
+        return _shared_archive
+
+
+def archive_enabled() -> bool:
+    return os.getenv("BRIEFING_ARCHIVE", "1") != "0"
+
@@ -0,0 +1,130 @@
+"""
+Hierarchical compaction of upstream outputs before the briefing task.
+
+Research dossier, industry analysis and meeting strategy can add up to a
+prompt far larger than the briefing agent needs. Instead of passing them
+raw as task context:
+
+1. Map: each output is split into chunks of ~BRIEFING_CHUNK_TOKENS at
+   paragraph boundaries and tagged with a citation id ([P1], [I2], [M3])
+2. Summarize: chunks are condensed in parallel (COMPACTION_MAX_WORKERS),
+   every bullet keeping the id of the chunk it came from
+3. Reduce: if the summaries still exceed BRIEFING_DIGEST_TOKENS they are
+   grouped and summarized again until they fit; the digest ends with a
+   source index mapping every citation id to its upstream output
+"""
+
+import contextvars
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+SUMMARIZE_PROMPT = """\
+Condense the following excerpt from a meeting-preparation report into at most
+{max_bullets} factual bullet points. Keep names, numbers, dates and sources.
+End every bullet with the citation tag(s) it is based on, e.g. {example}.
+Do not add information that is not in the excerpt.
+
+{body}"""
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text or "") // 4 + 1
+
+
+class Chunk():
+    def __init__(self, chunk_id: str, source: str, text: str):
+        self.id = chunk_id
+        self.source = source
+        self.text = text
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+def chunk_text(source: str, prefix: str, text: str, max_tokens: int) -> list:
+    """Split text at paragraph boundaries into chunks of at most ~max_tokens."""
+    chunks, current = [], []
+    size = 0
+    for paragraph in _PARAGRAPH_RE.split(text or ""):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        # Paragraphs longer than a chunk are cut by characters
+        pieces = [paragraph[i:i + max_tokens * 4] for i in range(0, len(paragraph), max_tokens * 4)]
+        for piece in pieces:
+            tokens = estimate_tokens(piece)
+            if current and size + tokens > max_tokens:
+                chunks.append("\n\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return [Chunk(f"{prefix}{i + 1}", source, body) for i, body in enumerate(chunks)]
+
+
+def _summarize(llm, tagged_text: str, example: str, max_bullets: int) -> str:
+    prompt = SUMMARIZE_PROMPT.format(max_bullets=max_bullets, example=example, body=tagged_text)
+    return str(llm.call([{"role": "user", "content": prompt}])).strip()
+
+
+def compact_outputs(llm, outputs: dict, token_budget: int = None, chunk_tokens: int = None,
+                    max_workers: int = None, max_rounds: int = 3) -> str:
+    """Build a token-budgeted digest with chunk citations from {source: text}."""
+    token_budget = token_budget or int(os.getenv("BRIEFING_DIGEST_TOKENS", 3000))
+    chunk_tokens = chunk_tokens or int(os.getenv("BRIEFING_CHUNK_TOKENS", 800))
+    max_workers = max_workers or int(os.getenv("COMPACTION_MAX_WORKERS", 4))
+
+    chunks, prefixes = [], set()
+    for source, text in outputs.items():
+        prefix = next((c for c in source.upper() if c.isalpha() and c not in prefixes), "X")
+        prefixes.add(prefix)
+        chunks.extend(chunk_text(source, prefix, text, chunk_tokens))
+    if not chunks:
+        return ""
+
+    index = "\n".join(f"[{chunk.id}] {chunk.source}" for chunk in chunks)
+    total = sum(chunk.tokens for chunk in chunks)
+    if total <= token_budget:
+        # Already small enough: keep the original wording, only add citations
+        body = "\n\n".join(f"[{chunk.id}] {chunk.text}" for chunk in chunks)
+        return _digest(body, index)
+
+    # Map: summarize every chunk in parallel, keeping roughly budget/len(chunks) per chunk
+    bullets = max(3, min(12, token_budget // max(len(chunks), 1) // 25))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="briefing-compaction") as pool:
+        # Each task gets its own copy of the caller's context (e.g. the batch rate-limit session)
+        futures = [pool.submit(contextvars.copy_context().run, _summarize, llm,
+                               f"[{chunk.id}]\n{chunk.text}", f"[{chunk.id}]", bullets) for chunk in chunks]
+        summaries = [future.result() for future in futures]
+
+    # Reduce: merge groups of summaries until the digest fits the budget
+    example = "".join(f"[{chunk.id}]" for chunk in chunks[:2])
+    for _ in range(max_rounds):
+        if sum(estimate_tokens(s) for s in summaries) <= token_budget or len(summaries) == 1:
+            break
+        groups = [summaries[i:i + 4] for i in range(0, len(summaries), 4)]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="briefing-compaction") as pool:
+            futures = [pool.submit(contextvars.copy_context().run, _summarize, llm,
+                                   "\n".join(group), example, bullets * 2) for group in groups]
+            summaries = [future.result() for future in futures]
+
+    body = "\n".join(summaries)
+    if estimate_tokens(body) > token_budget:
+        body = body[:token_budget * 4].rsplit("\n", 1)[0]
+    return _digest(body, index)
+
+
+def _digest(body: str, index: str) -> str:
+    return f"# Briefing Digest\n\n{body}\n\n## Sources\n{index}"
+
+
+def task_text(task) -> str:
+    output = getattr(task, "output", None)
+    if output is None:
+        return ""
+    return str(getattr(output, "raw", None) or getattr(output, "raw_output", None) or output)
@@ -0,0 +1,404 @@
+"""
+Hoomi Accounting - Token & Biaya per Skenario, Agent, Task, dan Sumber
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Backstory panjang di HoomiAgents dan description task di HoomiTasks
+dikirim ulang di setiap turn. Modul ini mencatat token setiap LLM call
+dan mengatribusikannya ke:
+
+- Skenario (commerce/delivery/ride) dan run
+- Agent (dari prompt "You are <role>." atau label LLM manager)
+- Task (dari event task_start)
+- Sumber prompt: backstory, tool_schema, context, tool_output, task
+
+Usage asli provider diambil dari respon call itu sendiri: middleware
+menambahkan callback per call ke `callbacks` LLM.call, yang dipanggil
+CrewAI dengan usage respon tersebut. Counter kumulatif LLM bersama
+(`_token_usage`) tidak dipakai karena ikut menghitung token sesi lain
+yang berjalan bersamaan. Jika usage tidak tersedia, token diestimasi
+(~4 karakter/token) dan ditandai estimated.
+
+Setiap run menghasilkan laporan (ditampilkan di CLI) dan di-append ke
+.hoomi/accounting/runs.jsonl untuk statistik lintas run:
+    
+    python hoomi_accounting.py report
+    python hoomi_accounting.py report --scenario ride --last 50
+"""
+
+import argparse
+import inspect
+import json
+import os
+import re
+import statistics
+import sys
+import threading
+
+from hoomi_events import EVENTS, RUN_END, RUN_START, TASK_END, TASK_START, EventSink, current_run_id
+from hoomi_hooks import LLM_CALL, register_middleware
+from hoomi_tracing import estimate_tokens, messages_text
+
+DEFAULT_LEDGER_PATH = os.getenv(
+    "HOOMI_ACCOUNTING_LOG",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".hoomi", "accounting", "runs.jsonl")
+)
+
+# Harga USD per 1 juta token (input, output)
+PRICING_PER_MTOK = {
+    "gemini/gemini-2.0-flash-exp": (0.10, 0.40),
+    "gemini/gemini-2.0-flash": (0.10, 0.40),
+}
+DEFAULT_PRICING = (0.10, 0.40)
+
+PROMPT_SOURCES = ("backstory", "tool_schema", "context", "tool_output", "task")
+
+_ROLE_RE = re.compile(r"You are (.+?)\.\s")
+_SECTION_RES = {
+    # Persona: "You are <role>. <backstory>\nYour personal goal is: <goal>"
+    "backstory": re.compile(r"You are .+?\.\s.*?Your personal goal is:[^\n]*", re.S),
+    "tool_schema": re.compile(
+        r"You ONLY have access to the following tools.*?(?=IMPORTANT: Use the following format|\Z)", re.S),
+    "context": re.compile(r"This is the context you're working with:.*?(?=\n\s*Begin!|\Z)", re.S),
+    "tool_output": re.compile(r"Observation:.*?(?=\n\s*Thought:|\Z)", re.S),
+}
+
+
+def prompt_breakdown(text: str) -> dict:
+    """
+    Pecah token prompt berdasarkan sumbernya.
+    
+    Bagian yang tidak cocok dengan marker prompt CrewAI dihitung sebagai
+    "task" (description, expected output, format instruksi).
+    """
+    breakdown = dict.fromkeys(PROMPT_SOURCES, 0)
+    for source, pattern in _SECTION_RES.items():
+        for match in pattern.finditer(text):
+            breakdown[source] += estimate_tokens(match.group(0))
+    breakdown["task"] = estimate_tokens(text) - sum(breakdown.values())
+    if breakdown["task"] < 0:
+        breakdown["task"] = 0
+    return breakdown
+
+
+class LLMCallRecord():
+    """Token satu LLM call beserta atribusinya."""
+    
+    __slots__ = ("agent", "task", "model", "prompt_tokens", "completion_tokens",
+                 "estimated", "sources")
+    
+    def __init__(self, agent, task, model, prompt_tokens, completion_tokens, estimated, sources):
+        self.agent = agent
+        self.task = task
+        self.model = model
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.estimated = estimated
+        self.sources = sources
+
+
+class TokenAccountant(EventSink):
+    """
+    Middleware LLM + EventSink yang mengumpulkan token per run.
+    
+    Contoh:
+        accountant = TokenAccountant().install()
+        ...
+        print(format_run_report(accountant.last_report))
+    """
+    
+    def __init__(self, ledger_path: str = DEFAULT_LEDGER_PATH):
+        self.ledger_path = ledger_path
+        self._runs = {}
+        self._lock = threading.Lock()
+        self.last_report = None
+    
+    def install(self, priority: int = 35):
+        EVENTS.subscribe(self)
+        register_middleware(self.middleware, kinds=(LLM_CALL,), priority=priority)
+        return self
+    
+    # ==========================================
+    # EVENT SINK
+    # ==========================================
+    
+    def on_event(self, event):
+        if event.type == RUN_START:
+            with self._lock:
+                self._runs[event.run_id] = {"scenario": event.data.get("scenario"), "task": None, "calls": []}
+        elif event.type == TASK_START:
+            with self._lock:
+                run = self._runs.get(event.run_id)
+                if run is not None:
+                    run["task"] = event.name
+        elif event.type == TASK_END:
+            with self._lock:
+                run = self._runs.get(event.run_id)
+                if run is not None and run["task"] == event.name:
+                    run["task"] = None
+        elif event.type == RUN_END:
+            with self._lock:
+                run = self._runs.pop(event.run_id, None)
+            if run is not None:
+                self.last_report = build_run_report(event.run_id, run["scenario"], run["calls"])
+                self._append_ledger(self.last_report)
+    
+    # ==========================================
+    # MIDDLEWARE
+    # ==========================================
+    
+    def middleware(self, call, proceed):
+        run_id = current_run_id()
+        with self._lock:
+            run = self._runs.get(run_id)
+        if run is None:
+            return proceed()  # Di luar run yang dicatat
+        
+        messages = call.kwargs.get("messages", call.args[0] if call.args else None)
+        capture = _UsageCapture(messages)
+        _attach_capture(call, capture)
+        
+        result = proceed()
+        
+        prompt_text = messages_text(messages)
+        sources = prompt_breakdown(prompt_text)
+        prompt_tokens = sum(sources.values())
+        completion_tokens = estimate_tokens(result)
+        estimated = True
+        
+        if capture.usage is not None:
+            real_prompt, real_completion = capture.usage
+            if real_prompt > 0:
+                # Skalakan breakdown estimasi ke jumlah token asli provider
+                scale = real_prompt / prompt_tokens if prompt_tokens else 0
+                sources = {k: int(round(v * scale)) for k, v in sources.items()}
+                prompt_tokens, completion_tokens, estimated = real_prompt, real_completion, False
+        
+        agent = "Crew Manager" if call.name == "manager" else _agent_role(prompt_text)
+        record = LLMCallRecord(agent, run["task"], call.attrs.get("model"), prompt_tokens,
+                               completion_tokens, estimated, sources)
+        with self._lock:
+            run["calls"].append(record)
+        return result
+    
+    def _append_ledger(self, report: dict):
+        os.makedirs(os.path.dirname(os.path.abspath(self.ledger_path)), exist_ok=True)
+        with self._lock, open(self.ledger_path, "a") as f:
+            f.write(json.dumps(report) + "\n")
+
+
+def install_accounting():
+    """Pasang TokenAccountant global (HOOMI_ACCOUNTING=0 untuk mematikan)."""
+    if os.getenv("HOOMI_ACCOUNTING", "1") == "0":
+        return None
+    return TokenAccountant().install()
+
+
+class _UsageCapture():
+    """
+    Callback satu LLM call: CrewAI LLM.call memanggil log_success_event
+    dengan usage dari respon call tersebut (bukan counter kumulatif LLM).
+    """
+    
+    def __init__(self, messages):
+        self.messages = messages
+        self.usage = None
+    
+    def log_success_event(self, kwargs=None, response_obj=None, start_time=None, end_time=None):
+        if self.usage is not None:
+            return
+        if isinstance(self.messages, list) and (kwargs or {}).get("messages") is not self.messages:
+            return  # Event call lain (callback litellm global)
+        usage = (response_obj or {}).get("usage")
+        if usage is None:
+            return
+        self.usage = (_usage_field(usage, "prompt_tokens"), _usage_field(usage, "completion_tokens"))
+
+
+def _usage_field(usage, name: str) -> int:
+    value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+    return int(value or 0)
+
+
+_callbacks_param = {}
+
+
+def _accepts_callbacks(llm) -> bool:
+    kind = type(llm)
+    if kind not in _callbacks_param:
+        try:
+            # Signature kelas, bukan llm.call yang sudah dibungkus dispatch (*args, **kwargs)
+            _callbacks_param[kind] = "callbacks" in inspect.signature(kind.call).parameters
+        except (AttributeError, TypeError, ValueError):
+            _callbacks_param[kind] = False
+    return _callbacks_param[kind]
+
+
+def _attach_capture(call, capture: _UsageCapture):
+    """Tambahkan capture ke argumen `callbacks` LLM.call (positional ke-3 atau keyword)."""
+    if not _accepts_callbacks(call.attrs.get("llm")):
+        return
+    positional = "callbacks" not in call.kwargs and len(call.args) >= 3
+    callbacks = call.args[2] if positional else call.kwargs.get("callbacks")
+    # Hedge LatencyGuard menjalankan middleware ini lagi untuk call yang sama: ganti capture lama
+    callbacks = [cb for cb in callbacks or [] if not isinstance(cb, _UsageCapture)] + [capture]
+    if positional:
+        call.args = call.args[:2] + (callbacks,) + call.args[3:]
+    else:
+        call.kwargs = dict(call.kwargs, callbacks=callbacks)
+
+
+def _agent_role(prompt_text: str) -> str:
+    match = _ROLE_RE.search(prompt_text or "")
+    return match.group(1) if match else "unknown"
+
+
+def _cost_usd(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    price_in, price_out = PRICING_PER_MTOK.get(model, DEFAULT_PRICING)
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+
+
+# ==========================================
+# LAPORAN PER RUN
+# ==========================================
+
+def build_run_report(run_id: str, scenario: str, calls: list) -> dict:
+    """Agregasi record LLM call menjadi laporan satu run."""
+    def bucket():
+        return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+    
+    totals = bucket()
+    by_agent, by_task = {}, {}
+    by_source = dict.fromkeys(PROMPT_SOURCES, 0)
+    estimated = False
+    
+    for record in calls:
+        cost = _cost_usd(record.model, record.prompt_tokens, record.completion_tokens)
+        for group in (totals, by_agent.setdefault(record.agent, bucket()),
+                      by_task.setdefault(record.task or "(tanpa task)", bucket())):
+            group["calls"] += 1
+            group["prompt_tokens"] += record.prompt_tokens
+            group["completion_tokens"] += record.completion_tokens
+            group["cost_usd"] += cost
+        for source, tokens in record.sources.items():
+            by_source[source] += tokens
+        estimated = estimated or record.estimated
+    
+    return {
+        "run_id": run_id,
+        "scenario": scenario,
+        "estimated": estimated,
+        "totals": totals,
+        "by_agent": by_agent,
+        "by_task": by_task,
+        "prompt_by_source": by_source,
+    }
+
+
+def format_run_report(report: dict) -> str:
+    """Ringkasan laporan run untuk CLI."""
+    if not report:
+        return ""
+    totals = report["totals"]
+    prompt_total = totals["prompt_tokens"] or 1
+    lines = [
+        f"🧾 Token: {totals['prompt_tokens']:,} prompt + {totals['completion_tokens']:,} completion "
+        f"dalam {totals['calls']} LLM call (≈ ${totals['cost_usd']:.4f})"
+        + (" [estimasi]" if report["estimated"] else ""),
+        "   Prompt per sumber: " + ", ".join(
+            f"{source} {tokens / prompt_total:.0%}" for source, tokens in report["prompt_by_source"].items() if tokens
+        ),
+    ]
+    for agent, data in sorted(report["by_agent"].items(), key=lambda item: -item[1]["prompt_tokens"]):
+        lines.append(f"   - {agent}: {data['prompt_tokens']:,} + {data['completion_tokens']:,} ({data['calls']} call)")
+    return "\n".join(lines)
+
+
+# ==========================================
+# STATISTIK LINTAS RUN
+# ==========================================
+
+def load_ledger(path: str = DEFAULT_LEDGER_PATH) -> list:
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def aggregate(reports: list) -> dict:
+    """Statistik per skenario: mean/p50/p95 token & biaya, share sumber prompt."""
+    by_scenario = {}
+    for report in reports:
+        by_scenario.setdefault(report.get("scenario") or "unknown", []).append(report)
+    
+    stats = {}
+    for scenario, items in by_scenario.items():
+        prompt = [r["totals"]["prompt_tokens"] for r in items]
+        completion = [r["totals"]["completion_tokens"] for r in items]
+        cost = [r["totals"]["cost_usd"] for r in items]
+        sources = dict.fromkeys(PROMPT_SOURCES, 0)
+        agents = {}
+        for r in items:
+            for source, tokens in r["prompt_by_source"].items():
+                sources[source] = sources.get(source, 0) + tokens
+            for agent, data in r["by_agent"].items():
+                agents[agent] = agents.get(agent, 0) + data["prompt_tokens"] + data["completion_tokens"]
+        source_total = sum(sources.values()) or 1
+        stats[scenario] = {
+            "runs": len(items),
+            "prompt_tokens": _distribution(prompt),
+            "completion_tokens": _distribution(completion),
+            "cost_usd": _distribution(cost),
+            "prompt_source_share": {k: v / source_total for k, v in sources.items()},
+            "tokens_per_agent_mean": {k: v / len(items) for k, v in agents.items()},
+        }
+    return stats
+
+
+def _distribution(values: list) -> dict:
+    ordered = sorted(values)
+    return {
+        "mean": statistics.fmean(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)],
+        "total": sum(ordered),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Statistik token & biaya Hoomi lintas run")
+    parser.add_argument("command", choices=["report"])
+    parser.add_argument("--ledger", default=DEFAULT_LEDGER_PATH)
+    parser.add_argument("--scenario", help="Filter skenario (commerce/delivery/ride)")
+    parser.add_argument("--last", type=int, help="Hanya N run terakhir")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    args = parser.parse_args(argv)
+    
+    reports = load_ledger(args.ledger)
+    if args.scenario:
+        reports = [r for r in reports if r.get("scenario") == args.scenario]
+    if args.last:
+        reports = reports[-args.last:]
+    if not reports:
+        print("Belum ada run tercatat.")
+        return
+    
+    stats = aggregate(reports)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+    
+    for scenario, data in stats.items():
+        print(f"📊 {scenario} ({data['runs']} run)")
+        for metric in ("prompt_tokens", "completion_tokens"):
+            d = data[metric]
+            print(f"   {metric:<18} mean {d['mean']:>10,.0f}  p50 {d['p50']:>10,}  p95 {d['p95']:>10,}")
+        c = data["cost_usd"]
+        print(f"   {'cost_usd':<18} mean {c['mean']:>10.4f}  p95 {c['p95']:>10.4f}  total {c['total']:.4f}")
+        print("   prompt share: " + ", ".join(
+            f"{k} {v:.0%}" for k, v in data["prompt_source_share"].items() if v))
+        for agent, tokens in sorted(data["tokens_per_agent_mean"].items(), key=lambda item: -item[1]):
+            print(f"   - {agent}: {tokens:,.0f} token/run")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
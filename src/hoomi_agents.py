@@ -10,15 +10,17 @@ Agents yang diimplementasikan:
 
 from textwrap import dedent
 from crewai import Agent, LLM
+from hoomi_events import llm_stream_kwargs
+from hoomi_hooks import instrument_llm
 from hoomi_tools import (
     # Commerce Tools
     check_stock, search_product,
     # Fleet Tools
-    calculate_route, find_driver,
+    geocode_address, calculate_route, find_driver, plan_delivery_batch, find_ride_pool,
     # HITL Tools
     pay_wallet, get_user_location,
     # Additional Tools
-    track_delivery, send_notification
+    track_delivery, assign_order_driver, send_notification
 )
 import os
 
@@ -37,10 +39,12 @@ class HoomiAgents():
         Menggunakan Gemini 2.0 Flash Exp via litellm format.
         """
         # Gunakan CrewAI's LLM class dengan format litellm untuk Gemini
-        self.llm = LLM(
+        # Dibungkus hoomi_hooks agar deadline/middleware lain berlaku
+        self.llm = instrument_llm(LLM(
             model="gemini/gemini-2.0-flash-exp",
-            api_key=os.getenv("GOOGLE_API_KEY")
-        )
+            api_key=os.getenv("GOOGLE_API_KEY"),
+            **llm_stream_kwargs()  # Streaming token jika didukung CrewAI
+        ), label="agents")
     
     def storefront_agent(self):
         """
@@ -138,10 +142,14 @@ class HoomiAgents():
                 Anda bekerja sama dengan Storefront Agent untuk informasi pesanan
                 dan Merchant Agent untuk konfirmasi pickup."""),
             tools=[
+                geocode_address,     # Alamat -> koordinat (gazetteer lokal)
                 calculate_route,     # Hitung rute & estimasi
                 find_driver,         # Cari driver terdekat
+                plan_delivery_batch, # Gabungkan order pending jadi rute multi-stop
+                find_ride_pool,      # Ride bersama (pooling) untuk penumpang searah
                 get_user_location,   # Get GPS (HITL required!)
-                track_delivery,      # Real-time tracking
+                track_delivery,      # Status order dari order store
+                assign_order_driver, # Catat driver yang ditugaskan ke order
                 send_notification    # Update status ke user
             ],
             llm=self.llm,
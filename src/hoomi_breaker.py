@@ -0,0 +1,399 @@
+"""
+Hoomi Breaker - Circuit Breaker & Mode Degradasi untuk Tool dan LLM
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Saat Gemini atau backend integrasi (katalog, stok, maps, fleet, wallet)
+sedang gangguan, setiap call menunggu sampai timeout LatencyGuard lalu
+gagal, dan main() hanya mencetak "❌ ERROR" sehingga order hilang.
+Middleware ini memasang circuit breaker per LLM dan per backend tool:
+
+1. Breaker - closed -> open jika >= failure_threshold gagal dan failure
+   rate >= 50% dalam jendela call terakhir; selama open, call langsung
+   gagal cepat (tanpa menunggu timeout); setelah open_s detik satu call
+   probe dibiarkan lewat (half-open) untuk menentukan closed/open lagi
+2. Fallback tool - saat breaker open atau call gagal, tool mengembalikan
+   hasil degradasi, bukan exception:
+   - search_product / check_stock / track_delivery / geocode_address:
+     hasil sukses terakhir untuk argumen yang sama (ditandai stale)
+   - calculate_route: estimasi great-circle + tarif baseline
+   - tool lain (send_notification, dsb): pesan layanan tidak tersedia,
+     tanpa pernah memalsukan hasil sukses
+   - tool HITL (pay_wallet, get_user_location) tidak lewat breaker:
+     approval yang lambat/ditolak bukan kegagalan backend
+3. LLM - breaker open -> CircuitOpenError seketika; hoomi_main lalu
+   menampilkan pesan final dari template (degraded_final_message)
+   berisi ringkasan order dan status/pembayaran sebenarnya dari order store
+
+Status breaker & jumlah fallback diekspos untuk metrik hoomi_metrics.
+HOOMI_BREAKER=0 mematikan breaker.
+"""
+
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+from hoomi_hooks import LLM_CALL, TOOL, register_middleware
+from hoomi_latency import CallCancelled, current_scope
+from hoomi_memo import normalize_args
+from hoomi_orders import STATUS_LABELS, get_order_store
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Backend di balik setiap tool; tool dengan backend sama berbagi breaker
+TOOL_BACKENDS = {
+    "search_product": "catalog",
+    "check_stock": "inventory",
+    "geocode_address": "maps",
+    "calculate_route": "maps",
+    "plan_delivery_batch": "fleet",
+    "find_driver": "fleet",
+    "find_ride_pool": "fleet",
+    "track_delivery": "orders",
+    "assign_order_driver": "orders",
+    "send_notification": "notification",
+}
+
+# Tool read-only yang boleh dijawab dari hasil sukses terakhir
+LAST_GOOD_TOOLS = frozenset(("search_product", "check_stock", "track_delivery", "geocode_address"))
+
+# Tool yang menunggu input user: lambat/ditolak bukan tanda backend rusak
+BYPASS_TOOLS = frozenset(("get_user_location", "pay_wallet"))
+
+
+class CircuitOpenError(RuntimeError):
+    """Breaker sedang open: call ditolak tanpa dijalankan."""
+
+
+class CircuitBreaker():
+    """
+    Circuit breaker dengan jendela outcome bergulir.
+    
+    Args:
+        name: Nama breaker (backend tool atau label LLM)
+        failure_threshold: Jumlah gagal minimum dalam jendela untuk open
+        window: Jumlah outcome terakhir yang diperhitungkan
+        open_s: Lama breaker open sebelum probe half-open
+    """
+    
+    def __init__(self, name: str, failure_threshold: int = 5, window: int = 20, open_s: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.open_s = open_s
+        self.state = CLOSED
+        self.stats = {"opened": 0, "rejected": 0, "fallbacks": 0}
+        self._outcomes = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """True jika call boleh dijalankan (closed, atau probe half-open)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.open_s:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.stats["rejected"] += 1
+            return False
+    
+    def record(self, success):
+        """success True/False, atau None untuk outcome netral (dibatalkan, budget skenario habis)."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+                if success is None:
+                    return
+                if success:
+                    self.state = CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+            if success is None:
+                return
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if (self.state == CLOSED and failures >= self.failure_threshold
+                    and failures * 2 >= len(self._outcomes)):
+                self._open()
+    
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self.stats["opened"] += 1
+
+
+# ==========================================
+# FALLBACK
+# ==========================================
+
+def _bound_args(call) -> dict:
+    func = call.attrs.get("func")
+    try:
+        bound = inspect.signature(func).bind(*call.args, **call.kwargs)
+        bound.apply_defaults()
+        return dict(bound.arguments)
+    except (TypeError, ValueError):
+        return dict(call.kwargs)
+
+
+def _mark_degraded(result, reason: str, source: str) -> str:
+    try:
+        data = json.loads(result)
+    except (TypeError, ValueError):
+        return json.dumps({"degraded": True, "source": source, "reason": reason, "result": result})
+    if isinstance(data, dict):
+        data.update({"degraded": True, "source": source, "reason": reason})
+        return json.dumps(data)
+    return json.dumps({"degraded": True, "source": source, "reason": reason, "result": data})
+
+
+def route_estimate(pickup_lat: float, pickup_lon: float, dest_lat: float, dest_lon: float) -> dict:
+    """Estimasi rute great-circle + tarif baseline, tanpa maps/model eksternal."""
+    from hoomi_trip_model import TripModel
+    
+    distance_km, duration_min, price_idr = TripModel.baseline().predict_one(pickup_lat, pickup_lon, dest_lat, dest_lon)
+    return {
+        "pickup": {"lat": pickup_lat, "lon": pickup_lon},
+        "destination": {"lat": dest_lat, "lon": dest_lon},
+        "distance_km": round(distance_km, 2),
+        "duration_min": int(duration_min),
+        "price_idr": int(price_idr),
+        "route_url": f"https://maps.google.com/?saddr={pickup_lat},{pickup_lon}&daddr={dest_lat},{dest_lon}",
+        "traffic_condition": "unknown",
+        "pricing_model": "great_circle",
+    }
+
+
+def _route_fallback(call, reason: str):
+    args = _bound_args(call)
+    try:
+        estimate = route_estimate(float(args["pickup_lat"]), float(args["pickup_lon"]),
+                                  float(args["dest_lat"]), float(args["dest_lon"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+    return _mark_degraded(json.dumps(estimate), reason, "great_circle_estimate")
+
+
+FALLBACKS = {"calculate_route": _route_fallback}
+
+
+# ==========================================
+# MIDDLEWARE
+# ==========================================
+
+class BreakerGuard():
+    """
+    Middleware circuit breaker untuk hoomi_hooks.
+    
+    Contoh:
+        guard = BreakerGuard().install()
+        print(guard.format_report())
+    """
+    
+    def __init__(self, failure_threshold: int = 5, window: int = 20, open_s: float = 30.0,
+                 last_good_size: int = 1024):
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.open_s = open_s
+        self.last_good_size = last_good_size
+        self._breakers = {}
+        self._last_good = OrderedDict()
+        self._lock = threading.Lock()
+        self._unregister = None
+    
+    @classmethod
+    def from_env(cls):
+        """Baca konfigurasi dari environment (HOOMI_BREAKER_THRESHOLD, HOOMI_BREAKER_OPEN_S, ...)."""
+        return cls(
+            failure_threshold=int(os.getenv("HOOMI_BREAKER_THRESHOLD", 5)),
+            window=int(os.getenv("HOOMI_BREAKER_WINDOW", 20)),
+            open_s=float(os.getenv("HOOMI_BREAKER_OPEN_S", 30)),
+        )
+    
+    def install(self, priority: int = 16):
+        """Di dalam memo (15, fallback degraded tidak di-memo), di luar rate limiter (18) dan LatencyGuard (20)."""
+        if self._unregister is None:
+            self._unregister = register_middleware(self, kinds=(TOOL, LLM_CALL), priority=priority)
+        return self
+    
+    def uninstall(self):
+        if self._unregister is not None:
+            self._unregister()
+            self._unregister = None
+    
+    def breaker(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(
+                    name, self.failure_threshold, self.window, self.open_s)
+            return breaker
+    
+    def __call__(self, call, proceed):
+        if call.kind == TOOL and call.name in BYPASS_TOOLS:
+            return proceed()
+        name = f"llm:{call.name}" if call.kind == LLM_CALL else f"tool:{TOOL_BACKENDS.get(call.name, call.name)}"
+        breaker = self.breaker(name)
+        
+        if not breaker.allow():
+            reason = f"Circuit {name} open"
+            if call.kind == LLM_CALL:
+                raise CircuitOpenError(f"{reason}: LLM sementara tidak tersedia")
+            return self._fallback(breaker, call, reason)
+        
+        try:
+            result = proceed()
+        except CallCancelled:
+            breaker.record(None)  # Dibatalkan user/skenario, bukan kegagalan backend
+            raise
+        except Exception as e:
+            scope = current_scope()
+            budget_spent = scope is not None and scope.remaining() is not None and scope.remaining() <= 0
+            breaker.record(None if budget_spent else False)
+            if call.kind == LLM_CALL:
+                raise
+            return self._fallback(breaker, call, f"{type(e).__name__}: {e}")
+        
+        breaker.record(True)
+        if call.kind == TOOL and call.name in LAST_GOOD_TOOLS:
+            self._remember(call, result)
+        return result
+    
+    def _key(self, call):
+        return call.name, normalize_args(call.attrs.get("func"), call.args, call.kwargs)
+    
+    def _remember(self, call, result):
+        key = self._key(call)
+        with self._lock:
+            self._last_good[key] = result
+            self._last_good.move_to_end(key)
+            if len(self._last_good) > self.last_good_size:
+                self._last_good.popitem(last=False)
+    
+    def _fallback(self, breaker: CircuitBreaker, call, reason: str):
+        with self._lock:
+            breaker.stats["fallbacks"] += 1
+            cached = self._last_good.get(self._key(call)) if call.name in LAST_GOOD_TOOLS else None
+        if cached is not None:
+            return _mark_degraded(cached, reason, "last_known_good")
+        fallback = FALLBACKS.get(call.name)
+        result = fallback(call, reason) if fallback is not None else None
+        if result is not None:
+            return result
+        return json.dumps({
+            "degraded": True, "error": f"Layanan '{call.name}' sementara tidak tersedia",
+            "reason": reason, "advice": "Informasikan ke user dan jangan mengarang hasil tool ini",
+        })
+    
+    # ==========================================
+    # STATISTIK
+    # ==========================================
+    
+    def states(self) -> dict:
+        """{(breaker,): 0 closed / 1 half-open / 2 open} untuk metrik gauge."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {(b.name,): STATE_VALUES[b.state] for b in breakers}
+    
+    def report(self) -> dict:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {b.name: dict(b.stats, state=b.state) for b in breakers}
+    
+    def format_report(self) -> str:
+        """Ringkasan breaker yang tidak closed atau pernah fallback (kosong jika semua sehat)."""
+        items = [f"{name} {data['state']} ({data['fallbacks']} fallback, {data['rejected']} ditolak)"
+                 for name, data in sorted(self.report().items())
+                 if data["state"] != CLOSED or data["fallbacks"] or data["rejected"]]
+        return "🔌 Circuit breaker: " + ", ".join(items) if items else ""
+
+
+# ==========================================
+# PESAN FINAL TEMPLATE (LLM TIDAK TERSEDIA)
+# ==========================================
+
+DEGRADED_TEMPLATES = {
+    "commerce": (
+        "🛒 Pesanan Anda untuk '{product_query}' dengan tujuan {destination} sudah kami terima.\n"
+        "Asisten AI sedang gangguan sehingga pesanan belum bisa diselesaikan."
+    ),
+    "delivery": (
+        "📦 Permintaan pengiriman '{package_description}' dari {pickup_address} ke {destination_address} "
+        "sudah kami terima.\n"
+        "Asisten AI sedang gangguan sehingga pengiriman belum bisa diselesaikan."
+    ),
+    "ride": (
+        "🚗 Permintaan perjalanan dari {pickup_location} ke {destination} untuk {passenger_count} penumpang "
+        "sudah kami terima.\n"
+        "Asisten AI sedang gangguan sehingga perjalanan belum bisa diselesaikan."
+    ),
+}
+
+
+class _Missing(dict):
+    def __missing__(self, key):
+        return "-"
+
+
+def _order_state_lines(order_id: str) -> list:
+    """Status, driver, dan pembayaran dari order store - bukan asumsi template."""
+    if not order_id:
+        return ["Silakan coba lagi dalam beberapa menit."]
+    try:
+        order = get_order_store().get(order_id)
+    except Exception:  # Store tidak bisa dibaca: jangan mengklaim apa pun soal dana
+        order = None
+    if order is None:
+        return [f"Order ID: {order_id}", "Silakan hubungi kami dengan Order ID ini untuk memastikan status pesanan."]
+    
+    lines = [f"Order ID: {order.order_id} (status: {STATUS_LABELS.get(order.status, order.status)})"]
+    if order.driver_id and order.active:
+        lines.append(f"Driver {order.driver_id} sudah ditugaskan untuk order ini.")
+    if order.paid_at is None:
+        lines.append("Tidak ada dana yang ditarik. Silakan coba lagi dalam beberapa menit.")
+    else:
+        paid = time.strftime("%Y-%m-%d %H:%M", time.localtime(order.paid_at))
+        lines.append(f"Pembayaran Rp {order.amount_idr:,} sudah tercatat ({paid}). "
+                     "Tim kami akan melanjutkan pesanan atau mengembalikan dana; simpan Order ID ini.")
+    return lines
+
+
+def degraded_final_message(scenario: str, inputs: dict, reason: str = "") -> str:
+    """
+    Jawaban final tanpa LLM untuk order yang tidak bisa diselesaikan.
+    Klaim soal dana & status dibaca dari order store (paid_at, status).
+    """
+    inputs = inputs or {}
+    template = DEGRADED_TEMPLATES.get(scenario, "Permintaan Anda sudah kami terima.")
+    message = "\n".join([template.format_map(_Missing(inputs))] + _order_state_lines(inputs.get("order_id")))
+    return f"{message}\n(Mode degradasi: {reason})" if reason else message
+
+
+_guard = None
+_guard_lock = threading.Lock()
+
+
+def install_breakers():
+    """
+    Pasang BreakerGuard bersama per proses (idempotent).
+    
+    Returns:
+        BreakerGuard, atau None jika HOOMI_BREAKER=0
+    """
+    global _guard
+    if os.getenv("HOOMI_BREAKER", "1").lower() in ("0", "false", "no", "off"):
+        return None
+    with _guard_lock:
+        if _guard is None:
+            _guard = BreakerGuard.from_env().install()
+        return _guard
@@ -0,0 +1,161 @@
+"""
+Hoomi Crew Pool - Pemakaian Ulang Crew per Tipe Skenario
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Sebelumnya setiap order membangun ulang Agent, Task, manager LLM, Crew,
+dan inisialisasi memory. Dengan task description berbentuk template
+(lihat HoomiTasks), satu Crew cukup dibangun sekali per skenario lalu
+dipakai ulang dengan crew.kickoff(inputs={...}).
+
+Pool ini:
+1. Menyimpan Crew idle per skenario (commerce/delivery/ride)
+2. Memberikan Crew secara eksklusif (checkout/checkin, aman multi-thread)
+3. Me-reset state per order (output task, counter tools, short-term memory)
+4. Membangun Crew baru hanya jika semua instance sedang dipakai
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class CrewPool():
+    """
+    Pool Crew yang di-key berdasarkan tipe skenario.
+
+    Args:
+        builders: dict {scenario: callable() -> Crew}
+        max_size: Jumlah maksimum Crew per skenario (idle + dipakai)
+
+    Contoh:
+        pool = CrewPool({"ride": build_ride_crew})
+        with pool.acquire("ride", user_id="USER123") as crew:
+            result = crew.kickoff(inputs={...})
+    """
+
+    def __init__(self, builders: dict, max_size: int = 4):
+        self.builders = dict(builders)
+        self.max_size = max_size
+        self._idle = {scenario: [] for scenario in self.builders}
+        self._total = {scenario: 0 for scenario in self.builders}
+        self._waiting = {scenario: 0 for scenario in self.builders}
+        self._lock = threading.Lock()
+        # Satu Condition per skenario (lock bersama): notify() hanya
+        # membangunkan waiter yang memang menunggu crew skenario tersebut
+        self._conds = {scenario: threading.Condition(self._lock) for scenario in self.builders}
+        self.stats = {"built": 0, "reused": 0}
+
+    @contextmanager
+    def acquire(self, scenario: str, user_id: str = "default", timeout: float = None):
+        """
+        Pinjam satu Crew untuk skenario `scenario`.
+
+        Crew dikembalikan ke pool setelah blok `with` selesai, termasuk
+        saat terjadi exception.
+        """
+        crew = self._checkout(scenario, timeout)
+        try:
+            reset_crew(crew, user_id)
+            yield crew
+        finally:
+            self._checkin(scenario, crew)
+
+    def _checkin(self, scenario: str, crew):
+        with self._lock:
+            self._idle[scenario].append(crew)
+            self._conds[scenario].notify()
+
+    def _checkout(self, scenario: str, timeout: float = None):
+        if scenario not in self.builders:
+            raise KeyError(f"Skenario '{scenario}' tidak dikenal")
+
+        cond = self._conds[scenario]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while True:
+                if self._idle[scenario]:
+                    self.stats["reused"] += 1
+                    return self._idle[scenario].pop()
+                if self._total[scenario] < self.max_size:
+                    self._total[scenario] += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"Semua crew '{scenario}' sedang dipakai")
+                self._waiting[scenario] += 1
+                try:
+                    cond.wait(remaining)
+                finally:
+                    self._waiting[scenario] -= 1
+
+        # Build di luar lock: konstruksi Crew bisa memakan waktu
+        try:
+            crew = self.builders[scenario]()
+        except Exception:
+            with self._lock:
+                self._total[scenario] -= 1
+                cond.notify()
+            raise
+
+        with self._lock:
+            self.stats["built"] += 1
+        return crew
+
+    def warm_up(self, scenarios=None) -> threading.Thread:
+        """Bangun satu Crew per skenario di background thread."""
+        def _prebuild():
+            for scenario in scenarios or list(self.builders):
+                try:
+                    crew = self._checkout(scenario)
+                except Exception:
+                    continue  # best-effort, error akan muncul lagi saat acquire()
+                self._checkin(scenario, crew)
+
+        thread = threading.Thread(target=_prebuild, daemon=True, name="hoomi-crew-warmup")
+        thread.start()
+        return thread
+
+    def size(self, scenario: str) -> int:
+        return self._total.get(scenario, 0)
+
+    def waiting(self, scenario: str = None) -> int:
+        """Jumlah request yang sedang antri menunggu Crew (queue depth)."""
+        with self._lock:
+            if scenario is not None:
+                return self._waiting.get(scenario, 0)
+            return sum(self._waiting.values())
+
+
+def reset_crew(crew, user_id: str = "default"):
+    """
+    Bersihkan state sisa order sebelumnya agar Crew siap dipakai ulang.
+
+    - Output & counter setiap task
+    - Riwayat tool result setiap agent
+    - Tools delegasi di manager agent (dibuat ulang saat kickoff)
+    - Namespace memory diarahkan ke user_id, short-term memory dikosongkan
+    """
+    for task in crew.tasks:
+        task.output = None
+        for counter in ("used_tools", "tools_errors", "delegations"):
+            if hasattr(task, counter):
+                setattr(task, counter, 0)
+
+    for agent in crew.agents:
+        if hasattr(agent, "tools_results"):
+            agent.tools_results = []
+
+    manager = getattr(crew, "manager_agent", None)
+    if manager is not None and getattr(manager, "tools", None):
+        manager.tools = []
+
+    for memory in (getattr(crew, "short_term_memory", None),
+                   getattr(crew, "long_term_memory", None),
+                   getattr(crew, "entity_memory", None)):
+        storage = getattr(memory, "storage", None)
+        if storage is not None and hasattr(storage, "namespace"):
+            storage.namespace = user_id
+
+    short_term = getattr(getattr(crew, "short_term_memory", None), "storage", None)
+    if short_term is not None and hasattr(short_term, "reset"):
+        short_term.reset()
@@ -0,0 +1,390 @@
+"""
+Hoomi Events - Progress Event & Streaming Jawaban Final
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Sebelumnya user tidak melihat apa pun sampai crew.kickoff() selesai.
+Modul ini menyediakan satu interface callback (EventSink) yang dipakai
+bersama oleh CLI dan mode server:
+
+- run_start / run_end     : awal & akhir satu order
+- task_start / task_end   : setiap task HoomiTasks
+- tool_start / tool_end   : setiap tool call (via middleware hoomi_hooks)
+- llm_token               : potongan token jawaban LLM (streaming), ditandai
+                            label LLM ("agents"/"manager") dan ID call-nya
+- hitl_start / hitl_end   : menunggu input/approval user (HITL)
+
+Sumber event:
+1. Middleware hoomi_hooks untuk tool call (dan penanda LLM call aktif)
+2. Bridge ke event bus CrewAI (TaskStarted/Completed, LLMStreamChunk)
+   jika versi CrewAI mendukung; jika tidak, task_end diambil dari
+   task_callback Crew
+"""
+
+import builtins
+import contextvars
+import inspect
+import itertools
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from hoomi_hooks import LLM_CALL, TOOL, register_middleware
+
+RUN_START = "run_start"
+RUN_END = "run_end"
+TASK_START = "task_start"
+TASK_END = "task_end"
+TOOL_START = "tool_start"
+TOOL_END = "tool_end"
+LLM_TOKEN = "llm_token"
+HITL_START = "hitl_start"
+HITL_END = "hitl_end"
+
+_current_run = contextvars.ContextVar("hoomi_run_id", default=None)
+# (label, call_id) LLM call yang sedang berjalan, untuk menandai llm_token
+_current_llm = contextvars.ContextVar("hoomi_llm_call", default=None)
+_llm_call_ids = itertools.count(1)
+
+
+class HoomiEvent():
+    """Satu progress event. `data` berisi payload spesifik per tipe."""
+    
+    __slots__ = ("type", "name", "data", "run_id", "timestamp")
+    
+    def __init__(self, type: str, name: str = None, data: dict = None, run_id: str = None):
+        self.type = type
+        self.name = name
+        self.data = data or {}
+        self.run_id = run_id if run_id is not None else _current_run.get()
+        self.timestamp = time.time()
+    
+    def to_dict(self) -> dict:
+        return {
+            "type": self.type,
+            "name": self.name,
+            "data": self.data,
+            "run_id": self.run_id,
+            "timestamp": self.timestamp,
+        }
+    
+    def to_sse(self) -> str:
+        """Format Server-Sent Events untuk mode server."""
+        return f"event: {self.type}\ndata: {json.dumps(self.to_dict(), default=str)}\n\n"
+
+
+class EventSink():
+    """Interface penerima event. Override on_event()."""
+    
+    def on_event(self, event: HoomiEvent):
+        raise NotImplementedError
+
+
+class EventBus():
+    """Broadcast event ke semua sink yang berlangganan (thread-safe)."""
+    
+    def __init__(self):
+        self._sinks = []
+        self._lock = threading.Lock()
+    
+    def subscribe(self, sink: EventSink):
+        """Daftarkan sink. Returns: fungsi untuk berhenti berlangganan."""
+        with self._lock:
+            self._sinks.append(sink)
+        
+        def unsubscribe():
+            with self._lock:
+                if sink in self._sinks:
+                    self._sinks.remove(sink)
+        
+        return unsubscribe
+    
+    def emit(self, type: str, name: str = None, **data):
+        event = HoomiEvent(type, name, data)
+        with self._lock:
+            sinks = list(self._sinks)
+        for sink in sinks:
+            try:
+                sink.on_event(event)
+            except Exception:
+                pass  # Sink yang error tidak boleh mengganggu eksekusi crew
+        return event
+    
+    def task_callback(self, output):
+        """Fallback task_end untuk Crew(task_callback=...) tanpa event bus CrewAI."""
+        self.emit(TASK_END, getattr(output, "name", None) or _short(getattr(output, "description", "")),
+                  agent=getattr(output, "agent", None), summary=_short(getattr(output, "raw", ""), 200))
+
+
+EVENTS = EventBus()
+
+
+@contextmanager
+def run_events(run_id: str, scenario: str = None):
+    """Tandai semua event di dalam blok dengan run_id dan kirim run_start/run_end."""
+    reset_token = _current_run.set(run_id)
+    EVENTS.emit(RUN_START, scenario, scenario=scenario)
+    status = "success"
+    try:
+        yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        EVENTS.emit(RUN_END, scenario, scenario=scenario, status=status)
+        _current_run.reset(reset_token)
+
+
+def current_run_id() -> str:
+    return _current_run.get()
+
+
+@contextmanager
+def hitl_input():
+    """
+    Catat waktu tunggu HITL selama blok berjalan.
+    
+    Approval HITL CrewAI (human_input=True) memakai builtins.input();
+    selama blok ini setiap input() diapit event hitl_start/hitl_end.
+    """
+    original = builtins.input
+    
+    def traced_input(prompt=""):
+        EVENTS.emit(HITL_START, "human_input", prompt=_short(prompt, 120))
+        started = time.perf_counter()
+        try:
+            return original(prompt)
+        finally:
+            EVENTS.emit(HITL_END, "human_input", wait_s=time.perf_counter() - started)
+    
+    builtins.input = traced_input
+    try:
+        yield
+    finally:
+        builtins.input = original
+
+
+# ==========================================
+# SINKS: CLI & SERVER
+# ==========================================
+
+class ConsoleSink(EventSink):
+    """
+    Sink untuk CLI: progress per task/tool + streaming jawaban final.
+    
+    Token LLM baru ditampilkan setelah penanda "Final Answer:" muncul pada
+    task terakhir, sehingga user melihat jawaban (bukan Thought ReAct).
+    Dengan final_llm (mis. "manager" di Process.hierarchical) hanya LLM
+    call berlabel itu yang dipertimbangkan: "Final Answer:" dari agent
+    yang didelegasikan manager bukan jawaban akhir order. Setelah penanda
+    ditemukan, hanya token dari call yang sama yang diteruskan.
+    """
+    
+    FINAL_MARKER = "Final Answer:"
+    
+    def __init__(self, total_tasks: int = None, stream=sys.stdout, final_llm: str = None):
+        self.total_tasks = total_tasks
+        self.stream = stream
+        self.final_llm = final_llm
+        self.tasks_started = 0
+        self.streamed_final = False
+        self._buffer = ""
+        self._buffer_call = None
+        self._in_final = False
+        self._final_call = None
+    
+    def on_event(self, event: HoomiEvent):
+        if event.type == TASK_START:
+            self.tasks_started += 1
+            self._buffer, self._buffer_call = "", None
+            self._in_final, self._final_call = False, None
+            total = f"/{self.total_tasks}" if self.total_tasks else ""
+            self._write(f"\n▶️  [{self.tasks_started}{total}] {event.data.get('agent') or ''}: {event.name}\n")
+        elif event.type == TASK_END:
+            self._write(f"\n✅ Selesai: {event.name}\n")
+        elif event.type == TOOL_START:
+            self._write(f"   🔧 {event.name}...\n")
+        elif event.type == TOOL_END and event.data.get("error"):
+            self._write(f"   ⚠️  {event.name} gagal: {event.data['error']}\n")
+        elif event.type == LLM_TOKEN and self._is_final_task() and self._is_final_llm(event):
+            self._stream_token(event.data.get("chunk", ""), event.data.get("call"))
+    
+    def _is_final_task(self) -> bool:
+        return self.total_tasks is None or self.tasks_started >= self.total_tasks
+    
+    def _is_final_llm(self, event: HoomiEvent) -> bool:
+        return self.final_llm is None or event.data.get("llm") == self.final_llm
+    
+    def _stream_token(self, chunk: str, call_id=None):
+        if self._in_final:
+            if call_id == self._final_call:
+                self._write(chunk)
+            return
+        if call_id != self._buffer_call:
+            # Penanda harus muncul di dalam satu LLM call, bukan gabungan beberapa call
+            self._buffer, self._buffer_call = "", call_id
+        self._buffer += chunk
+        index = self._buffer.find(self.FINAL_MARKER)
+        if index >= 0:
+            self._in_final = True
+            self._final_call = call_id
+            self.streamed_final = True
+            self._write("\n💬 ")
+            self._write(self._buffer[index + len(self.FINAL_MARKER):].lstrip())
+    
+    def _write(self, text: str):
+        self.stream.write(text)
+        self.stream.flush()
+
+
+class QueueSink(EventSink):
+    """
+    Sink untuk mode server: event dimasukkan ke queue per run.
+    
+    Contoh (SSE):
+        sink = QueueSink(run_id)
+        unsubscribe = EVENTS.subscribe(sink)
+        for event in sink.iter_events():
+            response.write(event.to_sse())
+    """
+    
+    def __init__(self, run_id: str = None, maxsize: int = 10000):
+        self.run_id = run_id
+        self.queue = queue.Queue(maxsize=maxsize)
+    
+    def on_event(self, event: HoomiEvent):
+        if self.run_id is None or event.run_id == self.run_id:
+            try:
+                self.queue.put_nowait(event)
+            except queue.Full:
+                pass  # Konsumen terlalu lambat; event progress boleh hilang
+    
+    def iter_events(self, timeout: float = None):
+        """Yield event sampai run_end diterima (atau timeout tanpa event)."""
+        while True:
+            try:
+                event = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                return
+            yield event
+            if event.type == RUN_END:
+                return
+
+
+# ==========================================
+# SUMBER EVENT
+# ==========================================
+
+def _tool_events(call, proceed):
+    EVENTS.emit(TOOL_START, call.name)
+    started = time.perf_counter()
+    try:
+        result = proceed()
+    except Exception as e:
+        EVENTS.emit(TOOL_END, call.name, duration_s=time.perf_counter() - started, error=str(e))
+        raise
+    EVENTS.emit(TOOL_END, call.name, duration_s=time.perf_counter() - started)
+    return result
+
+
+def _llm_marker(call, proceed):
+    """Tandai LLM call yang sedang berjalan agar token streaming tahu asalnya."""
+    reset_token = _current_llm.set((call.name, next(_llm_call_ids)))
+    try:
+        return proceed()
+    finally:
+        _current_llm.reset(reset_token)
+
+
+_installed = False
+_install_lock = threading.Lock()
+_bridged = False
+
+
+def install() -> bool:
+    """
+    Pasang semua sumber event (idempotent).
+    
+    Returns:
+        bool: True jika bridge event bus CrewAI aktif (task_start & streaming
+        tersedia); False jika hanya fallback task_callback.
+    """
+    global _installed, _bridged
+    with _install_lock:
+        if not _installed:
+            register_middleware(_tool_events, kinds=(TOOL,), priority=40)
+            register_middleware(_llm_marker, kinds=(LLM_CALL,), priority=40)
+            _bridged = _bridge_crewai_events()
+            _installed = True
+    return _bridged
+
+
+def crewai_events_bridged() -> bool:
+    return _bridged
+
+
+def _bridge_crewai_events() -> bool:
+    """Teruskan event bus CrewAI (versi baru) ke EVENTS."""
+    try:
+        from crewai.utilities.events import (
+            LLMStreamChunkEvent, TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent, crewai_event_bus
+        )
+    except ImportError:
+        return False
+    
+    @crewai_event_bus.on(TaskStartedEvent)
+    def _on_task_started(source, event):
+        EVENTS.emit(TASK_START, _task_name(source), agent=_agent_role(source))
+    
+    @crewai_event_bus.on(TaskCompletedEvent)
+    def _on_task_completed(source, event):
+        output = getattr(event, "output", None)
+        EVENTS.emit(TASK_END, _task_name(source), agent=_agent_role(source),
+                    summary=_short(getattr(output, "raw", ""), 200))
+    
+    @crewai_event_bus.on(TaskFailedEvent)
+    def _on_task_failed(source, event):
+        EVENTS.emit(TASK_END, _task_name(source), agent=_agent_role(source),
+                    error=str(getattr(event, "error", "")))
+    
+    @crewai_event_bus.on(LLMStreamChunkEvent)
+    def _on_chunk(source, event):
+        llm, call_id = _current_llm.get() or (None, None)
+        EVENTS.emit(LLM_TOKEN, None, chunk=event.chunk, llm=llm, call=call_id)
+    
+    return True
+
+
+def llm_stream_kwargs() -> dict:
+    """
+    kwargs streaming untuk crewai.LLM jika didukung dan diaktifkan.
+    
+    Streaming dimatikan dengan HOOMI_STREAM=0. Versi CrewAI lama yang tidak
+    punya parameter `stream` tetap memakai mode non-streaming.
+    """
+    if os.getenv("HOOMI_STREAM", "1") != "1":
+        return {}
+    try:
+        from crewai import LLM
+        if "stream" in inspect.signature(LLM.__init__).parameters:
+            return {"stream": True}
+    except (ImportError, TypeError, ValueError):
+        pass
+    return {}
+
+
+def _task_name(task) -> str:
+    return getattr(task, "name", None) or _short(getattr(task, "description", "") or "", 60)
+
+
+def _agent_role(task):
+    agent = getattr(task, "agent", None)
+    return getattr(agent, "role", None)
+
+
+def _short(text, limit: int = 60) -> str:
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
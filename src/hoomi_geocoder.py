@@ -0,0 +1,320 @@
+"""
+Hoomi Geocoder - Geocoding Alamat Offline dari Gazetteer Lokal
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Skenario menerima alamat teks bebas ("Jl. Sudirman No. 123, Jakarta Pusat",
+"Stasiun Sudirman") sementara calculate_route butuh lat/lon. Tanpa geocoder,
+Dispatch Agent harus menebak koordinat. Modul ini me-resolve alamat secara
+lokal dalam hitungan mikrodetik, tanpa LLM dan tanpa API eksternal:
+
+1. Gazetteer - file CSV jalan, POI, dan kelurahan (HOOMI_GAZETTEER, default
+   data/gazetteer_jakarta.csv) dengan kolom name, kind, aliases (dipisah |),
+   kelurahan, kecamatan, city, lat, lon
+2. Normalisasi - lowercase, singkatan diekspansi (jl -> jalan, st -> stasiun),
+   nomor rumah/RT/RW dipisahkan dari nama
+3. Index n-gram - inverted index trigram karakter untuk fuzzy match (typo,
+   singkatan, urutan kata), plus lookup exact untuk nama/alias persis. Match
+   fuzzy wajib mencakup semua token pembeda alamat, skornya >= MIN_CONFIDENCE,
+   dan unggul >= MIN_MARGIN dari kandidat kedua; jika tidak, found=false
+   dengan alternatives
+4. Cache - LRU per alamat ter-normalisasi (HOOMI_GEOCODE_CACHE, default 4096)
+
+"lokasi saya" tidak di-geocode: tool mengarahkan agent ke get_user_location (HITL).
+"""
+
+import csv
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict, defaultdict
+
+DEFAULT_GAZETTEER = os.getenv(
+    "HOOMI_GAZETTEER",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "gazetteer_jakarta.csv")
+)
+
+# Skor minimum (Dice trigram) agar kandidat fuzzy dianggap cocok; nama/alias
+# persis selalu bernilai 1.0
+MIN_CONFIDENCE = 0.7
+
+# Hasil fuzzy (< 1.0) yang selisihnya dengan kandidat kedua di bawah margin ini
+# dianggap ambigu: found=false, kandidat dikembalikan sebagai alternatives
+MIN_MARGIN = 0.1
+
+# Kemiripan trigram minimum antar token (toleransi typo per kata)
+TOKEN_SIMILARITY = 0.5
+
+ABBREVIATIONS = {
+    "jl": "jalan", "jln": "jalan", "jend": "jenderal", "st": "stasiun", "stn": "stasiun",
+    "kel": "kelurahan", "kec": "kecamatan", "gg": "gang", "bunderan": "bundaran", "mal": "mall",
+    "prof": "profesor", "dr": "dokter", "h": "haji", "kh": "kyai haji", "kiai": "kyai",
+}
+
+# Token yang tidak membedakan satu tempat dengan yang lain
+STOP_TOKENS = frozenset((
+    "jalan", "gang", "no", "nomor", "rt", "rw", "blok", "kelurahan", "kecamatan",
+    "kota", "kabupaten", "dki", "provinsi", "di", "dekat",
+))
+
+SELF_LOCATION_PHRASES = ("lokasi saya", "lokasi saat ini", "posisi saya", "my location", "current location")
+
+_HOUSE_NUMBER_RE = re.compile(r"\b(?:no|nomor)\.?\s*(\d+[a-z]?)\b", re.I)
+_RT_RW_RE = re.compile(r"\b(?:rt|rw)\.?\s*\d+(?:\s*/\s*(?:rw\.?\s*)?\d+)?\b", re.I)
+_NON_WORD_RE = re.compile(r"[^\w\s]+", re.UNICODE)
+
+
+def normalize(text: str) -> str:
+    """Normalisasi nama tempat: 'Jl. Jend. Sudirman' -> 'jalan jenderal sudirman'."""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    tokens = _NON_WORD_RE.sub(" ", text).split()
+    return " ".join(ABBREVIATIONS.get(token, token) for token in tokens)
+
+
+def match_key(text: str) -> str:
+    """Bagian nama yang dipakai untuk matching (tanpa stop token dan angka)."""
+    return " ".join(t for t in normalize(text).split() if t not in STOP_TOKENS and not t.isdigit())
+
+
+def trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _dice(a: set, b: set) -> float:
+    return 2 * len(a & b) / (len(a) + len(b)) if a or b else 0.0
+
+
+def tokens_covered(query: str, candidate: str) -> bool:
+    """
+    Setiap token query harus cocok (persis atau typo ringan) dengan salah satu
+    token kandidat: "kebon kacang" tidak boleh jatuh ke "kebon sirih" hanya
+    karena prefix "kebon" yang sama.
+    """
+    candidate_tokens = [(token, trigrams(token)) for token in candidate.split()]
+    for token in query.split():
+        grams = trigrams(token)
+        if not any(token == other or _dice(grams, other_grams) >= TOKEN_SIMILARITY
+                   for other, other_grams in candidate_tokens):
+            return False
+    return True
+
+
+# ==========================================
+# GAZETTEER & INDEX
+# ==========================================
+
+class Place():
+    """Satu entri gazetteer (jalan, POI, atau kelurahan)."""
+    
+    __slots__ = ("name", "kind", "kelurahan", "kecamatan", "city", "lat", "lon", "_context")
+    
+    def __init__(self, name: str, kind: str, kelurahan: str, kecamatan: str, city: str,
+                 lat: float, lon: float):
+        self.name = name
+        self.kind = kind
+        self.kelurahan = kelurahan
+        self.kecamatan = kecamatan
+        self.city = city
+        self.lat = lat
+        self.lon = lon
+        self._context = frozenset(normalize(f"{kelurahan} {kecamatan} {city}").split())
+    
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name, "kind": self.kind, "lat": self.lat, "lon": self.lon,
+            "kelurahan": self.kelurahan, "kecamatan": self.kecamatan, "city": self.city,
+        }
+
+
+class GeocodeResult():
+    def __init__(self, query: str, place: Place = None, confidence: float = 0.0,
+                 house_number: str = None, alternatives: list = None):
+        self.query = query
+        self.place = place
+        self.confidence = confidence
+        self.house_number = house_number
+        self.alternatives = alternatives or []
+    
+    @property
+    def found(self) -> bool:
+        return self.place is not None
+    
+    def to_dict(self) -> dict:
+        data = {"query": self.query, "found": self.found}
+        if self.place is not None:
+            data.update(self.place.to_dict())
+            data["confidence"] = round(self.confidence, 3)
+            if self.house_number:
+                data["house_number"] = self.house_number
+        else:
+            data["reason"] = ("Alamat ambigu; konfirmasi ke user memakai alternatives" if self.alternatives
+                              else "Alamat tidak ditemukan di gazetteer; minta alamat yang lebih lengkap")
+        data["alternatives"] = [
+            dict(place.to_dict(), confidence=round(score, 3)) for place, score in self.alternatives
+        ]
+        return data
+
+
+class Gazetteer():
+    """
+    Index in-memory atas entri gazetteer.
+    
+    Setiap nama dan alias disimpan sebagai match key ter-normalisasi di dua
+    struktur: dict exact (key -> place) dan inverted index trigram
+    (trigram -> key) untuk fuzzy match.
+    """
+    
+    def __init__(self, places: list = None):
+        self.places = []
+        self._exact = {}
+        self._keys = {}            # key -> (place, trigram set)
+        self._index = defaultdict(set)
+        for place, names in places or []:
+            self.add(place, names)
+    
+    @classmethod
+    def load(cls, path: str = DEFAULT_GAZETTEER):
+        gazetteer = cls()
+        with open(path, encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                place = Place(row["name"], row.get("kind") or "poi", row.get("kelurahan") or "",
+                              row.get("kecamatan") or "", row.get("city") or "",
+                              float(row["lat"]), float(row["lon"]))
+                aliases = [a for a in (row.get("aliases") or "").split("|") if a.strip()]
+                gazetteer.add(place, [row["name"]] + aliases)
+        return gazetteer
+    
+    def add(self, place: Place, names: list):
+        self.places.append(place)
+        for name in names:
+            key = match_key(name)
+            if not key or key in self._keys:
+                continue
+            grams = trigrams(key)
+            self._exact[key] = place
+            self._keys[key] = (place, grams)
+            for gram in grams:
+                self._index[gram].add(key)
+    
+    def search(self, key: str, context: frozenset = frozenset(), limit: int = 3) -> list:
+        """Kandidat (place, skor) terbaik untuk match key; skor 0..1 (+ bonus konteks)."""
+        if not key:
+            return []
+        exact = self._exact.get(key)
+        grams = trigrams(key)
+        
+        overlap = defaultdict(int)
+        for gram in grams:
+            for candidate in self._index.get(gram, ()):
+                overlap[candidate] += 1
+        
+        best = {}
+        for candidate, shared in overlap.items():
+            place, candidate_grams = self._keys[candidate]
+            if place is exact:
+                score = 1.0
+            elif not tokens_covered(key, candidate):
+                continue  # Token pembeda query tidak ada di kandidat
+            else:
+                score = 2 * shared / (len(grams) + len(candidate_grams))
+            # Kelurahan/kota di alamat membedakan nama jalan yang sama
+            if context and context & place._context:
+                score += 0.05 * len(context & place._context)
+            if score > best.get(id(place), (None, 0.0))[1]:
+                best[id(place)] = (place, score)
+        return sorted(best.values(), key=lambda item: -item[1])[:limit]
+
+
+# ==========================================
+# GEOCODER + CACHE
+# ==========================================
+
+class Geocoder():
+    """
+    Geocoder alamat teks bebas -> koordinat, dengan cache LRU.
+    
+    Args:
+        gazetteer: Gazetteer yang sudah di-load
+        cache_size: Jumlah alamat ter-normalisasi yang di-cache
+        min_confidence: Skor minimum agar hasil fuzzy dianggap ditemukan
+    """
+    
+    def __init__(self, gazetteer: Gazetteer, cache_size: int = 4096, min_confidence: float = MIN_CONFIDENCE):
+        self.gazetteer = gazetteer
+        self.cache_size = cache_size
+        self.min_confidence = min_confidence
+        self.stats = {"hits": 0, "misses": 0}
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def geocode(self, address: str) -> GeocodeResult:
+        normalized = normalize(address)
+        with self._lock:
+            cached = self._cache.get(normalized)
+            if cached is not None:
+                self._cache.move_to_end(normalized)
+                self.stats["hits"] += 1
+                return cached
+            self.stats["misses"] += 1
+        
+        result = self._resolve(address)
+        with self._lock:
+            self._cache[normalized] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+    
+    def _resolve(self, address: str) -> GeocodeResult:
+        house = _HOUSE_NUMBER_RE.search(address or "")
+        cleaned = _RT_RW_RE.sub(" ", _HOUSE_NUMBER_RE.sub(" ", address or ""))
+        
+        # Segmen pertama = nama tempat, sisanya (kelurahan, kota) = konteks
+        segments = [s for s in cleaned.split(",") if s.strip()]
+        context = frozenset(normalize(" ".join(segments[1:])).split()) - STOP_TOKENS
+        candidates = self.gazetteer.search(match_key(segments[0]) if segments else "", context)
+        
+        # Alamat tanpa koma: coba juga potongan kata terakhir sebagai konteks,
+        # tetapi hanya jika SEMUA kata yang dipotong memang kelurahan/kecamatan/kota
+        # kandidat ("sudirman jakarta pusat"), bukan bagian nama ("kebon kacang")
+        if len(segments) == 1 and (not candidates or candidates[0][1] < 1.0):
+            tokens = match_key(segments[0]).split()
+            for cut in range(len(tokens) - 1, 0, -1):
+                head, tail = " ".join(tokens[:cut]), frozenset(tokens[cut:])
+                alternative = [c for c in self.gazetteer.search(head, tail) if tail <= c[0]._context]
+                if alternative and (not candidates or alternative[0][1] > candidates[0][1]):
+                    candidates = alternative
+        
+        if not candidates or candidates[0][1] < self.min_confidence:
+            return GeocodeResult(address, alternatives=candidates[:2])
+        place, score = candidates[0]
+        if score < 1.0 and len(candidates) > 1 and score - candidates[1][1] < MIN_MARGIN:
+            return GeocodeResult(address, alternatives=candidates[:3])  # Ambigu: biarkan agent bertanya
+        return GeocodeResult(address, place, min(score, 1.0), house.group(1) if house else None,
+                             [c for c in candidates[1:] if c[1] >= self.min_confidence])
+    
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+
+def is_self_location(address: str) -> bool:
+    lowered = str(address or "").strip().lower()
+    return any(phrase in lowered for phrase in SELF_LOCATION_PHRASES)
+
+
+_geocoder = None
+_geocoder_lock = threading.Lock()
+
+
+def get_geocoder() -> Geocoder:
+    """Geocoder bersama per proses; gazetteer di-load saat pertama dipakai."""
+    global _geocoder
+    with _geocoder_lock:
+        if _geocoder is None:
+            _geocoder = Geocoder(
+                Gazetteer.load(DEFAULT_GAZETTEER),
+                cache_size=int(os.getenv("HOOMI_GEOCODE_CACHE", 4096)),
+            )
+        return _geocoder
@@ -0,0 +1,148 @@
+"""
+Hoomi Hooks - Titik Ekstensi untuk Tool Call dan LLM Call
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Setiap tool di hoomi_tools dan setiap LLM yang dibuat agent/manager
+dibungkus SATU kali oleh dispatcher. Dispatcher menjalankan rantai
+middleware yang terdaftar saat ini (deadline, tracing, metrics, cache,
+dsb) tanpa perlu mengubah definisi tool/agent.
+
+Middleware adalah callable `middleware(call, proceed)`:
+- call: CallInfo (kind "tool"/"llm", name, args, kwargs, attrs)
+- proceed: callable tanpa argumen untuk menjalankan middleware berikutnya
+  (dan akhirnya fungsi asli)
+
+Middleware dengan priority lebih kecil berjalan lebih luar (lebih dulu).
+"""
+
+import functools
+import itertools
+import threading
+
+TOOL = "tool"
+LLM_CALL = "llm"
+
+_middlewares = []
+_lock = threading.Lock()
+_seq = itertools.count()
+
+
+class CallInfo():
+    """Informasi satu pemanggilan tool/LLM yang diteruskan ke middleware."""
+
+    __slots__ = ("kind", "name", "args", "kwargs", "attrs")
+
+    def __init__(self, kind: str, name: str, args: tuple, kwargs: dict, attrs: dict = None):
+        self.kind = kind
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+        self.attrs = attrs if attrs is not None else {}
+
+    def __repr__(self):
+        return f"CallInfo(kind={self.kind!r}, name={self.name!r})"
+
+
+def register_middleware(middleware, kinds=(TOOL, LLM_CALL), priority: int = 100):
+    """
+    Daftarkan middleware untuk jenis call tertentu.
+
+    Args:
+        middleware: Callable(call, proceed) -> result
+        kinds: Jenis call yang diproses ("tool", "llm")
+        priority: Urutan eksekusi (kecil = paling luar)
+
+    Returns:
+        callable: Fungsi untuk membatalkan registrasi
+    """
+    entry = (priority, next(_seq), frozenset(kinds), middleware)
+    with _lock:
+        _middlewares.append(entry)
+        _middlewares.sort(key=lambda item: (item[0], item[1]))
+
+    def unregister():
+        with _lock:
+            if entry in _middlewares:
+                _middlewares.remove(entry)
+
+    return unregister
+
+
+def clear_middlewares():
+    """Hapus semua middleware (dipakai benchmark/skenario offline)."""
+    with _lock:
+        _middlewares.clear()
+
+
+def dispatch(call: CallInfo, target):
+    """Jalankan `target(*call.args, **call.kwargs)` melalui rantai middleware."""
+    chain = [m for _, _, kinds, m in _middlewares if call.kind in kinds]
+    if not chain:
+        return target(*call.args, **call.kwargs)
+
+    def run(index):
+        if index == len(chain):
+            return target(*call.args, **call.kwargs)
+        return chain[index](call, lambda: run(index + 1))
+
+    return run(0)
+
+
+# ==========================================
+# INSTRUMENTASI TOOL & LLM
+# ==========================================
+
+def instrument_tool(tool, name: str = None):
+    """
+    Bungkus `tool.func` (CrewAI @tool) dengan dispatcher middleware.
+
+    Idempotent: tool yang sudah diinstrumentasi tidak dibungkus ulang.
+
+    Returns:
+        Tool yang sama (di-instrumentasi in-place)
+    """
+    original = tool.func
+    if getattr(original, "__hoomi_original__", None) is not None:
+        return tool
+
+    tool_name = name or getattr(original, "__name__", None) or tool.name
+
+    @functools.wraps(original)
+    def dispatched(*args, **kwargs):
+        return dispatch(CallInfo(TOOL, tool_name, args, kwargs, {"func": original}), original)
+
+    dispatched.__hoomi_original__ = original
+    tool.func = dispatched
+    return tool
+
+
+def instrument_llm(llm, label: str = None):
+    """
+    Bungkus `llm.call` (CrewAI LLM) dengan dispatcher middleware.
+
+    Args:
+        llm: Instance crewai.LLM
+        label: Nama logis LLM (e.g. "agents", "manager") untuk middleware
+
+    Returns:
+        LLM yang sama (di-instrumentasi in-place)
+    """
+    original = llm.call
+    if getattr(original, "__hoomi_original__", None) is not None:
+        return llm
+
+    llm_name = label or getattr(llm, "model", "llm")
+
+    @functools.wraps(original)
+    def dispatched(*args, **kwargs):
+        call = CallInfo(LLM_CALL, llm_name, args, kwargs, {"model": getattr(llm, "model", None), "llm": llm})
+        return dispatch(call, original)
+
+    dispatched.__hoomi_original__ = original
+    llm.call = dispatched
+    return llm
+
+
+def original_func(tool):
+    """Fungsi asli tool sebelum diinstrumentasi (untuk benchmark)."""
+    return getattr(tool.func, "__hoomi_original__", tool.func)
@@ -0,0 +1,291 @@
+"""
+Hoomi Latency Control - Deadline, Cancellation, dan Hedged Request
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Satu respon Gemini yang lambat dapat menahan seluruh skenario. Layer ini
+dipasang sebagai middleware hoomi_hooks di sekitar setiap LLM call dan
+tool call:
+
+1. Per-call timeout - batas waktu per jenis call (LLM / tool)
+2. Deadline skenario - budget total satu order; call berikutnya memakai
+   sisa budget sebagai timeout maksimum
+3. Cooperative cancellation - CancellationToken dicek sebelum & selama call
+4. Hedging (opsional) - jika call belum selesai setelah p95 latency
+   historis, request kedua dikirim dan respon pertama yang menang
+
+Statistik (timeouts, hedges fired/won, cancellations) tersedia via
+LatencyGuard.report() untuk mengukur seberapa sering hedge terpakai.
+
+Catatan: thread Python tidak bisa dihentikan paksa. Call yang timeout
+tetap selesai di background, tetapi hasilnya diabaikan.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
+from hoomi_hooks import LLM_CALL, TOOL, register_middleware
+
+
+class DeadlineExceeded(TimeoutError):
+    """Budget waktu skenario atau timeout per call habis."""
+
+
+class CallCancelled(Exception):
+    """Skenario dibatalkan (CancellationToken) sebelum call selesai."""
+
+
+class CancellationToken():
+    """Token pembatalan kooperatif yang dibagikan ke semua call dalam skenario."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise CallCancelled("Skenario dibatalkan")
+
+
+class ScenarioScope():
+    """Deadline + token pembatalan untuk satu skenario/order."""
+
+    def __init__(self, budget_seconds: float = None, token: CancellationToken = None):
+        self.started_at = time.monotonic()
+        self.deadline = self.started_at + budget_seconds if budget_seconds else None
+        self.token = token or CancellationToken()
+
+    def remaining(self) -> float:
+        """Sisa budget dalam detik (None jika tanpa deadline)."""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+
+_current_scope = contextvars.ContextVar("hoomi_scenario_scope", default=None)
+
+
+@contextmanager
+def scenario_budget(budget_seconds: float = None, token: CancellationToken = None):
+    """
+    Tetapkan deadline dan token pembatalan untuk semua call di dalam blok.
+
+    Contoh:
+        with scenario_budget(120) as scope:
+            crew.kickoff(inputs=inputs)
+    """
+    scope = ScenarioScope(budget_seconds, token)
+    reset_token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(reset_token)
+
+
+def current_scope() -> ScenarioScope:
+    return _current_scope.get()
+
+
+class LatencyPolicy():
+    """
+    Konfigurasi latency control.
+
+    Args:
+        llm_timeout: Timeout per LLM call (detik)
+        tool_timeout: Timeout per tool call (detik)
+        hedge_llm: Aktifkan hedging untuk LLM call
+        hedge_tools: Nama tool read-only yang boleh di-hedge
+        hedge_quantile: Quantile latency sebagai delay hedge (default p95)
+        hedge_min_samples: Sampel minimum sebelum hedging aktif
+        poll_interval: Interval pengecekan cancellation saat menunggu
+    """
+
+    def __init__(self, llm_timeout: float = 90.0, tool_timeout: float = 15.0,
+                 hedge_llm: bool = False, hedge_tools=(), hedge_quantile: float = 0.95,
+                 hedge_min_samples: int = 20, poll_interval: float = 0.1):
+        self.llm_timeout = llm_timeout
+        self.tool_timeout = tool_timeout
+        self.hedge_llm = hedge_llm
+        self.hedge_tools = frozenset(hedge_tools)
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.poll_interval = poll_interval
+
+    @classmethod
+    def from_env(cls):
+        """Baca konfigurasi dari environment (HOOMI_LLM_TIMEOUT_S, HOOMI_HEDGE_LLM, ...)."""
+        return cls(
+            llm_timeout=float(os.getenv("HOOMI_LLM_TIMEOUT_S", 90)),
+            tool_timeout=float(os.getenv("HOOMI_TOOL_TIMEOUT_S", 15)),
+            hedge_llm=os.getenv("HOOMI_HEDGE_LLM", "0") == "1",
+        )
+
+    def timeout_for(self, kind: str) -> float:
+        return self.llm_timeout if kind == LLM_CALL else self.tool_timeout
+
+    def hedging_enabled(self, kind: str, name: str) -> bool:
+        if kind == LLM_CALL:
+            return self.hedge_llm
+        return name in self.hedge_tools
+
+
+class LatencyGuard():
+    """
+    Middleware latency control untuk hoomi_hooks.
+
+    Contoh:
+        guard = LatencyGuard(LatencyPolicy(hedge_llm=True))
+        guard.install()
+    """
+
+    def __init__(self, policy: LatencyPolicy = None, max_workers: int = 32, window: int = 200):
+        self.policy = policy or LatencyPolicy()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hoomi-call")
+        self._samples = {}
+        self._window = window
+        self._lock = threading.Lock()
+        self._unregister = None
+        self.stats = {
+            "calls": 0,
+            "timeouts": 0,
+            "deadline_exceeded": 0,
+            "cancelled": 0,
+            "hedges_fired": 0,
+            "hedges_won": 0,
+        }
+
+    def install(self, priority: int = 20):
+        """Pasang sebagai middleware (priority kecil: membungkus layer lain)."""
+        if self._unregister is None:
+            self._unregister = register_middleware(self, kinds=(TOOL, LLM_CALL), priority=priority)
+        return self
+
+    def uninstall(self):
+        if self._unregister is not None:
+            self._unregister()
+            self._unregister = None
+
+    # ==========================================
+    # MIDDLEWARE
+    # ==========================================
+
+    def __call__(self, call, proceed):
+        scope = _current_scope.get()
+        self._count("calls")
+
+        if scope is not None:
+            if scope.token.cancelled:
+                self._count("cancelled")
+                raise CallCancelled(f"{call.kind} '{call.name}' dibatalkan sebelum dijalankan")
+            remaining = scope.remaining()
+            if remaining is not None and remaining <= 0:
+                self._count("deadline_exceeded")
+                raise DeadlineExceeded(f"Budget skenario habis sebelum {call.kind} '{call.name}'")
+
+        timeout = self.policy.timeout_for(call.kind)
+        budget_bound = False
+        if scope is not None and scope.remaining() is not None and scope.remaining() < timeout:
+            timeout = scope.remaining()
+            budget_bound = True
+
+        key = (call.kind, call.name)
+        hedge_after = None
+        if self.policy.hedging_enabled(call.kind, call.name):
+            hedge_after = self._quantile(key)
+
+        started = time.monotonic()
+        primary = self._submit(proceed)
+        futures = {primary}
+        hedge = None
+        end = started + timeout
+
+        while True:
+            now = time.monotonic()
+            if now >= end:
+                self._count("deadline_exceeded" if budget_bound else "timeouts")
+                raise DeadlineExceeded(f"{call.kind} '{call.name}' melebihi {timeout:.1f}s")
+
+            wait_for = min(self.policy.poll_interval, end - now)
+            if hedge is None and hedge_after is not None:
+                wait_for = min(wait_for, max(started + hedge_after - now, 0))
+
+            done, _ = wait(futures, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future.exception() is None or len(futures) == 1:
+                    if future is hedge:
+                        self._count("hedges_won")
+                    self._record(key, time.monotonic() - started)
+                    return future.result()
+                futures.discard(future)  # salah satu gagal, tunggu yang lain
+
+            if scope is not None and scope.token.cancelled:
+                self._count("cancelled")
+                raise CallCancelled(f"{call.kind} '{call.name}' dibatalkan")
+
+            if (hedge is None and hedge_after is not None
+                    and time.monotonic() - started >= hedge_after):
+                hedge = self._submit(proceed)
+                futures.add(hedge)
+                self._count("hedges_fired")
+
+    def _submit(self, proceed):
+        ctx = contextvars.copy_context()
+        return self._executor.submit(ctx.run, proceed)
+
+    # ==========================================
+    # STATISTIK
+    # ==========================================
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _record(self, key, seconds: float):
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self._window)
+            samples.append(seconds)
+
+    def _quantile(self, key):
+        """Latency quantile historis; None jika sampel belum cukup."""
+        with self._lock:
+            samples = self._samples.get(key)
+            if not samples or len(samples) < self.policy.hedge_min_samples:
+                return None
+            ordered = sorted(samples)
+        index = min(int(len(ordered) * self.policy.hedge_quantile), len(ordered) - 1)
+        return ordered[index]
+
+    def backlog(self) -> int:
+        """Jumlah call yang antri menunggu worker executor (queue depth)."""
+        work_queue = getattr(self._executor, "_work_queue", None)
+        return work_queue.qsize() if work_queue is not None else 0
+
+    def report(self) -> dict:
+        """Ringkasan statistik termasuk hedge rate."""
+        with self._lock:
+            stats = dict(self.stats)
+        calls = stats["calls"] or 1
+        stats["hedge_rate"] = stats["hedges_fired"] / calls
+        stats["hedge_win_rate"] = stats["hedges_won"] / stats["hedges_fired"] if stats["hedges_fired"] else 0.0
+        return stats
+
+    def format_report(self) -> str:
+        stats = self.report()
+        return (
+            f"⏱️  Latency: {stats['calls']} calls, {stats['timeouts']} timeout, "
+            f"{stats['deadline_exceeded']} deadline, {stats['cancelled']} cancelled, "
+            f"hedge {stats['hedges_fired']}x ({stats['hedge_rate']:.1%}, menang {stats['hedges_won']})"
+        )
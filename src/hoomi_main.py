@@ -12,14 +12,34 @@ Menggunakan CrewAI dengan:
 - Process: Hierarchical (Manager-based orchestration)
 - Guardrails: Human-in-the-Loop (HITL) untuk data sensitif
 - Agents: Storefront (Orchestrator), Dispatch, Merchant
+
+Startup cepat: crewai/litellm/langchain di-import lazy. Crew dibangun sekali
+per skenario (hoomi_crew_pool) dan dipakai ulang dengan kickoff(inputs=...).
 """
 
 from dotenv import load_dotenv
-from crewai import Crew, Process, LLM
-from hoomi_tasks import HoomiTasks
-from hoomi_agents import HoomiAgents
+from functools import lru_cache
+from hoomi_accounting import format_run_report, install_accounting
+from hoomi_breaker import degraded_final_message, install_breakers
+from hoomi_crew_pool import CrewPool
+from hoomi_events import EVENTS, ConsoleSink, crewai_events_bridged, hitl_input, run_events
+from hoomi_events import install as install_events
+from hoomi_geocoder import get_geocoder
+from hoomi_latency import (
+    CallCancelled, CancellationToken, DeadlineExceeded, LatencyGuard, LatencyPolicy, scenario_budget
+)
+from hoomi_memo import format_memo_report, install_memo, memo_run, memo_totals
+from hoomi_metrics import CACHE, CIRCUIT_STATE, LLM_RATE_LIMIT, dump_metrics, install_metrics
+from hoomi_orders import (
+    CANCELLED, FAILED, PAID, get_order_store, open_scenario_order, order_scope, take_payment_request
+)
+from hoomi_profiling import profile_run, profiling_mode
+from hoomi_ratelimit import install_rate_limiter, rate_limit_session
+from hoomi_templates import AGENT_TEMPLATES
+from hoomi_tracing import install_tracing
 import os
 import sys
+import uuid
 
 
 def print_header():
@@ -45,9 +65,15 @@ def print_menu():
     print("   → Booking kendaraan untuk perjalanan")
     print()
     print("0. ❌ Keluar")
+    print("   💡 Tambahkan 'p' (mis. 3p) untuk memprofilkan order tersebut")
     print("-" * 60)
 
 
+# ==========================================
+# INPUT SKENARIO
+# Mengumpulkan input user menjadi kickoff inputs
+# ==========================================
+
 def scenario_commerce():
     """
     SKENARIO 1: JUAL BELI BARANG
@@ -58,7 +84,7 @@ def scenario_commerce():
     3. Process Payment (Merchant Agent) - HITL for Wallet
     
     Returns:
-        tuple: (agents_list, tasks_list) atau None jika dibatalkan
+        tuple: ("commerce", inputs) atau None jika dibatalkan
     """
     print("\n" + "=" * 60)
     print("🛒 JUAL BELI BARANG")
@@ -75,50 +101,18 @@ def scenario_commerce():
         print("❌ Alamat tidak boleh kosong!")
         return None
     
-    # Inisialisasi agents dan tasks
-    agents = HoomiAgents()
-    tasks = HoomiTasks()
-    
-    # Create agents
-    storefront = agents.storefront_agent()
-    dispatch = agents.dispatch_agent()
-    merchant = agents.merchant_agent()
-    
-    # Create tasks dengan workflow sequential
-    print("\n⚙️  Menyiapkan AI agents...")
-    
-    # Task 1: Search product (Storefront Agent)
-    task1 = tasks.search_product_task(
-        agent=storefront,
-        product_query=product,
-        user_location=destination if destination.lower() != "lokasi saya" else None
-    )
-    
-    # Task 2: Setup delivery (Dispatch Agent) - HITL for GPS
-    task2 = tasks.delivery_setup_task(
-        agent=dispatch,
-        destination=destination,
-        product_info=product
-    )
-    task2.context = [task1]  # Butuh info produk dari task1
-    
-    # Task 3: Process payment (Merchant Agent) - HITL for Wallet
     # Estimasi total (akan di-update setelah task1 & task2)
     estimated_total = 50000  # Placeholder
-    task3 = tasks.payment_task(
-        agent=merchant,
-        total_amount=estimated_total,
-        recipient_id="MERCHANT_TBD",
-        description=f"Pembelian {product} + Delivery"
-    )
-    task3.context = [task1, task2]  # Butuh info produk + delivery
     
-    print("✅ Setup selesai!\n")
-    
-    return (
-        [storefront, dispatch, merchant],
-        [task1, task2, task3]
-    )
+    return "commerce", {
+        "product_query": product,
+        "user_location": destination if destination.lower() != "lokasi saya" else "belum diketahui",
+        "destination": destination,
+        "product_info": product,
+        "total_amount": f"{estimated_total:,}",
+        "recipient_id": "MERCHANT_TBD",
+        "payment_description": f"Pembelian {product} + Delivery",
+    }
 
 
 def scenario_delivery():
@@ -130,7 +124,7 @@ def scenario_delivery():
     2. Process Payment (Merchant Agent) - HITL for Wallet
     
     Returns:
-        tuple: (agents_list, tasks_list) atau None jika dibatalkan
+        tuple: ("delivery", inputs) atau None jika dibatalkan
     """
     print("\n" + "=" * 60)
     print("📦 PENGANTARAN BARANG")
@@ -151,40 +145,16 @@ def scenario_delivery():
     if not package_desc.strip():
         package_desc = "Paket"
     
-    # Inisialisasi agents dan tasks
-    agents = HoomiAgents()
-    tasks = HoomiTasks()
-    
-    # Create agents (tidak perlu Storefront untuk pure delivery)
-    dispatch = agents.dispatch_agent()
-    merchant = agents.merchant_agent()
-    
-    print("\n⚙️  Menyiapkan AI agents...")
-    
-    # Task 1: Package delivery calculation
-    task1 = tasks.package_delivery_task(
-        agent=dispatch,
-        pickup_address=pickup,
-        destination_address=destination,
-        package_description=package_desc
-    )
-    
-    # Task 2: Process payment - HITL for Wallet
     estimated_cost = 25000  # Placeholder
-    task2 = tasks.payment_task(
-        agent=merchant,
-        total_amount=estimated_cost,
-        recipient_id="DELIVERY_SERVICE",
-        description=f"Pengiriman {package_desc}"
-    )
-    task2.context = [task1]  # Butuh info biaya dari task1
-    
-    print("✅ Setup selesai!\n")
     
-    return (
-        [dispatch, merchant],
-        [task1, task2]
-    )
+    return "delivery", {
+        "pickup_address": pickup,
+        "destination_address": destination,
+        "package_description": package_desc,
+        "total_amount": f"{estimated_cost:,}",
+        "recipient_id": "DELIVERY_SERVICE",
+        "payment_description": f"Pengiriman {package_desc}",
+    }
 
 
 def scenario_ride():
@@ -196,7 +166,7 @@ def scenario_ride():
     2. Process Payment (Merchant Agent) - HITL for Wallet
     
     Returns:
-        tuple: (agents_list, tasks_list) atau None jika dibatalkan
+        tuple: ("ride", inputs) atau None jika dibatalkan
     """
     print("\n" + "=" * 60)
     print("🚗 ANTAR JEMPUT PENUMPANG")
@@ -223,43 +193,98 @@ def scenario_ride():
         print("❌ Input harus berupa angka!")
         return None
     
-    # Inisialisasi agents dan tasks
-    agents = HoomiAgents()
+    estimated_fare = 35000  # Placeholder
+    
+    return "ride", {
+        "pickup_location": pickup,
+        "destination": destination,
+        "passenger_count": str(passenger_count),
+        "total_amount": f"{estimated_fare:,}",
+        "recipient_id": "RIDE_SERVICE",
+        "payment_description": f"Perjalanan untuk {passenger_count} penumpang",
+    }
+
+
+# ==========================================
+# CREW BUILDERS
+# Dibangun sekali per skenario, lalu dipakai ulang oleh CREW_POOL
+# ==========================================
+
+def build_commerce_crew():
+    """Crew skenario Jual Beli: Storefront → Dispatch → Merchant."""
+    from hoomi_tasks import HoomiTasks
     tasks = HoomiTasks()
     
-    # Create agents
-    dispatch = agents.dispatch_agent()
-    merchant = agents.merchant_agent()
+    storefront = AGENT_TEMPLATES.get("storefront_agent")
+    dispatch = AGENT_TEMPLATES.get("dispatch_agent")
+    merchant = AGENT_TEMPLATES.get("merchant_agent")
     
-    print("\n⚙️  Menyiapkan AI agents...")
+    # Task 1: Search product (Storefront Agent)
+    task1 = tasks.search_product_task(agent=storefront)
     
-    # Task 1: Ride booking - HITL for GPS
-    task1 = tasks.ride_booking_task(
-        agent=dispatch,
-        pickup_location=pickup,
-        destination=destination,
-        passenger_count=passenger_count
-    )
+    # Task 2: Setup delivery (Dispatch Agent) - HITL for GPS
+    task2 = tasks.delivery_setup_task(agent=dispatch)
+    task2.context = [task1]  # Butuh info produk dari task1
+    
+    # Task 3: Process payment (Merchant Agent) - HITL for Wallet
+    task3 = tasks.payment_task(agent=merchant)
+    task3.context = [task1, task2]  # Butuh info produk + delivery
+    
+    return create_orchestrator_crew([storefront, dispatch, merchant], [task1, task2, task3])
+
+
+def build_delivery_crew():
+    """Crew skenario Pengantaran: Dispatch → Merchant."""
+    from hoomi_tasks import HoomiTasks
+    tasks = HoomiTasks()
+    
+    # Tidak perlu Storefront untuk pure delivery
+    dispatch = AGENT_TEMPLATES.get("dispatch_agent")
+    merchant = AGENT_TEMPLATES.get("merchant_agent")
+    
+    # Task 1: Package delivery calculation
+    task1 = tasks.package_delivery_task(agent=dispatch)
     
     # Task 2: Process payment - HITL for Wallet
-    estimated_fare = 35000  # Placeholder
-    task2 = tasks.payment_task(
-        agent=merchant,
-        total_amount=estimated_fare,
-        recipient_id="RIDE_SERVICE",
-        description=f"Perjalanan untuk {passenger_count} penumpang"
-    )
+    task2 = tasks.payment_task(agent=merchant)
     task2.context = [task1]  # Butuh info biaya dari task1
     
-    print("✅ Setup selesai!\n")
+    return create_orchestrator_crew([dispatch, merchant], [task1, task2])
+
+
+def build_ride_crew():
+    """Crew skenario Antar Jemput: Dispatch → Merchant."""
+    from hoomi_tasks import HoomiTasks
+    tasks = HoomiTasks()
+    
+    dispatch = AGENT_TEMPLATES.get("dispatch_agent")
+    merchant = AGENT_TEMPLATES.get("merchant_agent")
     
-    return (
-        [dispatch, merchant],
-        [task1, task2]
-    )
+    # Task 1: Ride booking - HITL for GPS
+    task1 = tasks.ride_booking_task(agent=dispatch)
+    
+    # Task 2: Process payment - HITL for Wallet
+    task2 = tasks.payment_task(agent=merchant)
+    task2.context = [task1]  # Butuh info biaya dari task1
+    
+    return create_orchestrator_crew([dispatch, merchant], [task1, task2])
 
 
-def create_orchestrator_crew(agents_list, tasks_list):
+@lru_cache(maxsize=None)
+def get_manager_llm():
+    """Manager LLM untuk Hierarchical Process (satu instance per proses)."""
+    from crewai import LLM
+    from hoomi_events import llm_stream_kwargs
+    from hoomi_hooks import instrument_llm
+    return instrument_llm(LLM(
+        model="gemini/gemini-2.0-flash-exp",
+        api_key=os.getenv("GOOGLE_API_KEY"),
+        temperature=0.7,  # Lebih kreatif untuk orchestration
+        **llm_stream_kwargs()
+    ), label="manager")
+
+
+def create_orchestrator_crew(agents_list, tasks_list, user_id: str = None):
     """
     Buat Crew dengan Hierarchical Process (Orchestrator Mode).
     
@@ -267,35 +292,80 @@ def create_orchestrator_crew(agents_list, tasks_list):
     - Menggunakan Process.hierarchical
     - Manager LLM sebagai "otak" orchestrator
     - Auto-delegation antar agents
+    - Memory lokal SQLite per user (tanpa embedding call per order)
     
     Args:
         agents_list: List of agents
         tasks_list: List of tasks
+        user_id: Namespace memory user (default: env HOOMI_USER_ID)
     
     Returns:
         Crew: Configured crew dengan hierarchical process
     """
-    # Setup Manager LLM untuk Hierarchical Process
-    manager_llm = LLM(
-        model="gemini/gemini-2.0-flash-exp",
-        api_key=os.getenv("GOOGLE_API_KEY"),
-        temperature=0.7  # Lebih kreatif untuk orchestration
-    )
+    from crewai import Crew, Process
+    from hoomi_memory import build_crew_memory
     
     # Create Crew dengan Hierarchical Process
     crew = Crew(
         agents=agents_list,
         tasks=tasks_list,
         process=Process.hierarchical,  # Mode Orchestrator (TOR B.1)
-        manager_llm=manager_llm,       # Manager sebagai "otak"
+        manager_llm=get_manager_llm(), # Manager sebagai "otak"
         verbose=True,                  # Untuk debugging
         memory=True,                   # Ingat context antar tasks
-        full_output=True               # Return detailed output
+        full_output=True,              # Return detailed output
+        # Fallback progress task_end jika event bus CrewAI tidak tersedia
+        task_callback=None if crewai_events_bridged() else EVENTS.task_callback,
+        # Backend memory lokal (SQLite FTS5) per user
+        **build_crew_memory(user_id or os.getenv("HOOMI_USER_ID", "default"))
     )
     
     return crew
 
 
+CREW_POOL = CrewPool({
+    "commerce": build_commerce_crew,
+    "delivery": build_delivery_crew,
+    "ride": build_ride_crew,
+})
+
+
+def approve_payment(order_id: str) -> dict:
+    """
+    HITL pembayaran (Guardrails Wallet) di main thread setelah crew.kickoff().
+    
+    pay_wallet hanya mencatat permintaan pembayaran; prompt approval tidak
+    dijalankan di thread executor tool, sehingga tidak ada input() yang
+    tertinggal membaca stdin setelah order ditutup (timeout/Ctrl+C).
+    Order baru ditandai paid jika user menyetujui.
+    
+    Returns:
+        dict permintaan pembayaran + "approved" (dan "error" jika gagal
+        dicatat), atau None jika tidak ada pembayaran yang diminta
+    """
+    request = take_payment_request(order_id)
+    if request is None:
+        return None
+    answer = input(f"\n💳 Setujui pembayaran Rp {request['amount_idr']:,} ke {request['recipient']} "
+                   f"({request['description']})? (yes/no): ")
+    request["approved"] = answer.strip().lower() in ("y", "yes", "ya")
+    if request["approved"]:
+        try:
+            get_order_store().update_status(order_id, PAID)
+        except (KeyError, ValueError) as e:
+            request["error"] = str(e)
+    return request
+
+
+def _close_order(order_id: str, status: str):
+    """Tutup order yang tidak selesai (cancelled/failed) agar tidak tersisa sebagai order aktif."""
+    take_payment_request(order_id)  # Permintaan pembayaran yang belum disetujui ikut dibuang
+    try:
+        get_order_store().update_status(order_id, status)
+    except (KeyError, ValueError):
+        pass  # Sudah tidak aktif (mis. sudah delivered)
+
+
 def main():
     """Main entry point untuk Hoomi AI Agent Orchestrator."""
     # Load environment variables
@@ -307,16 +377,58 @@ def main():
         print("📝 Pastikan file .env berisi: GOOGLE_API_KEY=your_key_here")
         sys.exit(1)
     
+    user_id = os.getenv("HOOMI_USER_ID", "default")
+    
+    # Latency control: timeout per call, budget per skenario, hedging opsional
+    latency_guard = LatencyGuard(LatencyPolicy.from_env()).install()
+    scenario_budget_s = float(os.getenv("HOOMI_SCENARIO_BUDGET_S", 300))
+    
+    # Rate limit RPM/TPM + concurrency adaptif bersama untuk semua LLM (HOOMI_RATE_LIMIT=0 untuk mematikan)
+    rate_limiter = install_rate_limiter()
+    
+    # Circuit breaker per LLM & backend tool + fallback degradasi (HOOMI_BREAKER=0 untuk mematikan)
+    breakers = install_breakers()
+    
+    # Memo tool idempoten per order (HOOMI_TOOL_MEMO=0 untuk mematikan)
+    install_memo()
+    
+    # Progress event & streaming jawaban final ke CLI
+    install_events()
+    
+    # Span tracing per order -> .hoomi/traces/*.json (HOOMI_TRACE=0 untuk mematikan)
+    tracer = install_tracing()
+    
+    # Token & biaya per skenario/agent/task -> .hoomi/accounting/runs.jsonl
+    accountant = install_accounting()
+    
+    # Metrik Prometheus (HOOMI_METRICS_PORT / HOOMI_METRICS_FILE)
+    if install_metrics() is not None:
+        CACHE.register_source("crew_pool", lambda: (CREW_POOL.stats["reused"], CREW_POOL.stats["built"]))
+        CACHE.register_source("geocoder", lambda: (get_geocoder().stats["hits"], get_geocoder().stats["misses"]))
+        CACHE.register_source("tool_memo", memo_totals)
+        if rate_limiter is not None:
+            LLM_RATE_LIMIT.register_source(rate_limiter.gauges)
+        if breakers is not None:
+            CIRCUIT_STATE.register_source(breakers.states)
+    
     # Print header
     print_header()
     
+    # Bangun crew semua skenario di background selagi user memilih menu
+    CREW_POOL.warm_up()
+    
     # Main loop
     while True:
         # Print menu
         print_menu()
         
         # Get user choice
-        choice = input("Pilihan Anda (0-3): ").strip()
+        choice = input("Pilihan Anda (0-3): ").strip().lower()
+        
+        # Akhiran "p": profil order ini (lihat hoomi_profiling)
+        profile_requested = len(choice) > 1 and choice.endswith("p")
+        if profile_requested:
+            choice = choice[:-1]
         
         # Exit
         if choice == "0":
@@ -342,43 +454,114 @@ def main():
             print("\n🔄 Kembali ke menu utama...\n")
             continue
         
-        # Unpack agents dan tasks
-        agents_list, tasks_list = scenario_result
+        # Unpack skenario dan inputs
+        scenario, inputs = scenario_result
+        
+        # Order nyata di order store: semua task memakai {order_id} yang sama
+        order = open_scenario_order(scenario, inputs, user_id)
+        inputs["order_id"] = order.order_id
+        inputs["user_id"] = user_id
+        print(f"🧾 Order ID: {order.order_id}")
         
-        # Create orchestrator crew
+        # Ambil orchestrator crew dari pool
         print("🤖 Memulai AI Agent Orchestrator...")
         print("=" * 60)
         
+        token = CancellationToken()
+        run_id = uuid.uuid4().hex[:12]
+        unsubscribe = None
+        profile = None
+        memo = None
         try:
-            crew = create_orchestrator_crew(agents_list, tasks_list)
-            
-            # Execute the crew
-            print("\n⏳ Agents sedang bekerja...\n")
-            print("💡 CATATAN:")
-            print("   - Tool dengan HITL akan meminta approval Anda")
-            print("   - Ketik 'yes' untuk approve, atau 'no' untuk reject")
-            print("   - Anda akan diminta input saat diperlukan\n")
-            print("-" * 60 + "\n")
-            
-            result = crew.kickoff()
-            
-            # Display result
-            print("\n" + "=" * 60)
-            print("✅ HASIL AKHIR")
-            print("=" * 60)
-            print(result)
-            print("=" * 60)
+            with CREW_POOL.acquire(scenario, user_id=user_id) as crew, \
+                    scenario_budget(scenario_budget_s, token), \
+                    run_events(run_id, scenario), \
+                    memo_run(run_id) as memo, \
+                    order_scope(order.order_id), \
+                    rate_limit_session(run_id, "interactive"), \
+                    hitl_input():
+                # Process.hierarchical: jawaban akhir order adalah Final Answer manager
+                console = ConsoleSink(total_tasks=len(crew.tasks), final_llm="manager")
+                unsubscribe = EVENTS.subscribe(console)
+                
+                # Execute the crew
+                print("\n⏳ Agents sedang bekerja...\n")
+                print("💡 CATATAN:")
+                print("   - Tool dengan HITL akan meminta approval Anda")
+                print("   - Ketik 'yes' untuk approve, atau 'no' untuk reject")
+                print("   - Anda akan diminta input saat diperlukan\n")
+                print("-" * 60 + "\n")
+                
+                with profile_run(scenario, run_id, profiling_mode(profile_requested),
+                                 order.order_id) as profile:
+                    result = crew.kickoff(inputs=inputs)
+                
+                # Display result
+                print("\n" + "=" * 60)
+                print("✅ HASIL AKHIR")
+                print("=" * 60)
+                if not console.streamed_final:
+                    print(result)
+                print("=" * 60)
+                
+                # HITL pembayaran di main thread, setelah user melihat ringkasannya
+                payment = approve_payment(order.order_id)
+                if payment is not None and payment.get("error"):
+                    print(f"⚠️  Pembayaran tidak tercatat: {payment['error']}")
+                elif payment is not None and payment["approved"]:
+                    print(f"✅ Pembayaran Rp {payment['amount_idr']:,} disetujui, "
+                          f"order {order.order_id} tercatat lunas")
+                elif payment is not None:
+                    print("❌ Pembayaran ditolak, tidak ada dana yang ditarik")
             
+            print(latency_guard.format_report())
+            if rate_limiter is not None:
+                print(rate_limiter.format_report())
+            if breakers is not None and breakers.format_report():
+                print(breakers.format_report())
+            memo_report = format_memo_report(memo.report()) if memo is not None else ""
+            if memo_report:
+                print(memo_report)
+            if tracer is not None and tracer.last_export:
+                print(f"🔍 Trace: {tracer.last_export}")
+            if accountant is not None and accountant.last_report:
+                print(format_run_report(accountant.last_report))
+            if profile is not None:
+                print(f"🔥 Profil: {profile.paths['collapsed']}")
+                print(f"   Ringkasan: {profile.paths['summary']}")
+        
         except KeyboardInterrupt:
+            token.cancel()  # Hentikan call yang masih berjalan di background
+            _close_order(order.order_id, CANCELLED)
             print("\n\n⚠️  Proses dibatalkan oleh user.")
             print("🔄 Kembali ke menu utama...\n")
             continue
-            
+        
+        except (DeadlineExceeded, CallCancelled) as e:
+            token.cancel()
+            _close_order(order.order_id, CANCELLED if isinstance(e, CallCancelled) else FAILED)
+            print(f"\n⏱️  Skenario dihentikan: {str(e)}")
+            print(latency_guard.format_report())
+            if isinstance(e, DeadlineExceeded):
+                # Jawab dengan template tanpa LLM, sesuai status order sebenarnya
+                print("\n" + degraded_final_message(scenario, inputs, type(e).__name__))
+            print("🔄 Kembali ke menu utama...\n")
+            continue
+        
         except Exception as e:
+            _close_order(order.order_id, FAILED)
             print(f"\n❌ ERROR: {str(e)}")
+            print("\n" + degraded_final_message(scenario, inputs, type(e).__name__))
+            if breakers is not None and breakers.format_report():
+                print(breakers.format_report())
             print("🔄 Kembali ke menu utama...\n")
             continue
         
+        finally:
+            if unsubscribe is not None:
+                unsubscribe()
+            dump_metrics()
+        
         # Ask if continue
         print("\n" + "-" * 60)
         continue_choice = input("Ingin menggunakan layanan lain? (y/n): ").strip().lower()
@@ -398,4 +581,4 @@ if __name__ == "__main__":
         sys.exit(0)
     except Exception as e:
         print(f"\n❌ FATAL ERROR: {str(e)}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -0,0 +1,224 @@
+"""
+Hoomi Memo - Memoization Tool Call per Run
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Dalam satu order commerce, Storefront Agent dan Merchant Agent sama-sama
+memanggil check_stock dengan argumen yang sama, dan delegasi manager bisa
+mengulang calculate_route. Middleware ini menyimpan hasil tool idempoten
+selama SATU run (crew.kickoff) sehingga call kedua dilayani dari memo:
+
+1. Hanya tool read-only di MEMO_TOOLS (search, stock, route);
+   tool dengan efek samping (pay_wallet, send_notification, ...) di
+   NEVER_MEMO tidak pernah di-memo, walau dikonfigurasi
+2. Normalisasi argumen - argumen di-bind ke signature tool (positional ==
+   keyword, default diisi), string di-trim/lowercase/spasi dirapikan,
+   koordinat dibulatkan ke 5 desimal (~1 m)
+3. Scope run - memo hidup di contextvar selama memo_run(); run berikutnya
+   mulai kosong sehingga status stok tidak basi antar order. track_delivery
+   tidak di-memo karena status order berubah di dalam run (pembayaran, driver)
+4. Fallback degraded dari hoomi_breaker ("degraded": true) tidak di-memo;
+   satu kegagalan sesaat tidak boleh menutupi backend yang sudah pulih
+   untuk sisa run
+5. Laporan - jumlah call yang dilayani memo per run (dan per tool), plus
+   total lintas run untuk metrik cache hoomi_metrics
+
+HOOMI_TOOL_MEMO=0 mematikan memoization.
+"""
+
+import contextvars
+import inspect
+import json
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+
+from hoomi_hooks import TOOL, register_middleware
+
+# Tool idempoten dalam satu run (nama fungsi di hoomi_tools)
+MEMO_TOOLS = frozenset(("search_product", "check_stock", "calculate_route"))
+
+# Tool dengan efek samping / input user: tidak pernah di-memo
+NEVER_MEMO = frozenset((
+    "pay_wallet", "send_notification", "get_user_location", "find_ride_pool", "assign_order_driver",
+))
+
+COORD_DECIMALS = 5
+
+_current_memo = contextvars.ContextVar("hoomi_run_memo", default=None)
+_install_lock = threading.Lock()
+_installed = False
+_totals = {"hits": 0, "misses": 0}
+_totals_lock = threading.Lock()
+_signatures = {}
+_MISSING = object()
+
+
+def memo_enabled() -> bool:
+    return os.getenv("HOOMI_TOOL_MEMO", "1").lower() not in ("0", "false", "no", "off")
+
+
+def _normalize_value(value):
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, float):
+        return round(value, COORD_DECIMALS)
+    if isinstance(value, int):
+        # 106 dan 106.0 adalah koordinat yang sama
+        return round(float(value), COORD_DECIMALS)
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize_value(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _normalize_value(v)) for k, v in value.items()))
+    return repr(value)
+
+
+def normalize_args(func, args: tuple, kwargs: dict) -> tuple:
+    """Key memo yang sama untuk argumen yang setara secara makna."""
+    signature = _signatures.get(func)
+    if signature is None and func is not None:
+        try:
+            signature = _signatures[func] = inspect.signature(func)
+        except (TypeError, ValueError):
+            signature = None
+    if signature is not None:
+        try:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return tuple((name, _normalize_value(value)) for name, value in bound.arguments.items())
+        except TypeError:
+            pass
+    return (_normalize_value(args), _normalize_value(kwargs))
+
+
+class RunMemo():
+    """
+    Memo hasil tool untuk satu run.
+    
+    Args:
+        run_id: ID order/run (untuk laporan)
+        tools: Nama tool yang boleh di-memo
+    """
+    
+    def __init__(self, run_id: str = None, tools=MEMO_TOOLS):
+        unsafe = frozenset(tools) & NEVER_MEMO
+        if unsafe:
+            raise ValueError(f"Tool dengan efek samping tidak boleh di-memo: {sorted(unsafe)}")
+        self.run_id = run_id
+        self.tools = frozenset(tools)
+        self.hits = {}
+        self.misses = {}
+        self._results = {}
+        self._lock = threading.Lock()
+    
+    def lookup(self, key):
+        with self._lock:
+            return self._results.get(key, _MISSING)
+    
+    def store(self, key, result):
+        with self._lock:
+            self._results[key] = result
+    
+    def record(self, tool: str, hit: bool):
+        counts = self.hits if hit else self.misses
+        with self._lock:
+            counts[tool] = counts.get(tool, 0) + 1
+        with _totals_lock:
+            _totals["hits" if hit else "misses"] += 1
+    
+    def report(self) -> dict:
+        with self._lock:
+            hits, misses = dict(self.hits), dict(self.misses)
+        return {
+            "run_id": self.run_id,
+            "hits": sum(hits.values()),
+            "calls": sum(hits.values()) + sum(misses.values()),
+            "hits_by_tool": hits,
+        }
+
+
+def _is_degraded(result) -> bool:
+    if not isinstance(result, str) or '"degraded"' not in result:
+        return False
+    try:
+        data = json.loads(result)
+    except ValueError:
+        return False
+    return isinstance(data, dict) and data.get("degraded") is True
+
+
+def _memo_middleware(call, proceed):
+    memo = _current_memo.get()
+    if memo is None or call.name not in memo.tools:
+        return proceed()
+    
+    key = (call.name, normalize_args(call.attrs.get("func"), call.args, call.kwargs))
+    cached = memo.lookup(key)
+    if cached is not _MISSING:
+        memo.record(call.name, hit=True)
+        return cached
+    
+    result = proceed()
+    if not _is_degraded(result):
+        memo.store(key, result)
+    memo.record(call.name, hit=False)
+    return result
+
+
+def install_memo(priority: int = 15) -> bool:
+    """
+    Pasang middleware memo (idempotent). Prioritas di bawah LatencyGuard (20)
+    sehingga hit memo tidak menempati thread executor timeout.
+    
+    Returns:
+        bool: False jika HOOMI_TOOL_MEMO=0
+    """
+    global _installed
+    if not memo_enabled():
+        return False
+    with _install_lock:
+        if not _installed:
+            register_middleware(_memo_middleware, kinds=(TOOL,), priority=priority)
+            _installed = True
+    return True
+
+
+@contextmanager
+def _memo_scope(run_id: str):
+    memo = RunMemo(run_id)
+    reset_token = _current_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _current_memo.reset(reset_token)
+
+
+def memo_run(run_id: str = None):
+    """
+    Context manager memo untuk satu crew.kickoff().
+    
+    Contoh:
+        with memo_run(run_id) as memo:
+            result = crew.kickoff(inputs=inputs)
+        print(format_memo_report(memo.report()))
+    
+    Returns:
+        Context manager yang menghasilkan RunMemo, atau None jika memo mati
+    """
+    if not memo_enabled():
+        return nullcontext()
+    return _memo_scope(run_id)
+
+
+def memo_totals() -> tuple:
+    """(hits, misses) lintas run, untuk CACHE.register_source."""
+    return _totals["hits"], _totals["misses"]
+
+
+def format_memo_report(report: dict) -> str:
+    if not report or not report["calls"]:
+        return ""
+    by_tool = ", ".join(f"{tool} {count}" for tool, count in sorted(report["hits_by_tool"].items()))
+    return (f"♻️  Memo tool: {report['hits']} dari {report['calls']} call dilayani dari memo"
+            + (f" ({by_tool})" if by_tool else ""))
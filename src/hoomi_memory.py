@@ -0,0 +1,393 @@
+"""
+Hoomi Memory - Backend Memory Lokal untuk Crew dengan memory=True
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Memory bawaan CrewAI (memory=True) memakai RAG storage berbasis embedding,
+sehingga setiap order menambah panggilan embedding dan storage terus tumbuh.
+Modul ini menyediakan backend pengganti berbasis SQLite + FTS5:
+
+1. Namespace per user - memory user A tidak bocor ke user B
+2. Batas ukuran & umur - item lama/berlebih otomatis di-evict
+3. Embedding opsional - hanya untuk item dengan salience di atas threshold
+4. Adapter CrewAI - ShortTermMemory, LongTermMemory, EntityMemory
+
+Baca/tulis memory cukup satu query SQLite lokal (mikrodetik), bukan
+round-trip ke API embedding.
+"""
+
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+
+DEFAULT_DB_PATH = os.getenv(
+    "HOOMI_MEMORY_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".hoomi", "memory.db")
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class HoomiMemoryStore():
+    """
+    Storage memory berbasis SQLite FTS5 dengan namespace per user.
+
+    Setiap item disimpan dengan namespace (user_id), kind (short_term,
+    long_term, entity), salience (0-1), dan timestamp. Pencarian memakai
+    ranking BM25 dari FTS5.
+
+    Args:
+        path: Lokasi file SQLite (":memory:" untuk in-process saja)
+        max_items: Jumlah item maksimum per namespace
+        max_age_seconds: Umur maksimum item sebelum di-evict
+        salience_threshold: Item dengan salience >= threshold akan di-embed
+        embedder: Callable(text) -> list[float] (optional)
+        evict_every: Eviction dijalankan setiap N write per namespace
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, max_items: int = 500,
+                 max_age_seconds: float = 7 * 24 * 3600, salience_threshold: float = 0.8,
+                 embedder=None, evict_every: int = 32):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_items = max_items
+        self.max_age_seconds = max_age_seconds
+        self.salience_threshold = salience_threshold
+        self.embedder = embedder
+        self.evict_every = evict_every
+
+        self._lock = threading.Lock()
+        self._writes = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._init_schema()
+
+    def _init_schema(self):
+        """Buat tabel, index FTS5, dan trigger sinkronisasi."""
+        with self._lock:
+            self._conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+
+                CREATE TABLE IF NOT EXISTS memories (
+                    id INTEGER PRIMARY KEY,
+                    namespace TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    key TEXT,
+                    content TEXT NOT NULL,
+                    metadata TEXT,
+                    salience REAL NOT NULL DEFAULT 0.5,
+                    created_at REAL NOT NULL,
+                    embedding BLOB
+                );
+                CREATE INDEX IF NOT EXISTS idx_memories_ns_kind
+                    ON memories(namespace, kind, created_at);
+                CREATE INDEX IF NOT EXISTS idx_memories_key
+                    ON memories(namespace, kind, key);
+
+                CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts
+                    USING fts5(content, content='memories', content_rowid='id');
+
+                CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+                    INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
+                END;
+                CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
+                    INSERT INTO memories_fts(memories_fts, rowid, content)
+                        VALUES ('delete', old.id, old.content);
+                END;
+            """)
+
+    # ==========================================
+    # WRITE PATH
+    # ==========================================
+
+    def save(self, namespace: str, kind: str, content: str, metadata: dict = None,
+             salience: float = 0.5, key: str = None) -> int:
+        """
+        Simpan satu item memory.
+
+        Embedding hanya dihitung jika embedder tersedia DAN salience item
+        >= salience_threshold, sehingga mayoritas write tetap tanpa API call.
+
+        Returns:
+            int: ID item yang disimpan
+        """
+        embedding = None
+        if self.embedder is not None and salience >= self.salience_threshold:
+            embedding = array("f", self.embedder(content)).tobytes()
+
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO memories (namespace, kind, key, content, metadata, salience, created_at, embedding) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (namespace, kind, key, content, json.dumps(metadata or {}, default=str),
+                 float(salience), time.time(), embedding)
+            )
+            self._conn.commit()
+
+            writes = self._writes.get(namespace, 0) + 1
+            self._writes[namespace] = writes
+            if writes % self.evict_every == 0:
+                self._evict_locked(namespace)
+
+        return cursor.lastrowid
+
+    def evict(self, namespace: str = None):
+        """Jalankan eviction umur & ukuran untuk satu atau semua namespace."""
+        with self._lock:
+            if namespace is not None:
+                self._evict_locked(namespace)
+                return
+            namespaces = [row[0] for row in self._conn.execute("SELECT DISTINCT namespace FROM memories")]
+            for ns in namespaces:
+                self._evict_locked(ns)
+
+    def _evict_locked(self, namespace: str):
+        """Hapus item kedaluwarsa, lalu item dengan salience terendah jika over cap."""
+        cutoff = time.time() - self.max_age_seconds
+        self._conn.execute(
+            "DELETE FROM memories WHERE namespace = ? AND created_at < ?",
+            (namespace, cutoff)
+        )
+        self._conn.execute(
+            "DELETE FROM memories WHERE id IN ("
+            "  SELECT id FROM memories WHERE namespace = ?"
+            "  ORDER BY salience DESC, created_at DESC LIMIT -1 OFFSET ?"
+            ")",
+            (namespace, self.max_items)
+        )
+        self._conn.commit()
+
+    def reset(self, namespace: str = None, kind: str = None):
+        """Hapus memory (semua, per namespace, atau per namespace + kind)."""
+        clauses, params = [], []
+        if namespace is not None:
+            clauses.append("namespace = ?")
+            params.append(namespace)
+        if kind is not None:
+            clauses.append("kind = ?")
+            params.append(kind)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            self._conn.execute(f"DELETE FROM memories{where}", params)
+            self._conn.commit()
+
+    # ==========================================
+    # READ PATH
+    # ==========================================
+
+    def search(self, namespace: str, query: str, kind: str = None, limit: int = 3) -> list:
+        """
+        Cari item paling relevan dengan ranking BM25 (FTS5).
+
+        Jika embedder tersedia, item yang punya embedding ikut di-rerank
+        dengan cosine similarity terhadap query.
+
+        Returns:
+            list[dict]: Item dengan key id, content, metadata, score
+        """
+        fts_query = _to_fts_query(query)
+        if not fts_query:
+            return []
+
+        sql = (
+            "SELECT m.id, m.content, m.metadata, bm25(memories_fts) AS rank, m.embedding "
+            "FROM memories_fts JOIN memories m ON m.id = memories_fts.rowid "
+            "WHERE memories_fts MATCH ? AND m.namespace = ?"
+        )
+        params = [fts_query, namespace]
+        if kind is not None:
+            sql += " AND m.kind = ?"
+            params.append(kind)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit * 4 if self.embedder is not None else limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        results = [
+            {
+                "id": row[0],
+                "content": row[1],
+                "metadata": json.loads(row[2] or "{}"),
+                # bm25() bernilai negatif; dibalik supaya makin besar makin relevan
+                "score": -row[3],
+                "_embedding": row[4],
+            }
+            for row in rows
+        ]
+
+        if self.embedder is not None and any(r["_embedding"] for r in results):
+            query_vec = list(self.embedder(query))
+            for result in results:
+                if result["_embedding"]:
+                    vec = array("f")
+                    vec.frombytes(result["_embedding"])
+                    result["score"] += _cosine(query_vec, vec)
+            results.sort(key=lambda r: r["score"], reverse=True)
+
+        for result in results:
+            del result["_embedding"]
+        return results[:limit]
+
+    def latest(self, namespace: str, kind: str, key: str, limit: int = 3) -> list:
+        """Ambil item terbaru dengan key yang sama persis (untuk long-term memory)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, content, metadata, salience, created_at FROM memories "
+                "WHERE namespace = ? AND kind = ? AND key = ? "
+                "ORDER BY created_at DESC LIMIT ?",
+                (namespace, kind, key, limit)
+            ).fetchall()
+
+        return [
+            {
+                "id": row[0],
+                "content": row[1],
+                "metadata": json.loads(row[2] or "{}"),
+                "salience": row[3],
+                "created_at": row[4],
+            }
+            for row in rows
+        ]
+
+    def count(self, namespace: str = None) -> int:
+        """Jumlah item tersimpan (untuk monitoring)."""
+        with self._lock:
+            if namespace is None:
+                return self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM memories WHERE namespace = ?", (namespace,)
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _to_fts_query(text: str) -> str:
+    """Ubah teks bebas menjadi query FTS5 yang aman (token di-OR-kan)."""
+    tokens = {token.lower() for token in _TOKEN_RE.findall(text or "") if len(token) > 1}
+    return " OR ".join(f'"{token}"' for token in sorted(tokens))
+
+
+def _cosine(a, b) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+# ==========================================
+# ADAPTER CREWAI MEMORY STORAGE
+# ==========================================
+
+class HoomiRAGStorage():
+    """
+    Pengganti RAGStorage CrewAI untuk ShortTermMemory dan EntityMemory.
+
+    Interface: save(value, metadata), search(query, limit, filter,
+    score_threshold), reset(). Atribut namespace boleh diganti saat crew
+    dipakai ulang untuk user lain.
+    """
+
+    def __init__(self, store: HoomiMemoryStore, namespace: str, kind: str = "short_term"):
+        self.store = store
+        self.namespace = namespace
+        self.kind = kind
+
+    def save(self, value, metadata: dict = None):
+        metadata = metadata or {}
+        salience = float(metadata.get("salience", 0.5))
+        self.store.save(self.namespace, self.kind, str(value), metadata, salience=salience)
+
+    def search(self, query: str, limit: int = 3, filter: dict = None, score_threshold: float = 0.35):
+        # score_threshold diabaikan: skor BM25 tidak sebanding dengan cosine RAGStorage
+        return [
+            {"id": item["id"], "metadata": item["metadata"], "context": item["content"], "score": item["score"]}
+            for item in self.store.search(self.namespace, query, kind=self.kind, limit=limit)
+        ]
+
+    def reset(self):
+        self.store.reset(namespace=self.namespace, kind=self.kind)
+
+
+class HoomiLTMStorage():
+    """
+    Pengganti LTMSQLiteStorage CrewAI untuk LongTermMemory.
+
+    Interface: save(task_description, metadata, datetime, score),
+    load(task_description, latest_n), reset().
+    """
+
+    kind = "long_term"
+
+    def __init__(self, store: HoomiMemoryStore, namespace: str):
+        self.store = store
+        self.namespace = namespace
+
+    def save(self, task_description: str, metadata: dict, datetime: str, score: float):
+        metadata = dict(metadata or {})
+        metadata["datetime"] = datetime
+        metadata["score"] = score
+        self.store.save(
+            self.namespace, self.kind, task_description, metadata,
+            salience=min(float(score or 0) / 10, 1.0), key=task_description
+        )
+
+    def load(self, task_description: str, latest_n: int = 3):
+        items = self.store.latest(self.namespace, self.kind, task_description, limit=latest_n)
+        if not items:
+            return None
+        return [
+            {
+                "metadata": item["metadata"],
+                "datetime": item["metadata"].get("datetime"),
+                "score": item["metadata"].get("score"),
+            }
+            for item in items
+        ]
+
+    def reset(self):
+        self.store.reset(namespace=self.namespace, kind=self.kind)
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store() -> HoomiMemoryStore:
+    """Store bersama satu proses (lazy, dibuat saat pertama dipakai)."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = HoomiMemoryStore()
+        return _default_store
+
+
+def build_crew_memory(user_id: str = "default", store: HoomiMemoryStore = None) -> dict:
+    """
+    Buat kwargs memory untuk Crew(...) yang memakai backend SQLite lokal.
+
+    Contoh:
+        crew = Crew(agents=..., tasks=..., memory=True, **build_crew_memory("USER123"))
+
+    Args:
+        user_id: Namespace memory (satu user = satu namespace)
+        store: HoomiMemoryStore (default: store bersama)
+
+    Returns:
+        dict: short_term_memory, long_term_memory, entity_memory
+    """
+    from crewai.memory import EntityMemory, LongTermMemory, ShortTermMemory
+
+    store = store or get_default_store()
+    return {
+        "short_term_memory": ShortTermMemory(storage=HoomiRAGStorage(store, user_id, "short_term")),
+        "long_term_memory": LongTermMemory(storage=HoomiLTMStorage(store, user_id)),
+        "entity_memory": EntityMemory(storage=HoomiRAGStorage(store, user_id, "entity")),
+    }
@@ -0,0 +1,381 @@
+"""
+Hoomi Metrics - Registry Metrik Operasional (Format Prometheus)
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Metrik yang dicatat:
+- hoomi_scenario_duration_seconds    histogram per skenario & status
+- hoomi_tool_calls_total             jumlah tool call per tool & status
+- hoomi_tool_duration_seconds        histogram latency per tool
+- hoomi_llm_calls_total              jumlah LLM call per LLM & status
+- hoomi_llm_errors_total             error LLM per tipe exception
+- hoomi_llm_retries_total            LLM call ulang setelah error di run yang sama
+- hoomi_llm_duration_seconds         histogram latency per LLM
+- hoomi_hitl_wait_seconds            histogram waktu tunggu approval HITL
+- hoomi_cache_requests_total         hit/miss per cache (+ hoomi_cache_hit_ratio)
+- hoomi_llm_rate_limit               gauge limit & antrian rate limiter LLM (hoomi_ratelimit)
+- hoomi_circuit_state                gauge status circuit breaker (0 closed, 1 half-open, 2 open)
+
+Hot path tanpa lock: setiap metrik menyimpan shard per thread
+(threading.local); shard hanya dijumlahkan saat scrape/dump.
+
+Ekspos:
+    HOOMI_METRICS_PORT=9464         # http://127.0.0.1:9464/metrics
+    HOOMI_METRICS_FILE=metrics.prom # ditulis ulang setelah setiap order
+    HOOMI_METRICS=0                 # matikan
+"""
+
+import bisect
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from hoomi_events import EVENTS, HITL_END, RUN_END, RUN_START, EventSink, current_run_id
+from hoomi_hooks import LLM_CALL, TOOL, register_middleware
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class _Sharded():
+    """Basis metrik dengan shard dict per thread (increment tanpa lock)."""
+    
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+    
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+    
+    def _snapshots(self):
+        with self._lock:
+            shards = list(self._shards)
+        return [shard.copy() for shard in shards]
+    
+    def _label_str(self, values, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter(_Sharded):
+    """Counter monoton per kombinasi label."""
+    
+    def inc(self, labels: tuple = (), amount: float = 1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+    
+    def values(self) -> dict:
+        totals = {}
+        for snapshot in self._snapshots():
+            for labels, value in snapshot.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+    
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{self._label_str(labels)} {_num(value)}")
+        return lines
+
+
+class Histogram(_Sharded):
+    """Histogram bucket kumulatif gaya Prometheus."""
+    
+    def __init__(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value: float, labels: tuple = ()):
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # [count per bucket..., +Inf, sum]
+            state = shard[labels] = [0] * (len(self.buckets) + 2)
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+    
+    def values(self) -> dict:
+        totals = {}
+        for snapshot in self._snapshots():
+            for labels, state in snapshot.items():
+                merged = totals.setdefault(labels, [0] * (len(self.buckets) + 2))
+                for i, value in enumerate(list(state)):
+                    merged[i] += value
+        return totals
+    
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, state in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _num(bound)
+                le_label = f'le="{le}"'
+                lines.append(f"{self.name}_bucket{self._label_str(labels, le_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_str(labels)} {_num(state[-1])}")
+            lines.append(f"{self.name}_count{self._label_str(labels)} {cumulative}")
+        return lines
+
+
+class CacheMetrics(Counter):
+    """
+    Hit/miss per cache + rasio hit.
+    
+    Cache bisa mencatat langsung (record) atau mendaftarkan fungsi statistik
+    yang dibaca saat scrape (register_source), mis. CrewPool.stats.
+    """
+    
+    def __init__(self):
+        super().__init__("hoomi_cache_requests_total", "Request cache per hasil (hit/miss)", ("cache", "result"))
+        self._sources = {}
+    
+    def record(self, cache: str, hit: bool):
+        self.inc((cache, "hit" if hit else "miss"))
+    
+    def register_source(self, cache: str, stats_fn):
+        """stats_fn() -> (hits, misses)."""
+        self._sources[cache] = stats_fn
+    
+    def values(self) -> dict:
+        totals = super().values()
+        for cache, stats_fn in list(self._sources.items()):
+            try:
+                hits, misses = stats_fn()
+            except Exception:
+                continue
+            totals[(cache, "hit")] = totals.get((cache, "hit"), 0) + hits
+            totals[(cache, "miss")] = totals.get((cache, "miss"), 0) + misses
+        return totals
+    
+    def render(self) -> list:
+        values = self.values()
+        lines = super().render()
+        lines += ["# HELP hoomi_cache_hit_ratio Rasio hit cache (hit / total)",
+                  "# TYPE hoomi_cache_hit_ratio gauge"]
+        for cache in sorted({labels[0] for labels in values}):
+            hits = values.get((cache, "hit"), 0)
+            total = hits + values.get((cache, "miss"), 0)
+            lines.append(f'hoomi_cache_hit_ratio{{cache="{_escape(cache)}"}} {_num(hits / total if total else 0)}')
+        return lines
+
+
+class Gauge(_Sharded):
+    """Gauge yang nilainya dibaca dari fungsi sumber saat scrape/dump."""
+    
+    def __init__(self, name: str, help: str, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self._sources = []
+    
+    def register_source(self, values_fn):
+        """values_fn() -> {labels: nilai}."""
+        self._sources.append(values_fn)
+    
+    def values(self) -> dict:
+        totals = {}
+        for values_fn in list(self._sources):
+            try:
+                totals.update(values_fn())
+            except Exception:
+                continue
+        return totals
+    
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for labels, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{self._label_str(labels)} {_num(value)}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _num(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry():
+    """Kumpulan metrik + exporter Prometheus text (HTTP / file)."""
+    
+    def __init__(self):
+        self._metrics = []
+        self._server = None
+    
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+    
+    def counter(self, name: str, help: str, labelnames=()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+    
+    def histogram(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+    
+    def gauge(self, name: str, help: str, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+    
+    def render(self) -> str:
+        """Semua metrik dalam Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+    
+    def dump(self, path: str):
+        """Tulis metrik ke file secara atomik (untuk node_exporter textfile collector)."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+    
+    def serve(self, port: int, addr: str = "127.0.0.1"):
+        """Ekspos /metrics di port lokal (daemon thread)."""
+        if self._server is not None:
+            return self._server
+        registry = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass  # Jangan campur log scrape dengan output CLI
+        
+        self._server = ThreadingHTTPServer((addr, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True, name="hoomi-metrics").start()
+        return self._server
+
+
+# ==========================================
+# METRIK HOOMI
+# ==========================================
+
+METRICS = MetricsRegistry()
+
+SCENARIO_DURATION = METRICS.histogram(
+    "hoomi_scenario_duration_seconds", "Durasi end-to-end satu order", ("scenario", "status"))
+TOOL_CALLS = METRICS.counter("hoomi_tool_calls_total", "Jumlah tool call", ("tool", "status"))
+TOOL_DURATION = METRICS.histogram("hoomi_tool_duration_seconds", "Latency tool call", ("tool",))
+LLM_CALLS = METRICS.counter("hoomi_llm_calls_total", "Jumlah LLM call", ("llm", "status"))
+LLM_ERRORS = METRICS.counter("hoomi_llm_errors_total", "Error LLM call per tipe", ("llm", "error"))
+LLM_RETRIES = METRICS.counter("hoomi_llm_retries_total", "LLM call ulang setelah error dalam run yang sama", ("llm",))
+LLM_DURATION = METRICS.histogram("hoomi_llm_duration_seconds", "Latency LLM call", ("llm",))
+HITL_WAIT = METRICS.histogram(
+    "hoomi_hitl_wait_seconds", "Waktu tunggu approval HITL", (),
+    buckets=(1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600))
+CACHE = METRICS.register(CacheMetrics())
+LLM_RATE_LIMIT = METRICS.gauge(
+    "hoomi_llm_rate_limit", "Limit & antrian rate limiter LLM client-side saat ini", ("limit",))
+CIRCUIT_STATE = METRICS.gauge(
+    "hoomi_circuit_state", "Status circuit breaker (0 closed, 1 half-open, 2 open)", ("breaker",))
+
+
+def record_cache(cache: str, hit: bool):
+    """Catat satu lookup cache (dipakai cache search, memo tool, dsb)."""
+    CACHE.record(cache, hit)
+
+
+class _MetricsCollector(EventSink):
+    """Middleware tool/LLM + sink event untuk durasi skenario dan HITL."""
+    
+    def __init__(self):
+        self._run_started = {}
+        self._llm_failed = {}
+    
+    def __call__(self, call, proceed):
+        started = time.perf_counter()
+        is_llm = call.kind == LLM_CALL
+        retry_key = (current_run_id(), call.name) if is_llm else None
+        if is_llm and self._llm_failed.pop(retry_key, False):
+            LLM_RETRIES.inc((call.name,))
+        try:
+            result = proceed()
+        except BaseException as e:
+            elapsed = time.perf_counter() - started
+            if is_llm:
+                LLM_CALLS.inc((call.name, "error"))
+                LLM_ERRORS.inc((call.name, type(e).__name__))
+                LLM_DURATION.observe(elapsed, (call.name,))
+                self._llm_failed[retry_key] = True
+            else:
+                TOOL_CALLS.inc((call.name, "error"))
+                TOOL_DURATION.observe(elapsed, (call.name,))
+            raise
+        elapsed = time.perf_counter() - started
+        if is_llm:
+            LLM_CALLS.inc((call.name, "ok"))
+            LLM_DURATION.observe(elapsed, (call.name,))
+        else:
+            TOOL_CALLS.inc((call.name, "ok"))
+            TOOL_DURATION.observe(elapsed, (call.name,))
+        return result
+    
+    def on_event(self, event):
+        if event.type == RUN_START:
+            self._run_started[event.run_id] = time.perf_counter()
+        elif event.type == RUN_END:
+            started = self._run_started.pop(event.run_id, None)
+            if started is not None:
+                SCENARIO_DURATION.observe(time.perf_counter() - started,
+                                          (event.data.get("scenario") or "unknown", event.data.get("status", "success")))
+            for key in [key for key in self._llm_failed if key[0] == event.run_id]:
+                self._llm_failed.pop(key, None)
+        elif event.type == HITL_END:
+            HITL_WAIT.observe(event.data.get("wait_s", 0.0))
+
+
+_collector = None
+_install_lock = threading.Lock()
+
+
+def install_metrics(priority: int = 10):
+    """
+    Pasang pengumpul metrik (HOOMI_METRICS=0 untuk mematikan).
+    
+    Priority kecil: durasi yang tercatat mencakup semua layer lain
+    (latency guard, tracing, dsb).
+    
+    Returns:
+        MetricsRegistry, atau None jika dimatikan
+    """
+    global _collector
+    if os.getenv("HOOMI_METRICS", "1") == "0":
+        return None
+    with _install_lock:
+        if _collector is None:
+            _collector = _MetricsCollector()
+            register_middleware(_collector, kinds=(TOOL, LLM_CALL), priority=priority)
+            EVENTS.subscribe(_collector)
+            port = os.getenv("HOOMI_METRICS_PORT")
+            if port:
+                METRICS.serve(int(port))
+    return METRICS
+
+
+def dump_metrics():
+    """Tulis metrik ke HOOMI_METRICS_FILE jika diset."""
+    path = os.getenv("HOOMI_METRICS_FILE")
+    if path and _collector is not None:
+        METRICS.dump(path)
+    return path
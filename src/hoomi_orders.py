@@ -0,0 +1,495 @@
+"""
+Hoomi Orders - Order Store Persisten dengan Lookup Ter-index
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Sebelumnya order hanya ada sebagai teks jawaban LLM: track_delivery tidak
+punya data untuk dicari dan confirmation_task mengarang Order ID. Modul ini
+menyimpan order di SQLite (WAL) dengan API bertipe:
+
+1. Order dibuat sebelum kickoff (open_scenario_order) sehingga setiap task
+   menerima {order_id} yang nyata lewat inputs
+2. Status mengikuti state machine (pending -> paid -> assigned -> picked_up
+   -> in_transit -> delivered, atau cancelled/failed); transisi yang tidak
+   sah ditolak dengan ValueError. Pembayaran dicatat di paid_at sehingga
+   order yang driver-nya sudah ditugaskan sebelum dibayar (ride, delivery)
+   tetap berstatus assigned
+3. Index - order_id (primary key), (user_id, status, created_at),
+   (driver_id, status) parsial untuk order yang sudah punya driver, dan
+   (status, updated_at) untuk pemantauan operasional
+4. Query cepat - "order aktif user X" dan "order yang ditugaskan ke driver Y"
+   hanya menyentuh baris milik user/driver tersebut, bukan seluruh tabel
+5. Scope order - selama order_scope() aktif, tool yang mengubah order
+   (pay_wallet, assign_order_driver) hanya boleh menyentuh order run
+   tersebut. pay_wallet hanya mencatat permintaan pembayaran
+   (request_payment); status paid dicatat hoomi_main setelah user
+   menyetujuinya di main thread, bukan dari thread tool
+
+Query ter-index tetap di bawah 1 ms pada jutaan order
+(lihat `python src/hoomi_orders.py bench --rows 2000000`).
+"""
+
+import argparse
+import contextvars
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+DEFAULT_ORDER_DB = os.getenv(
+    "HOOMI_ORDER_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".hoomi", "orders.db")
+)
+
+# ==========================================
+# STATUS ORDER
+# ==========================================
+
+PENDING = "pending"
+PAID = "paid"
+ASSIGNED = "assigned"
+PICKED_UP = "picked_up"
+IN_TRANSIT = "in_transit"
+DELIVERED = "delivered"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+ACTIVE_STATUSES = (PENDING, PAID, ASSIGNED, PICKED_UP, IN_TRANSIT)
+
+# Transisi yang diizinkan dari setiap status
+TRANSITIONS = {
+    PENDING: frozenset((PAID, ASSIGNED, CANCELLED, FAILED)),
+    PAID: frozenset((ASSIGNED, CANCELLED, FAILED)),
+    ASSIGNED: frozenset((ASSIGNED, PICKED_UP, CANCELLED, FAILED)),
+    PICKED_UP: frozenset((IN_TRANSIT, DELIVERED, FAILED)),
+    IN_TRANSIT: frozenset((DELIVERED, FAILED)),
+    DELIVERED: frozenset(),
+    CANCELLED: frozenset(),
+    FAILED: frozenset(),
+}
+
+STATUS_LABELS = {
+    PENDING: "Menunggu pembayaran",
+    PAID: "Sudah dibayar, menunggu driver",
+    ASSIGNED: "Driver menuju lokasi pickup",
+    PICKED_UP: "Barang/penumpang sudah dijemput",
+    IN_TRANSIT: "Dalam perjalanan",
+    DELIVERED: "Selesai",
+    CANCELLED: "Dibatalkan",
+    FAILED: "Gagal",
+}
+
+_COLUMNS = ("order_id", "user_id", "scenario", "status", "driver_id", "merchant_id", "description",
+            "amount_idr", "pickup", "destination", "created_at", "updated_at", "paid_at")
+_SELECT = f"SELECT {', '.join(_COLUMNS)} FROM orders"
+_ACTIVE_IN = ", ".join("?" * len(ACTIVE_STATUSES))
+
+
+def _iso(ts: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts)) if ts else None
+
+
+class Order():
+    """Satu order (commerce, delivery, atau ride) di order store."""
+    
+    __slots__ = _COLUMNS
+    
+    def __init__(self, order_id: str, user_id: str, scenario: str, status: str = PENDING,
+                 driver_id: str = None, merchant_id: str = None, description: str = "",
+                 amount_idr: int = 0, pickup: str = "", destination: str = "",
+                 created_at: float = None, updated_at: float = None, paid_at: float = None):
+        self.order_id = order_id
+        self.user_id = user_id
+        self.scenario = scenario
+        self.status = status
+        self.driver_id = driver_id
+        self.merchant_id = merchant_id
+        self.description = description
+        self.amount_idr = amount_idr
+        self.pickup = pickup
+        self.destination = destination
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.paid_at = paid_at
+    
+    @classmethod
+    def from_row(cls, row) -> "Order":
+        return cls(*row)
+    
+    @property
+    def active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+    
+    def to_dict(self) -> dict:
+        data = {name: getattr(self, name) for name in _COLUMNS}
+        data["status_label"] = STATUS_LABELS.get(self.status, self.status)
+        data["created_at"] = _iso(self.created_at)
+        data["updated_at"] = _iso(self.updated_at)
+        data["paid_at"] = _iso(self.paid_at)
+        return data
+
+
+def new_order_id() -> str:
+    return f"ORD{uuid.uuid4().hex[:10].upper()}"
+
+
+class OrderStore():
+    """
+    Order store berbasis SQLite (WAL) dengan index untuk lookup per order,
+    user, driver, dan status.
+    
+    Args:
+        path: Lokasi file SQLite (":memory:" untuk in-process saja)
+    """
+    
+    def __init__(self, path: str = DEFAULT_ORDER_DB):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._init_schema()
+    
+    def _init_schema(self):
+        """Buat tabel dan index."""
+        with self._lock:
+            self._conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+
+                CREATE TABLE IF NOT EXISTS orders (
+                    order_id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    scenario TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    driver_id TEXT,
+                    merchant_id TEXT,
+                    description TEXT,
+                    amount_idr INTEGER NOT NULL DEFAULT 0,
+                    pickup TEXT,
+                    destination TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    paid_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_orders_user_status
+                    ON orders(user_id, status, created_at);
+                CREATE INDEX IF NOT EXISTS idx_orders_driver_status
+                    ON orders(driver_id, status) WHERE driver_id IS NOT NULL;
+                CREATE INDEX IF NOT EXISTS idx_orders_status
+                    ON orders(status, updated_at);
+            """)
+    
+    # ==========================================
+    # WRITE PATH
+    # ==========================================
+    
+    def create_order(self, user_id: str, scenario: str, description: str = "", amount_idr: int = 0,
+                     pickup: str = "", destination: str = "", merchant_id: str = None,
+                     order_id: str = None) -> Order:
+        """
+        Simpan order baru dengan status pending.
+        
+        Returns:
+            Order: Order yang tersimpan (dengan order_id final)
+        """
+        now = time.time()
+        order = Order(order_id or new_order_id(), user_id, scenario, PENDING, None, merchant_id,
+                      description, int(amount_idr or 0), pickup, destination, now, now, None)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO orders ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                tuple(getattr(order, name) for name in _COLUMNS)
+            )
+            self._conn.commit()
+        return order
+    
+    def update_status(self, order_id: str, status: str, driver_id: str = None) -> Order:
+        """
+        Ubah status order (dan driver jika diberikan) sesuai TRANSITIONS.
+        Status paid selalu mengisi paid_at, tetapi hanya memindahkan status
+        order yang masih pending.
+        
+        Raises:
+            KeyError: Order tidak ditemukan
+            ValueError: Status tidak dikenal atau transisi tidak sah
+        """
+        if status not in TRANSITIONS:
+            raise ValueError(f"Status tidak dikenal: {status!r} (pilihan: {', '.join(TRANSITIONS)})")
+        with self._lock:
+            row = self._conn.execute(f"{_SELECT} WHERE order_id = ?", (order_id,)).fetchone()
+            if row is None:
+                raise KeyError(order_id)
+            order = Order.from_row(row)
+            now = time.time()
+            if status == PAID and order.status in ACTIVE_STATUSES:
+                order.paid_at = order.paid_at or now
+                status = PAID if order.status == PENDING else order.status
+            if status != order.status and status not in TRANSITIONS[order.status]:
+                raise ValueError(f"Transisi {order.status} -> {status} tidak diizinkan untuk {order_id}")
+            if status == ASSIGNED and not (driver_id or order.driver_id):
+                raise ValueError(f"Status {ASSIGNED} membutuhkan driver_id")
+            order.status = status
+            order.driver_id = driver_id or order.driver_id
+            order.updated_at = now
+            self._conn.execute(
+                "UPDATE orders SET status = ?, driver_id = ?, updated_at = ?, paid_at = ? WHERE order_id = ?",
+                (order.status, order.driver_id, order.updated_at, order.paid_at, order_id)
+            )
+            self._conn.commit()
+        return order
+    
+    def assign_driver(self, order_id: str, driver_id: str) -> Order:
+        return self.update_status(order_id, ASSIGNED, driver_id)
+    
+    def bulk_load(self, rows, batch_size: int = 50000) -> int:
+        """
+        Insert banyak order sekaligus (tuple berurutan sesuai kolom tabel),
+        satu transaksi per batch. Dipakai untuk migrasi dan benchmark.
+        
+        Returns:
+            int: Jumlah baris yang di-insert
+        """
+        sql = f"INSERT INTO orders ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+        total, batch = 0, []
+        with self._lock:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    self._conn.executemany(sql, batch)
+                    self._conn.commit()
+                    total += len(batch)
+                    batch = []
+            if batch:
+                self._conn.executemany(sql, batch)
+                self._conn.commit()
+                total += len(batch)
+            self._conn.execute("ANALYZE")
+        return total
+    
+    # ==========================================
+    # READ PATH
+    # ==========================================
+    
+    def get(self, order_id: str) -> Order:
+        """Order berdasarkan ID, atau None jika tidak ada."""
+        with self._lock:
+            row = self._conn.execute(f"{_SELECT} WHERE order_id = ?", (order_id,)).fetchone()
+        return Order.from_row(row) if row else None
+    
+    def active_orders(self, user_id: str, limit: int = 50) -> list:
+        """Order aktif (belum selesai/batal) milik user, terbaru dulu."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"{_SELECT} WHERE user_id = ? AND status IN ({_ACTIVE_IN}) ORDER BY created_at DESC LIMIT ?",
+                (user_id, *ACTIVE_STATUSES, limit)
+            ).fetchall()
+        return [Order.from_row(row) for row in rows]
+    
+    def driver_orders(self, driver_id: str, active_only: bool = True, limit: int = 50) -> list:
+        """Order yang ditugaskan ke driver (default hanya yang masih aktif)."""
+        with self._lock:
+            if active_only:
+                rows = self._conn.execute(
+                    f"{_SELECT} WHERE driver_id = ? AND status IN ({_ACTIVE_IN}) LIMIT ?",
+                    (driver_id, *ACTIVE_STATUSES, limit)
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    f"{_SELECT} WHERE driver_id = ? LIMIT ?", (driver_id, limit)
+                ).fetchall()
+        return [Order.from_row(row) for row in rows]
+    
+    def count(self, status: str = None) -> int:
+        with self._lock:
+            if status is None:
+                return self._conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM orders WHERE status = ?", (status,)).fetchone()[0]
+    
+    def query_plan(self, sql: str, params: tuple = ()) -> list:
+        """EXPLAIN QUERY PLAN untuk memastikan query memakai index."""
+        with self._lock:
+            return [row[-1] for row in self._conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_order_store() -> OrderStore:
+    """Order store bersama satu proses (lazy, dibuat saat pertama dipakai)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = OrderStore()
+        return _store
+
+
+# ==========================================
+# INTEGRASI SKENARIO
+# ==========================================
+
+def _parse_amount(value) -> int:
+    digits = "".join(ch for ch in str(value or "") if ch.isdigit())
+    return int(digits) if digits else 0
+
+
+def open_scenario_order(scenario: str, inputs: dict, user_id: str, store: OrderStore = None) -> Order:
+    """
+    Buat order pending dari kickoff inputs skenario (commerce, delivery, ride).
+    Order ID hasilnya dimasukkan ke inputs["order_id"] oleh pemanggil.
+    """
+    if scenario == "commerce":
+        fields = dict(description=inputs.get("product_query", ""), destination=inputs.get("destination", ""))
+    elif scenario == "delivery":
+        fields = dict(description=inputs.get("package_description", ""), pickup=inputs.get("pickup_address", ""),
+                      destination=inputs.get("destination_address", ""))
+    else:
+        fields = dict(description=f"{inputs.get('passenger_count', 1)} penumpang",
+                      pickup=inputs.get("pickup_location", ""), destination=inputs.get("destination", ""))
+    return (store or get_order_store()).create_order(
+        user_id, scenario, amount_idr=_parse_amount(inputs.get("total_amount")),
+        merchant_id=inputs.get("recipient_id"), **fields
+    )
+
+
+_current_order = contextvars.ContextVar("hoomi_current_order", default=None)
+
+
+@contextmanager
+def order_scope(order_id: str):
+    """
+    Tandai order milik run yang sedang berjalan (dipakai hoomi_main di
+    sekitar crew.kickoff). Contextvar ikut ke thread executor hoomi_latency.
+    """
+    reset_token = _current_order.set(order_id)
+    try:
+        yield order_id
+    finally:
+        _current_order.reset(reset_token)
+
+
+def current_order_id() -> str:
+    """Order run yang sedang berjalan (order_scope), atau None."""
+    return _current_order.get()
+
+
+def check_order_access(order_id: str) -> str:
+    """Pesan error jika order_id bukan order run aktif, atau None jika boleh."""
+    current = _current_order.get()
+    if current is not None and order_id != current:
+        return f"Order {order_id} bukan order yang sedang diproses ({current})"
+    return None
+
+
+_pending_payments = {}
+_pending_lock = threading.Lock()
+
+
+def request_payment(order_id: str, amount_idr: int, recipient: str, description: str) -> dict:
+    """Catat permintaan pembayaran order (menunggu approval user, lihat take_payment_request)."""
+    request = {"order_id": order_id, "amount_idr": int(amount_idr), "recipient": recipient,
+               "description": description}
+    with _pending_lock:
+        _pending_payments[order_id] = request
+    return request
+
+
+def take_payment_request(order_id: str) -> dict:
+    """Ambil (dan hapus) permintaan pembayaran order, atau None jika tidak ada."""
+    with _pending_lock:
+        return _pending_payments.pop(order_id, None)
+
+
+# ==========================================
+# CLI BENCHMARK
+# ==========================================
+
+def _synthetic_rows(rows: int, users: int, drivers: int, rng: random.Random):
+    # Mayoritas order historis sudah selesai; ~5% masih aktif seperti kondisi produksi
+    now = time.time()
+    scenarios = ("commerce", "delivery", "ride")
+    for i in range(rows):
+        created = now - rng.uniform(0, 180 * 86400)
+        roll = rng.random()
+        status = rng.choice(ACTIVE_STATUSES) if roll < 0.05 else (CANCELLED if roll < 0.08 else DELIVERED)
+        driver = None if status in (PENDING, PAID) else f"DRV{rng.randrange(drivers):06d}"
+        yield (f"ORD{i:010d}", f"USR{rng.randrange(users):07d}", scenarios[i % 3], status, driver,
+               None, "", rng.randrange(10, 500) * 1000, "", "", created, created,
+               None if status == PENDING else created)
+
+
+def _time_queries(fn, keys: list) -> tuple:
+    samples, found = [], 0
+    for key in keys:
+        start = time.perf_counter()
+        found += len(fn(key))
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2], samples[min(int(len(samples) * 0.99), len(samples) - 1)], found
+
+
+def _bench(rows: int, users: int, drivers: int, queries: int, path: str = None):
+    rng = random.Random(5)
+    workdir = None
+    if path is None:
+        workdir = tempfile.TemporaryDirectory(prefix="hoomi_orders_")
+        path = os.path.join(workdir.name, "orders.db")
+    store = OrderStore(path)
+    
+    existing = store.count()
+    if existing < rows:
+        start = time.perf_counter()
+        store.bulk_load(_synthetic_rows(rows, users, drivers, rng))
+        elapsed = time.perf_counter() - start
+        print(f"📥 Load {rows:,} order: {elapsed:.1f} s ({rows / elapsed:,.0f} baris/s)")
+    
+    user_keys = [f"USR{rng.randrange(users):07d}" for _ in range(queries)]
+    driver_keys = [f"DRV{rng.randrange(drivers):06d}" for _ in range(queries)]
+    order_keys = [f"ORD{rng.randrange(rows):010d}" for _ in range(queries)]
+    
+    print(f"⏱️ Query pada {store.count():,} order ({queries:,} query per jenis)")
+    for label, fn, keys in (
+        ("get(order_id)", lambda k: [store.get(k)], order_keys),
+        ("active_orders(user)", store.active_orders, user_keys),
+        ("driver_orders(driver)", store.driver_orders, driver_keys),
+    ):
+        p50, p99, found = _time_queries(fn, keys)
+        print(f"   {label:<22} p50 {p50 * 1000:.3f} ms, p99 {p99 * 1000:.3f} ms ({found:,} baris)")
+    
+    print("🔎 Query plan:")
+    for label, sql, params in (
+        ("active_orders", f"{_SELECT} WHERE user_id = ? AND status IN ({_ACTIVE_IN}) ORDER BY created_at DESC",
+         (user_keys[0], *ACTIVE_STATUSES)),
+        ("driver_orders", f"{_SELECT} WHERE driver_id = ? AND status IN ({_ACTIVE_IN})",
+         (driver_keys[0], *ACTIVE_STATUSES)),
+    ):
+        print(f"   {label}: {'; '.join(store.query_plan(sql, params))}")
+    
+    store.close()
+    if workdir is not None:
+        workdir.cleanup()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark order store Hoomi")
+    parser.add_argument("command", choices=["bench"])
+    parser.add_argument("--rows", type=int, default=2000000, help="Jumlah order sintetis")
+    parser.add_argument("--users", type=int, default=200000, help="Jumlah user berbeda")
+    parser.add_argument("--drivers", type=int, default=20000, help="Jumlah driver berbeda")
+    parser.add_argument("--queries", type=int, default=2000, help="Jumlah query per jenis")
+    parser.add_argument("--db", help="File SQLite yang dipakai ulang antar run (default: file sementara)")
+    args = parser.parse_args(argv)
+    _bench(args.rows, args.users, args.drivers, args.queries, args.db)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
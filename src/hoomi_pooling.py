@@ -0,0 +1,428 @@
+"""
+Hoomi Pooling - Matcher Ride Bersama (Shared Ride)
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+ride_booking_task mem-booking setiap penumpang sendiri-sendiri, padahal
+banyak request berangkat dari area yang sama ke arah yang sama. Modul ini
+mencocokkan request ride yang masih terbuka secara real-time:
+
+1. Index grid - request terbuka disimpan per pasangan (sel pickup, sel
+   tujuan) pada grid ~HOOMI_POOL_CELL_KM km; pencarian kandidat hanya
+   menyentuh sel di sekitar pickup dan tujuan, bukan semua request
+2. Kompatibilitas - kursi gabungan <= kapasitas mobil, lalu 4 urutan
+   pickup/dropoff dicoba; setiap penumpang maksimal menempuh
+   (1 + HOOMI_POOL_MAX_DETOUR) x jarak langsungnya
+3. Skor - penghematan km dibanding dua trip terpisah; kandidat terbaik dipilih
+4. Tarif pool - tarif solo (hoomi_trip_model) dikurangi diskon pool, plus
+   kompensasi untuk detour yang dialami masing-masing penumpang
+5. Kedaluwarsa - request yang tidak mendapat pasangan dalam HOOMI_POOL_TTL_S
+   detik dibuang dari index
+6. Hasil per request - request terbuka yang dipasangkan oleh request
+   penumpang lain disimpan per request_id (dan rider_id) selama TTL,
+   sehingga penumpang yang menunggu bisa melihat tarif pool-nya (poll)
+
+Matching ribuan request terbuka berjalan di bawah 1 ms per request
+(lihat `python src/hoomi_pooling.py bench`).
+"""
+
+import argparse
+import heapq
+import itertools
+import math
+import os
+import random
+import sys
+import threading
+import time
+
+from hoomi_trip_model import get_trip_model
+
+CELL_KM = float(os.getenv("HOOMI_POOL_CELL_KM", 1.0))
+PICKUP_RADIUS_KM = float(os.getenv("HOOMI_POOL_PICKUP_RADIUS_KM", 1.0))
+DEST_RADIUS_KM = float(os.getenv("HOOMI_POOL_DEST_RADIUS_KM", 2.0))
+MAX_DETOUR = float(os.getenv("HOOMI_POOL_MAX_DETOUR", 0.35))
+VEHICLE_SEATS = int(os.getenv("HOOMI_POOL_SEATS", 4))
+TTL_S = float(os.getenv("HOOMI_POOL_TTL_S", 300))
+POOL_DISCOUNT = float(os.getenv("HOOMI_POOL_DISCOUNT", 0.25))
+
+# Kompensasi tarif per 100% detour (0.35 detour -> diskon tambahan 7%)
+DETOUR_CREDIT = 0.2
+
+_KM_PER_DEG = 111.32
+_COS_JAKARTA = math.cos(math.radians(-6.2))
+_SEQUENCES = (("a", "b", "a", "b"), ("a", "b", "b", "a"), ("b", "a", "a", "b"), ("b", "a", "b", "a"))
+
+
+def cell_of(lat: float, lon: float, cell_km: float = CELL_KM) -> tuple:
+    return (int(math.floor(lat * _KM_PER_DEG / cell_km)),
+            int(math.floor(lon * _KM_PER_DEG * _COS_JAKARTA / cell_km)))
+
+
+def _cells_around(cell: tuple, rings: int) -> list:
+    row, col = cell
+    return [(row + dr, col + dc) for dr in range(-rings, rings + 1) for dc in range(-rings, rings + 1)]
+
+
+def _fast_km(a: tuple, b: tuple) -> float:
+    """Jarak equirectangular; cukup akurat untuk jarak dalam kota dan jauh lebih murah dari haversine."""
+    dy = (a[0] - b[0]) * _KM_PER_DEG
+    dx = (a[1] - b[1]) * _KM_PER_DEG * _COS_JAKARTA
+    return math.sqrt(dx * dx + dy * dy)
+
+
+class RideRequest():
+    """Satu request ride terbuka (atau baru) yang bisa di-pool."""
+    
+    __slots__ = ("request_id", "rider_id", "pickup", "dropoff", "seats", "created_at", "expires_at",
+                 "direct_km", "_key")
+    
+    _ids = itertools.count(1)
+    
+    def __init__(self, pickup: tuple, dropoff: tuple, seats: int = 1, rider_id: str = "",
+                 request_id: str = None, ttl_s: float = TTL_S, now: float = None):
+        now = time.time() if now is None else now
+        self.request_id = request_id or f"RIDE{next(self._ids):06d}"
+        self.rider_id = rider_id
+        self.pickup = pickup
+        self.dropoff = dropoff
+        self.seats = seats
+        self.created_at = now
+        self.expires_at = now + ttl_s
+        self.direct_km = _fast_km(pickup, dropoff)
+        self._key = None
+
+
+class PoolMatch():
+    """Pasangan request yang kompatibel beserta urutan stop terbaik."""
+    
+    def __init__(self, request: RideRequest, partner: RideRequest, sequence: tuple,
+                 total_km: float, ride_km: dict):
+        self.request = request
+        self.partner = partner
+        self.sequence = sequence
+        self.total_km = total_km
+        self.ride_km = ride_km
+    
+    @property
+    def saving_km(self) -> float:
+        return self.request.direct_km + self.partner.direct_km - self.total_km
+    
+    def detour(self, request: RideRequest) -> float:
+        if request.direct_km <= 0:
+            return 0.0
+        return self.ride_km[request.request_id] / request.direct_km - 1
+    
+    def stops(self) -> list:
+        riders = {"a": self.request, "b": self.partner}
+        seen, out = set(), []
+        for label in self.sequence:
+            rider = riders[label]
+            is_pickup = label not in seen
+            seen.add(label)
+            lat, lon = rider.pickup if is_pickup else rider.dropoff
+            out.append({"request_id": rider.request_id, "type": "pickup" if is_pickup else "dropoff",
+                        "lat": lat, "lon": lon})
+        return out
+    
+    def to_dict(self) -> dict:
+        model = get_trip_model()
+        riders = []
+        for rider in (self.request, self.partner):
+            _, _, solo = model.predict_one(rider.pickup[0], rider.pickup[1], rider.dropoff[0], rider.dropoff[1])
+            riders.append({
+                "request_id": rider.request_id,
+                "rider_id": rider.rider_id,
+                "seats": rider.seats,
+                "solo_fare_idr": int(solo),
+                "pooled_fare_idr": pooled_fare(solo, self.detour(rider)),
+                "detour_pct": round(100 * self.detour(rider), 1),
+            })
+        return {
+            "riders": riders,
+            "stops": self.stops(),
+            "seats_used": self.request.seats + self.partner.seats,
+            "total_km": round(self.total_km, 2),
+            "saving_km": round(self.saving_km, 2),
+            "pricing_model": model.name,
+        }
+
+
+def pooled_fare(solo_fare: float, detour: float) -> int:
+    """Tarif pool: diskon dasar + kompensasi detour, minimal separuh tarif solo."""
+    discount = POOL_DISCOUNT + DETOUR_CREDIT * max(detour, 0.0)
+    return int(round(solo_fare * max(1 - discount, 0.5), -2))
+
+
+# ==========================================
+# POOLING ENGINE
+# ==========================================
+
+def _same_rider(request: RideRequest, other: RideRequest) -> bool:
+    return request.request_id == other.request_id or bool(request.rider_id and request.rider_id == other.rider_id)
+
+
+class PoolingEngine():
+    """
+    Index request ride terbuka + matching pasangan kompatibel.
+    
+    Args:
+        capacity: Kursi penumpang per kendaraan pool
+        max_detour: Tambahan jarak maksimum per penumpang (rasio jarak langsung)
+        pickup_radius_km: Jarak maksimum antar titik pickup
+        dest_radius_km: Jarak maksimum antar titik tujuan
+        cell_km: Ukuran sel grid index
+    """
+    
+    def __init__(self, capacity: int = VEHICLE_SEATS, max_detour: float = MAX_DETOUR,
+                 pickup_radius_km: float = PICKUP_RADIUS_KM, dest_radius_km: float = DEST_RADIUS_KM,
+                 cell_km: float = CELL_KM):
+        self.capacity = capacity
+        self.max_detour = max_detour
+        self.pickup_radius_km = pickup_radius_km
+        self.dest_radius_km = dest_radius_km
+        self.cell_km = cell_km
+        self._pickup_rings = max(1, math.ceil(pickup_radius_km / cell_km))
+        self._dest_rings = max(1, math.ceil(dest_radius_km / cell_km))
+        self._open = {}              # request_id -> RideRequest
+        self._index = {}             # (sel pickup, sel tujuan) -> {request_id}
+        self._expiry = []            # heap (expires_at, request_id)
+        self._by_rider = {}          # rider_id -> request_id terbuka (maksimal satu per rider)
+        self._matched = {}           # request_id -> (PoolMatch, simpan sampai) untuk request yang menunggu
+        self._matched_by_rider = {}  # rider_id -> request_id yang sudah dipasangkan
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "matched": 0, "expired": 0}
+    
+    def __len__(self) -> int:
+        return len(self._open)
+    
+    def _add(self, request: RideRequest):
+        request._key = (cell_of(*request.pickup, self.cell_km), cell_of(*request.dropoff, self.cell_km))
+        self._open[request.request_id] = request
+        self._index.setdefault(request._key, set()).add(request.request_id)
+        heapq.heappush(self._expiry, (request.expires_at, request.request_id))
+        if request.rider_id:
+            self._by_rider[request.rider_id] = request.request_id
+    
+    def _remove(self, request_id: str):
+        request = self._open.pop(request_id, None)
+        if request is None:
+            return None
+        if request.rider_id and self._by_rider.get(request.rider_id) == request_id:
+            del self._by_rider[request.rider_id]
+        bucket = self._index.get(request._key)
+        if bucket is not None:
+            bucket.discard(request_id)
+            if not bucket:
+                del self._index[request._key]
+        return request
+    
+    def _expire(self, now: float):
+        while self._expiry and self._expiry[0][0] <= now:
+            _, request_id = heapq.heappop(self._expiry)
+            if self._remove(request_id) is not None:
+                self.stats["expired"] += 1
+            elif request_id in self._matched and self._matched[request_id][1] <= now:
+                self._forget_match(request_id)
+    
+    def _forget_match(self, request_id: str):
+        match, _ = self._matched.pop(request_id, (None, None))
+        rider_id = match.partner.rider_id if match is not None else ""
+        if rider_id and self._matched_by_rider.get(rider_id) == request_id:
+            del self._matched_by_rider[rider_id]
+        return match
+    
+    def add(self, request: RideRequest):
+        with self._lock:
+            self._expire(time.time())
+            self._add(request)
+    
+    def cancel(self, request_id: str) -> bool:
+        with self._lock:
+            return self._remove(request_id) is not None
+    
+    def poll(self, request_id: str, rider_id: str = "") -> tuple:
+        """
+        Status request yang menunggu: ("pooled", PoolMatch) jika sudah dipasangkan
+        request penumpang lain, ("waiting", RideRequest) jika masih terbuka, atau
+        ("expired", None). Jika rider_id diisi, request milik rider lain dianggap tidak ada.
+        """
+        with self._lock:
+            self._expire(time.time())
+            entry = self._matched.get(request_id)
+            if entry is not None and (not rider_id or entry[0].partner.rider_id == rider_id):
+                return "pooled", entry[0]
+            request = self._open.get(request_id)
+            if request is not None and (not rider_id or request.rider_id == rider_id):
+                return "waiting", request
+            return "expired", None
+    
+    def cancel_rider(self, rider_id: str) -> bool:
+        """Tarik request terbuka milik rider (mis. rider memilih ride solo)."""
+        with self._lock:
+            request_id = self._by_rider.get(rider_id)
+            return request_id is not None and self._remove(request_id) is not None
+    
+    def _candidates(self, request: RideRequest):
+        pickup_cells = _cells_around(cell_of(*request.pickup, self.cell_km), self._pickup_rings)
+        dest_cells = _cells_around(cell_of(*request.dropoff, self.cell_km), self._dest_rings)
+        index = self._index
+        for pickup_cell in pickup_cells:
+            for dest_cell in dest_cells:
+                bucket = index.get((pickup_cell, dest_cell))
+                if bucket:
+                    yield from bucket
+    
+    def _evaluate(self, request: RideRequest, other: RideRequest):
+        """PoolMatch terbaik untuk pasangan (request, other), atau None jika tidak kompatibel."""
+        if request.seats + other.seats > self.capacity:
+            return None
+        if _fast_km(request.pickup, other.pickup) > self.pickup_radius_km:
+            return None
+        if _fast_km(request.dropoff, other.dropoff) > self.dest_radius_km:
+            return None
+        
+        riders = {"a": request, "b": other}
+        limit = {label: rider.direct_km * (1 + self.max_detour) for label, rider in riders.items()}
+        best = None
+        for sequence in _SEQUENCES:
+            points, seen = [], set()
+            for label in sequence:
+                rider = riders[label]
+                points.append((label, rider.dropoff if label in seen else rider.pickup))
+                seen.add(label)
+            # Jarak tempuh tiap penumpang = jarak kumulatif antara pickup dan dropoff-nya
+            total, odometer, started, ride = 0.0, [0.0], {}, {}
+            for i in range(1, 4):
+                total += _fast_km(points[i - 1][1], points[i][1])
+                odometer.append(total)
+            for i, (label, _) in enumerate(points):
+                if label in started:
+                    ride[label] = odometer[i] - started[label]
+                else:
+                    started[label] = odometer[i]
+            if any(ride[label] > limit[label] + 1e-9 for label in ride):
+                continue
+            if best is None or total < best[1]:
+                best = (sequence, total, ride)
+        if best is None:
+            return None
+        sequence, total, ride = best
+        if total >= request.direct_km + other.direct_km:
+            return None
+        return PoolMatch(request, other, sequence, total,
+                         {request.request_id: ride["a"], other.request_id: ride["b"]})
+    
+    def find_matches(self, request: RideRequest, limit: int = 3) -> list:
+        """Pasangan kompatibel untuk request, diurutkan dari penghematan km terbesar."""
+        with self._lock:
+            self._expire(time.time())
+            matches = []
+            for request_id in self._candidates(request):
+                other = self._open[request_id]
+                if _same_rider(request, other):
+                    continue
+                match = self._evaluate(request, other)
+                if match is not None:
+                    matches.append(match)
+        matches.sort(key=lambda m: -m.saving_km)
+        return matches[:limit]
+    
+    def match_or_queue(self, request: RideRequest, queue: bool = True):
+        """
+        Pasangkan request dengan kandidat terbaik (partner dikeluarkan dari
+        index), atau simpan request sebagai request terbuka jika queue=True.
+        Request terbuka lama dari rider yang sama (retry) selalu digantikan,
+        kecuali sudah dipasangkan: pasangan itu yang dikembalikan. Rider
+        tidak pernah dipasangkan dengan dirinya sendiri, dan request tanpa
+        rider_id tidak disimpan (retry-nya tidak bisa dikenali).
+        Returns PoolMatch atau None jika tidak ada pasangan.
+        """
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            self.stats["requests"] += 1
+            if request.rider_id and request.rider_id in self._matched_by_rider:
+                return self._forget_match(self._matched_by_rider[request.rider_id])
+            if request.rider_id and request.rider_id in self._by_rider:
+                self._remove(self._by_rider[request.rider_id])
+            best = None
+            for request_id in self._candidates(request):
+                other = self._open[request_id]
+                if _same_rider(request, other):
+                    continue
+                match = self._evaluate(request, other)
+                if match is not None and (best is None or match.saving_km > best.saving_km):
+                    best = match
+            if best is None:
+                if queue and request.rider_id:
+                    self._add(request)
+                return None
+            partner = self._remove(best.partner.request_id)
+            # Penumpang yang menunggu melihat hasilnya lewat poll() atau retry match_or_queue()
+            self._matched[partner.request_id] = (best, now + TTL_S)
+            heapq.heappush(self._expiry, (now + TTL_S, partner.request_id))
+            if partner.rider_id:
+                self._matched_by_rider[partner.rider_id] = partner.request_id
+            self.stats["matched"] += 1
+            return best
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_pooling_engine() -> PoolingEngine:
+    """Engine pooling bersama per proses."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = PoolingEngine()
+        return _engine
+
+
+# ==========================================
+# CLI BENCHMARK
+# ==========================================
+
+def _random_request(rng: random.Random, now: float) -> RideRequest:
+    # Permintaan terkonsentrasi di beberapa hub (stasiun, mall) menuju area perkantoran/perumahan
+    hubs = ((-6.2088, 106.8456), (-6.1751, 106.8650), (-6.2250, 106.8000), (-6.1900, 106.8230),
+            (-6.2450, 106.8450), (-6.1650, 106.8200), (-6.2615, 106.7810), (-6.1360, 106.8130))
+    origin, target = rng.sample(hubs, 2)
+    pickup = (origin[0] + rng.gauss(0, 0.01), origin[1] + rng.gauss(0, 0.01))
+    dropoff = (target[0] + rng.gauss(0, 0.02), target[1] + rng.gauss(0, 0.02))
+    return RideRequest(pickup, dropoff, seats=rng.choice((1, 1, 1, 2)), now=now)
+
+
+def _bench(open_requests: int, queries: int):
+    rng = random.Random(11)
+    engine = PoolingEngine()
+    now = time.time()
+    for _ in range(open_requests):
+        engine.add(_random_request(rng, now))
+    
+    samples, found = [], 0
+    for _ in range(queries):
+        request = _random_request(rng, now)
+        start = time.perf_counter()
+        matches = engine.find_matches(request)
+        samples.append(time.perf_counter() - start)
+        found += bool(matches)
+    samples.sort()
+    p50, p99 = samples[len(samples) // 2], samples[min(int(len(samples) * 0.99), len(samples) - 1)]
+    print(f"⏱️ Pooling {open_requests:,} request terbuka, {queries:,} query")
+    print(f"   p50 {p50 * 1000:.3f} ms, p99 {p99 * 1000:.3f} ms, max {samples[-1] * 1000:.3f} ms")
+    print(f"   {found / queries:.0%} query mendapat pasangan")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark matcher ride bersama Hoomi")
+    parser.add_argument("command", choices=["bench"])
+    parser.add_argument("--open", type=int, default=5000, help="Jumlah request terbuka di index")
+    parser.add_argument("--queries", type=int, default=2000, help="Jumlah request baru yang dicocokkan")
+    args = parser.parse_args(argv)
+    _bench(args.open, args.queries)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
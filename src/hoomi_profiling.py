@@ -0,0 +1,316 @@
+"""
+Hoomi Profiling - Profil On-Demand untuk Satu Order
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Membungkus crew.kickoff() satu order dengan profiler, diaktifkan per
+request (hoomi_main: pilihan menu dengan akhiran "p", mis. "3p") atau
+untuk semua order lewat environment:
+
+    HOOMI_PROFILE=sample     # sampling profiler (overhead rendah)
+    HOOMI_PROFILE=cprofile   # cProfile deterministik + sampling
+    HOOMI_PROFILE_INTERVAL_MS=5
+    HOOMI_PROFILE_TOP=30
+
+Output di .hoomi/profiles/<timestamp>-<skenario>-<run_id>.*:
+- .collapsed  - collapsed stack ("a;b;c <jumlah sampel>") untuk
+                flamegraph.pl / speedscope / inferno
+- .txt        - ringkasan top-N fungsi (self & inclusive), ditandai
+                skenario, order_id, dan run_id
+- .prof       - data pstats mentah (mode cprofile)
+
+LLM/tool call berjalan di thread executor LatencyGuard; middleware
+profiling mendaftarkan thread tersebut ke sesi order yang sedang aktif
+sehingga stack-nya ikut tersampling (dan di-cProfile per thread).
+
+Jika profiling mati, profile_run() mengembalikan nullcontext dan tidak
+ada middleware yang terpasang (tanpa overhead).
+"""
+
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from hoomi_hooks import LLM_CALL, TOOL, register_middleware
+
+DEFAULT_PROFILE_DIR = os.getenv(
+    "HOOMI_PROFILE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".hoomi", "profiles")
+)
+
+PROFILE_MODES = ("sample", "cprofile")
+
+_current_session = contextvars.ContextVar("hoomi_profile_session", default=None)
+_install_lock = threading.Lock()
+_installed = False
+
+
+def profiling_mode(requested: bool = False) -> str:
+    """
+    Tentukan mode profiling untuk satu order.
+    
+    Args:
+        requested: True jika order ini diminta diprofilkan (per request)
+    
+    Returns:
+        "sample" / "cprofile", atau None jika profiling mati
+    """
+    mode = os.getenv("HOOMI_PROFILE", "0").lower()
+    if mode in PROFILE_MODES:
+        return mode
+    return "sample" if requested else None
+
+
+class ProfileSession():
+    """
+    Sesi profiling satu order: sampler thread + cProfile per thread (opsional).
+    
+    Args:
+        scenario: Nama skenario (commerce/delivery/ride)
+        run_id: ID run (juga dipakai di nama file)
+        mode: "sample" atau "cprofile"
+        interval: Interval sampling (detik)
+        top_n: Jumlah fungsi di ringkasan
+        out_dir: Direktori output
+        order_id: ID order (hoomi_orders) yang sedang diproses
+    """
+    
+    def __init__(self, scenario: str, run_id: str, mode: str = "sample", interval: float = 0.005,
+                 top_n: int = 30, out_dir: str = DEFAULT_PROFILE_DIR, order_id: str = None):
+        self.scenario = scenario or "unknown"
+        self.run_id = run_id
+        self.order_id = order_id
+        self.mode = mode
+        self.interval = interval
+        self.top_n = top_n
+        self.out_dir = out_dir
+        self.owner = None
+        self.stacks = {}
+        self.samples = 0
+        self.duration = 0.0
+        self.paths = {}
+        self._threads = {}
+        self._profiles = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._owner_profile = None
+        self._started = None
+    
+    # ==========================================
+    # LIFECYCLE
+    # ==========================================
+    
+    def start(self):
+        self.owner = threading.get_ident()
+        self._threads[self.owner] = 1
+        self._started = time.perf_counter()
+        self._sampler = threading.Thread(target=self._sample_loop, daemon=True, name="hoomi-profiler")
+        self._sampler.start()
+        if self.mode == "cprofile":
+            self._owner_profile = cProfile.Profile()
+            self._owner_profile.enable()
+        return self
+    
+    def stop(self) -> dict:
+        """Hentikan profiling dan tulis file output. Returns: {jenis: path}."""
+        if self._owner_profile is not None:
+            self._owner_profile.disable()
+            self._profiles.append(self._owner_profile)
+        self.duration = time.perf_counter() - self._started
+        self._stop.set()
+        self._sampler.join()
+        return self._write()
+    
+    def attach(self):
+        """Daftarkan thread saat ini ke sesi (dipanggil middleware)."""
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+    
+    def detach(self):
+        ident = threading.get_ident()
+        with self._lock:
+            remaining = self._threads.get(ident, 1) - 1
+            if remaining > 0:
+                self._threads[ident] = remaining
+            else:
+                self._threads.pop(ident, None)
+    
+    def add_profile(self, profile: cProfile.Profile):
+        with self._lock:
+            self._profiles.append(profile)
+    
+    # ==========================================
+    # SAMPLING
+    # ==========================================
+    
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = list(self._threads)
+            for ident in threads:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = _collapse(frame)
+                self.stacks[stack] = self.stacks.get(stack, 0) + 1
+                self.samples += 1
+    
+    # ==========================================
+    # OUTPUT
+    # ==========================================
+    
+    def _write(self) -> dict:
+        os.makedirs(self.out_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        base = os.path.join(self.out_dir, f"{stamp}-{self.scenario}-{self.run_id}")
+        
+        self.paths["collapsed"] = base + ".collapsed"
+        with open(self.paths["collapsed"], "w") as f:
+            for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1]):
+                f.write(f"{stack} {count}\n")
+        
+        stats = None
+        if self._profiles:
+            stats = pstats.Stats(self._profiles[0])
+            for profile in self._profiles[1:]:
+                stats.add(profile)
+            self.paths["prof"] = base + ".prof"
+            stats.dump_stats(self.paths["prof"])
+        
+        self.paths["summary"] = base + ".txt"
+        with open(self.paths["summary"], "w") as f:
+            f.write(self.summary(stats))
+        return self.paths
+    
+    def summary(self, stats: pstats.Stats = None) -> str:
+        """Ringkasan top-N: self time & inclusive dari sampel (+ cProfile jika ada)."""
+        lines = [
+            f"scenario: {self.scenario}",
+            f"order: {self.order_id or '-'}",
+            f"run: {self.run_id}",
+            f"mode: {self.mode}",
+            f"duration_s: {self.duration:.3f}",
+            f"samples: {self.samples} (interval {self.interval * 1000:g} ms)",
+            "",
+        ]
+        
+        self_counts, inclusive_counts = {}, {}
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            self_counts[frames[-1]] = self_counts.get(frames[-1], 0) + count
+            for frame in set(frames):
+                inclusive_counts[frame] = inclusive_counts.get(frame, 0) + count
+        
+        total = self.samples or 1
+        for title, counts in (("TOP SELF (sampel)", self_counts), ("TOP INCLUSIVE (sampel)", inclusive_counts)):
+            lines.append(f"== {title} ==")
+            for frame, count in sorted(counts.items(), key=lambda item: -item[1])[:self.top_n]:
+                lines.append(f"{count / total:>7.1%} {count:>7}  {frame}")
+            lines.append("")
+        
+        if stats is not None:
+            buffer = io.StringIO()
+            stats.stream = buffer
+            lines.append("== TOP CUMULATIVE (cProfile) ==")
+            stats.sort_stats("cumulative").print_stats(self.top_n)
+            lines.append(buffer.getvalue())
+        return "\n".join(lines)
+
+
+def _collapse(frame) -> str:
+    """Frame -> 'root;...;leaf' (format collapsed stack)."""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        filename = code.co_filename.replace("\\", "/").rsplit("/", 2)
+        parts.append(f"{code.co_name} ({'/'.join(filename[-2:])}:{code.co_firstlineno})")
+        frame = frame.f_back
+    parts.reverse()
+    return ";".join(parts)
+
+
+# ==========================================
+# MIDDLEWARE: THREAD EXECUTOR IKUT DIPROFILKAN
+# ==========================================
+
+_thread_state = threading.local()
+
+
+def _profile_middleware(call, proceed):
+    session = _current_session.get()
+    if session is None:
+        return proceed()
+    
+    session.attach()
+    profile = None
+    if (session.mode == "cprofile" and threading.get_ident() != session.owner
+            and not getattr(_thread_state, "profiling", False)):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+            _thread_state.profiling = True
+        except ValueError:
+            profile = None  # Profiler lain sudah aktif (Python 3.12+: satu per proses)
+    try:
+        return proceed()
+    finally:
+        if profile is not None:
+            profile.disable()
+            _thread_state.profiling = False
+            session.add_profile(profile)
+        session.detach()
+
+
+def _ensure_installed(priority: int = 25):
+    """Pasang middleware saat profiling pertama kali dipakai (di dalam LatencyGuard)."""
+    global _installed
+    with _install_lock:
+        if not _installed:
+            register_middleware(_profile_middleware, kinds=(TOOL, LLM_CALL), priority=priority)
+            _installed = True
+
+
+@contextmanager
+def _profiled(scenario: str, run_id: str, mode: str, order_id: str = None):
+    _ensure_installed()
+    session = ProfileSession(
+        scenario, run_id, mode,
+        interval=float(os.getenv("HOOMI_PROFILE_INTERVAL_MS", 5)) / 1000,
+        top_n=int(os.getenv("HOOMI_PROFILE_TOP", 30)),
+        order_id=order_id,
+    )
+    reset_token = _current_session.set(session)
+    session.start()
+    try:
+        yield session
+    finally:
+        _current_session.reset(reset_token)
+        session.stop()
+
+
+def profile_run(scenario: str, run_id: str, mode: str = None, order_id: str = None):
+    """
+    Context manager profiling untuk satu crew.kickoff().
+    
+    Contoh:
+        with profile_run("ride", run_id, profiling_mode(requested), order.order_id) as profile:
+            result = crew.kickoff(inputs=inputs)
+        if profile:
+            print(profile.paths["collapsed"])
+    
+    Returns:
+        Context manager yang menghasilkan ProfileSession, atau None jika mode kosong
+    """
+    if not mode:
+        return nullcontext()
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Mode profiling tidak dikenal: '{mode}'")
+    return _profiled(scenario, run_id, mode, order_id)
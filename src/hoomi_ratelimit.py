@@ -0,0 +1,340 @@
+"""
+Hoomi Rate Limit - Rate Limiter & Concurrency Adaptif Client-Side untuk LLM
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Dengan banyak sesi berjalan bersamaan, setiap agent memanggil Gemini
+sendiri-sendiri; begitu kuota terlampaui, error 429 memicu retry yang
+justru menambah beban. Middleware ini mengatur SEMUA LLM yang dibungkus
+hoomi_hooks.instrument_llm (HoomiAgents, manager LLM orchestrator, dan
+MeetingPrepAgents) lewat satu limiter bersama per proses:
+
+1. Token bucket - request per menit (HOOMI_LLM_RPM) dan token per menit
+   (HOOMI_LLM_TPM); token di-reservasi dari estimasi prompt + completion,
+   lalu dikoreksi dengan ukuran respon sebenarnya
+2. AIMD concurrency - limit call paralel naik +1/limit setiap call sukses,
+   turun x0.5 (minimal HOOMI_LLM_CONCURRENCY_MIN) setiap respon 429, dan
+   semua call ditahan selama cooldown (Retry-After bila ada)
+3. Fair queueing - antrian start-time fair queueing per sesi; bobot sesi
+   mengikuti prioritas (interactive 4, normal 2, batch 1), sehingga satu
+   batch besar tidak menghabiskan kuota sesi interaktif
+4. Deadline - waktu tunggu di antrian dibatasi sisa budget skenario
+   (hoomi_latency) dan ikut dibatalkan oleh CancellationToken
+
+Limit saat ini diekspos lewat gauges() untuk metrik hoomi_llm_rate_limit.
+HOOMI_RATE_LIMIT=0 mematikan limiter.
+"""
+
+import contextvars
+import heapq
+import itertools
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from hoomi_events import current_run_id
+from hoomi_hooks import LLM_CALL, register_middleware
+from hoomi_latency import CallCancelled, DeadlineExceeded, current_scope
+from hoomi_tracing import estimate_tokens, messages_text
+
+PRIORITY_WEIGHTS = {"interactive": 4.0, "normal": 2.0, "batch": 1.0}
+DEFAULT_PRIORITY = os.getenv("HOOMI_LLM_DEFAULT_PRIORITY", "normal")
+
+_RATE_LIMIT_RE = re.compile(r"\b429\b|rate.?limit|resource.?exhausted|quota", re.I)
+_RETRY_AFTER_RE = re.compile(r"retry(?:[_ -]?after|[_ -]?delay)?\D{0,20}?(\d+(?:\.\d+)?)\s*s", re.I)
+
+_current_session = contextvars.ContextVar("hoomi_rate_session", default=None)
+
+
+@contextmanager
+def rate_limit_session(session_id: str, priority: str = "interactive"):
+    """
+    Tandai semua LLM call di dalam blok sebagai milik satu sesi.
+    
+    Contoh:
+        with rate_limit_session(run_id, "interactive"):
+            crew.kickoff(inputs=inputs)
+    """
+    reset_token = _current_session.set((session_id, priority))
+    try:
+        yield
+    finally:
+        _current_session.reset(reset_token)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if status == 429:
+        return True
+    return "ratelimit" in type(error).__name__.lower() or bool(_RATE_LIMIT_RE.search(str(error)))
+
+
+def retry_after(error: BaseException):
+    """Detik dari pesan/atribut Retry-After error 429, atau None."""
+    value = getattr(error, "retry_after", None)
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _RETRY_AFTER_RE.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+class TokenBucket():
+    """Token bucket per menit dengan refill kontinu (kapasitas = jatah satu menit)."""
+    
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+    
+    def consume(self, amount: float, now: float):
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+    
+    def adjust(self, delta: float):
+        """Koreksi reservasi (positif = pakai lebih banyak dari estimasi)."""
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class _Ticket():
+    __slots__ = ("session", "start_tag", "tokens", "cancelled")
+    
+    def __init__(self, session: str, start_tag: float, tokens: int):
+        self.session = session
+        self.start_tag = start_tag
+        self.tokens = tokens
+        self.cancelled = False
+
+
+class AdaptiveRateLimiter():
+    """
+    Limiter bersama: token bucket RPM/TPM + AIMD concurrency + fair queue.
+    
+    Args:
+        rpm: Request per menit
+        tpm: Token per menit
+        initial_concurrency: Limit call paralel awal
+        min_concurrency: Limit minimum setelah decrease
+        max_concurrency: Limit maksimum setelah increase
+        decrease: Faktor multiplicative decrease saat 429
+        cooldown_s: Jeda semua call setelah 429 tanpa Retry-After
+        completion_estimate: Token completion yang di-reservasi per call
+    """
+    
+    def __init__(self, rpm: float = 15, tpm: float = 1_000_000, initial_concurrency: int = 4,
+                 min_concurrency: int = 1, max_concurrency: int = 16, decrease: float = 0.5,
+                 cooldown_s: float = 2.0, completion_estimate: int = 512):
+        self.rpm = TokenBucket(rpm)
+        self.tpm = TokenBucket(tpm)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.decrease = decrease
+        self.cooldown_s = cooldown_s
+        self.completion_estimate = completion_estimate
+        self._limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._queue = []             # heap (start_tag, seq, ticket)
+        self._session_tags = {}      # sesi -> finish tag terakhir
+        self._virtual_time = 0.0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._unregister = None
+        self.stats = {"granted": 0, "queued": 0, "rate_limited": 0, "timeouts": 0, "wait_s": 0.0}
+    
+    @classmethod
+    def from_env(cls):
+        """Baca konfigurasi dari environment (HOOMI_LLM_RPM, HOOMI_LLM_TPM, ...)."""
+        return cls(
+            rpm=float(os.getenv("HOOMI_LLM_RPM", 15)),
+            tpm=float(os.getenv("HOOMI_LLM_TPM", 1_000_000)),
+            initial_concurrency=int(os.getenv("HOOMI_LLM_CONCURRENCY", 4)),
+            min_concurrency=int(os.getenv("HOOMI_LLM_CONCURRENCY_MIN", 1)),
+            max_concurrency=int(os.getenv("HOOMI_LLM_CONCURRENCY_MAX", 16)),
+            cooldown_s=float(os.getenv("HOOMI_LLM_COOLDOWN_S", 2.0)),
+        )
+    
+    def install(self, priority: int = 18):
+        """Pasang di luar LatencyGuard (20): antrian tidak memakan thread executor."""
+        if self._unregister is None:
+            self._unregister = register_middleware(self, kinds=(LLM_CALL,), priority=priority)
+        return self
+    
+    def uninstall(self):
+        if self._unregister is not None:
+            self._unregister()
+            self._unregister = None
+    
+    # ==========================================
+    # ADMISSION
+    # ==========================================
+    
+    def acquire(self, session: str, priority: str, tokens: int, timeout: float = None, token=None) -> _Ticket:
+        """Tunggu giliran sesi + slot concurrency + kuota RPM/TPM. Returns ticket untuk release()."""
+        weight = PRIORITY_WEIGHTS.get(priority, PRIORITY_WEIGHTS["normal"])
+        started = time.monotonic()
+        deadline = started + timeout if timeout is not None else None
+        with self._cond:
+            start_tag = max(self._virtual_time, self._session_tags.get(session, 0.0))
+            self._session_tags[session] = start_tag + 1.0 / weight
+            ticket = _Ticket(session, start_tag, tokens)
+            heapq.heappush(self._queue, (start_tag, next(self._seq), ticket))
+            waited = False
+            while True:
+                now = time.monotonic()
+                wait_for = self._ready_in(ticket, now)
+                if wait_for == 0:
+                    break
+                if token is not None and token.cancelled:
+                    ticket.cancelled = True
+                    self._cond.notify_all()
+                    raise CallCancelled("LLM call dibatalkan saat menunggu rate limiter")
+                if deadline is not None and now >= deadline:
+                    ticket.cancelled = True
+                    self.stats["timeouts"] += 1
+                    self._cond.notify_all()
+                    raise DeadlineExceeded(f"Menunggu rate limiter LLM melebihi {timeout:.1f}s")
+                waited = True
+                limit = 0.5 if wait_for is None else wait_for
+                if deadline is not None:
+                    limit = min(limit, deadline - now)
+                self._cond.wait(max(limit, 0.001))
+            
+            heapq.heappop(self._queue)
+            self._virtual_time = max(self._virtual_time, ticket.start_tag)
+            self._in_flight += 1
+            self.rpm.consume(1, now)
+            self.tpm.consume(tokens, now)
+            self.stats["granted"] += 1
+            if waited:
+                self.stats["queued"] += 1
+                self.stats["wait_s"] += now - started
+            if len(self._session_tags) > 1024:
+                self._session_tags = {s: tag for s, tag in self._session_tags.items() if tag > self._virtual_time}
+            self._cond.notify_all()
+        return ticket
+    
+    def _ready_in(self, ticket: _Ticket, now: float):
+        """0 jika ticket boleh jalan, detik tunggu jika dibatasi bucket/cooldown, None jika menunggu giliran."""
+        while self._queue and self._queue[0][2].cancelled:
+            heapq.heappop(self._queue)
+        if self._queue[0][2] is not ticket:
+            return None
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._in_flight >= int(self._limit):
+            return None
+        wait_for = max(self.rpm.wait_time(1, now), self.tpm.wait_time(ticket.tokens, now))
+        return wait_for if wait_for > 0 else 0
+    
+    def release(self, ticket: _Ticket, outcome: str = "ok", used_tokens: int = None, error: BaseException = None):
+        """
+        Selesaikan call: outcome "ok" (additive increase), "rate_limited"
+        (multiplicative decrease + cooldown), atau "error" (limit tetap).
+        """
+        with self._cond:
+            self._in_flight -= 1
+            if used_tokens is not None:
+                self.tpm.adjust(used_tokens - ticket.tokens)
+            if outcome == "ok":
+                self._limit = min(self.max_concurrency, self._limit + 1.0 / self._limit)
+            elif outcome == "rate_limited":
+                self.stats["rate_limited"] += 1
+                self._limit = max(self.min_concurrency, self._limit * self.decrease)
+                pause = (retry_after(error) if error is not None else None) or self.cooldown_s
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+                self.rpm.tokens = min(self.rpm.tokens, 0.0)
+            self._cond.notify_all()
+    
+    # ==========================================
+    # MIDDLEWARE
+    # ==========================================
+    
+    def __call__(self, call, proceed):
+        session, priority = _current_session.get() or (current_run_id() or threading.current_thread().name,
+                                                       DEFAULT_PRIORITY)
+        messages = call.kwargs.get("messages", call.args[0] if call.args else None)
+        prompt_tokens = estimate_tokens(messages_text(messages))
+        
+        scope = current_scope()
+        timeout = scope.remaining() if scope is not None else None
+        ticket = self.acquire(session, priority, prompt_tokens + self.completion_estimate,
+                              max(timeout, 0.0) if timeout is not None else None,
+                              scope.token if scope is not None else None)
+        try:
+            result = proceed()
+        except BaseException as e:
+            self.release(ticket, "rate_limited" if is_rate_limit_error(e) else "error", error=e)
+            raise
+        self.release(ticket, "ok", prompt_tokens + estimate_tokens(result))
+        return result
+    
+    # ==========================================
+    # STATISTIK
+    # ==========================================
+    
+    def gauges(self) -> dict:
+        """{(nama_limit,): nilai} untuk metrik gauge hoomi_llm_rate_limit."""
+        now = time.monotonic()
+        with self._cond:
+            self.rpm._refill(now)
+            self.tpm._refill(now)
+            return {
+                ("concurrency_limit",): int(self._limit),
+                ("in_flight",): self._in_flight,
+                ("queued",): sum(1 for _, _, t in self._queue if not t.cancelled),
+                ("rpm_limit",): self.rpm.capacity,
+                ("rpm_available",): round(max(self.rpm.tokens, 0.0), 2),
+                ("tpm_limit",): self.tpm.capacity,
+                ("tpm_available",): round(max(self.tpm.tokens, 0.0), 0),
+                ("cooldown_s",): round(max(self._paused_until - now, 0.0), 2),
+            }
+    
+    def report(self) -> dict:
+        with self._cond:
+            stats = dict(self.stats)
+            stats["concurrency_limit"] = round(self._limit, 2)
+        stats["avg_wait_s"] = stats["wait_s"] / stats["queued"] if stats["queued"] else 0.0
+        return stats
+    
+    def format_report(self) -> str:
+        stats = self.report()
+        return (
+            f"🚦 Rate limit LLM: {stats['granted']} call, {stats['queued']} antri "
+            f"(rata-rata {stats['avg_wait_s']:.2f}s), {stats['rate_limited']}x 429, "
+            f"concurrency {stats['concurrency_limit']:g}"
+        )
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def rate_limit_enabled() -> bool:
+    return os.getenv("HOOMI_RATE_LIMIT", "1").lower() not in ("0", "false", "no", "off")
+
+
+def install_rate_limiter():
+    """
+    Pasang limiter bersama per proses (idempotent).
+    
+    Returns:
+        AdaptiveRateLimiter, atau None jika HOOMI_RATE_LIMIT=0
+    """
+    global _limiter
+    if not rate_limit_enabled():
+        return None
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = AdaptiveRateLimiter.from_env().install()
+        return _limiter
@@ -13,6 +13,10 @@ Setiap task mengikuti struktur:
 - Agent: Agent yang bertanggung jawab
 - Context: Dependencies dari task sebelumnya
 - Human Input: Flag untuk HITL (Guardrails)
+
+Description task berupa TEMPLATE dengan placeholder {nama_input}, bukan
+f-string. Nilai per order dikirim lewat crew.kickoff(inputs={...}) sehingga
+satu Crew bisa dipakai ulang untuk banyak order (lihat hoomi_crew_pool).
 """
 
 from textwrap import dedent
@@ -27,6 +31,12 @@ class HoomiTasks():
     1. Jual Beli Barang
     2. Pengantaran Barang  
     3. Antar Jemput Penumpang
+    
+    Placeholder yang dipakai (diisi via kickoff inputs):
+    - Commerce: product_query, user_location, destination, product_info
+    - Payment: total_amount, recipient_id, payment_description
+    - Delivery: pickup_address, destination_address, package_description
+    - Ride: pickup_location, destination, passenger_count
     """
     
     # ==========================================
@@ -34,7 +44,7 @@ class HoomiTasks():
     # Sesuai TOR Section C - Jual Beli Barang
     # ==========================================
     
-    def search_product_task(self, agent, product_query: str, user_location: str = None):
+    def search_product_task(self, agent):
         """
         Task 1: Pencarian Barang Jualan
         
@@ -45,16 +55,19 @@ class HoomiTasks():
         
         Args:
             agent: Storefront Agent yang akan mengeksekusi
+        
+        Inputs:
             product_query: Kata kunci produk yang dicari user
-            user_location: Lokasi user untuk filtering merchant terdekat (optional)
+            user_location: Lokasi user untuk filtering merchant terdekat
         
         Returns:
             Task: Task configuration untuk product search
         """
         return Task(
-            description=dedent(f"""\
+            name="search_product",
+            description=dedent("""\
                 User ingin membeli produk: "{product_query}"
-                {f"Lokasi user: {user_location}" if user_location else ""}
+                Lokasi user: {user_location}
                 
                 TUGAS ANDA:
                 1. Gunakan tool 'search_product' untuk mencari produk di katalog Hoomi
@@ -103,7 +116,7 @@ class HoomiTasks():
             async_execution=False  # Sequential untuk data validation
         )
     
-    def delivery_setup_task(self, agent, destination: str, product_info: str = None):
+    def delivery_setup_task(self, agent):
         """
         Task 2: Penentuan Pengiriman
         
@@ -114,16 +127,20 @@ class HoomiTasks():
         
         Args:
             agent: Dispatch Agent yang akan mengeksekusi
+        
+        Inputs:
             destination: Alamat tujuan pengiriman
-            product_info: Info produk dari task sebelumnya (optional)
+            product_info: Info produk yang dipesan
+            order_id: ID order di order store (hoomi_orders)
         
         Returns:
             Task: Task configuration untuk delivery setup
         """
         return Task(
-            description=dedent(f"""\
-                Setup pengiriman untuk order:
-                {f"Produk: {product_info}" if product_info else ""}
+            name="delivery_setup",
+            description=dedent("""\
+                Setup pengiriman untuk order {order_id}:
+                Produk: {product_info}
                 Tujuan: {destination}
                 
                 TUGAS ANDA:
@@ -131,10 +148,12 @@ class HoomiTasks():
                    - Gunakan tool 'get_user_location'
                    - ⚠️ PENTING: Tool ini memerlukan IZIN USER (HITL)!
                    - Jika user tidak approve, gunakan alamat manual
+                     dan konversi dengan tool 'geocode_address'
                 
                 2. Identifikasi lokasi merchant/toko:
                    - Gunakan info dari task sebelumnya (context)
-                   - Atau estimate koordinat dari nama merchant
+                   - Konversi alamat merchant & tujuan dengan tool 'geocode_address'
+                     (jangan menebak koordinat)
                 
                 3. Hitung rute pengiriman:
                    - Gunakan tool 'calculate_route' dengan koordinat pickup & destination
@@ -144,6 +163,10 @@ class HoomiTasks():
                    - Gunakan tool 'find_driver' di lokasi merchant
                    - Pilih tipe kendaraan yang sesuai (motorcycle untuk jarak dekat)
                    - Dapatkan ETA driver untuk pickup
+                   - Jika ada order lain yang menunggu driver dari area merchant yang sama,
+                     gunakan tool 'plan_delivery_batch' agar satu driver membawa beberapa order
+                   - Catat driver terpilih dengan tool 'assign_order_driver'
+                     ("{order_id}", driver_id dari find_driver)
                 
                 5. Berikan summary lengkap:
                    - Rute perjalanan (dengan Google Maps link)
@@ -162,6 +185,7 @@ class HoomiTasks():
                 ```
                 📍 DETAIL PENGIRIMAN
                 
+                Order ID: {order_id}
                 Dari: [Nama Merchant/Toko]
                       [Alamat pickup]
                 
@@ -191,7 +215,7 @@ class HoomiTasks():
             human_input=True  # HITL untuk akses GPS (Sesuai TOR Guardrails)
         )
     
-    def payment_task(self, agent, total_amount: int, recipient_id: str, description: str):
+    def payment_task(self, agent):
         """
         Task 3: Pembayaran
         
@@ -202,19 +226,24 @@ class HoomiTasks():
         
         Args:
             agent: Merchant Agent yang akan mengeksekusi
-            total_amount: Total pembayaran (produk + ongkir)
+        
+        Inputs:
+            total_amount: Total pembayaran (produk + ongkir), sudah diformat
             recipient_id: ID merchant/driver penerima
-            description: Deskripsi transaksi
+            payment_description: Deskripsi transaksi
+            order_id: ID order yang dibayar (hoomi_orders)
         
         Returns:
             Task: Task configuration untuk payment processing
         """
         return Task(
-            description=dedent(f"""\
+            name="payment",
+            description=dedent("""\
                 Proses pembayaran untuk transaksi:
-                - Total Amount: Rp {total_amount:,}
+                - Order ID: {order_id}
+                - Total Amount: Rp {total_amount}
                 - Penerima: {recipient_id}
-                - Deskripsi: {description}
+                - Deskripsi: {payment_description}
                 
                 TUGAS ANDA:
                 1. Validasi detail transaksi:
@@ -223,10 +252,12 @@ class HoomiTasks():
                    - Cek deskripsi transaksi jelas
                 
                 2. Proses pembayaran via Hoomi Wallet:
-                   - Gunakan tool 'pay_wallet' untuk eksekusi payment
-                   - ⚠️ CRITICAL: Tool ini WAJIB meminta approval user (HITL)!
+                   - Gunakan tool 'pay_wallet' dengan order_id "{order_id}" untuk eksekusi payment
+                   - ⚠️ CRITICAL: Pembayaran WAJIB disetujui user (HITL)!
                    - Jelaskan detail transaksi dengan jelas ke user
-                   - Tunggu konfirmasi approval sebelum proceed
+                   - pay_wallet mengembalikan status "pending_approval": sistem akan meminta
+                     approval user setelah Anda selesai, dan order baru tercatat lunas
+                     setelah user menyetujui. Jangan menyatakan pembayaran berhasil
                 
                 3. Handle smart contract:
                    - Payment akan diproses via Ethereum L2 BASE blockchain
@@ -261,6 +292,7 @@ class HoomiTasks():
                 Status: [✅ BERHASIL / ⏳ PENDING / ❌ GAGAL]
                 
                 DETAIL TRANSAKSI:
+                - Order ID: {order_id}
                 - Transaction ID: [TXN123ABC...]
                 - Tanggal: [YYYY-MM-DD HH:mm:ss]
                 - Metode: Hoomi Wallet (Blockchain)
@@ -291,7 +323,9 @@ class HoomiTasks():
             
             agent=agent,
             context=[],  # Will be set di main.py
-            human_input=True  # HITL WAJIB untuk payment (Sesuai TOR)
+            # HITL WAJIB untuk payment (Sesuai TOR): approval diminta hoomi_main di
+            # main thread setelah kickoff (approve_payment), bukan human_input task
+            human_input=False
         )
     
     # ==========================================
@@ -299,8 +333,7 @@ class HoomiTasks():
     # Sesuai TOR Section C - Pengantaran Barang
     # ==========================================
     
-    def package_delivery_task(self, agent, pickup_address: str, destination_address: str, 
-                             package_description: str = "Paket"):
+    def package_delivery_task(self, agent):
         """
         Task untuk delivery package (non-commerce).
         User ingin mengirim paket dari A ke B tanpa shopping.
@@ -312,16 +345,20 @@ class HoomiTasks():
         
         Args:
             agent: Dispatch Agent
+        
+        Inputs:
             pickup_address: Alamat penjemputan paket
             destination_address: Alamat tujuan pengiriman
-            package_description: Deskripsi paket (optional)
+            package_description: Deskripsi paket
+            order_id: ID order di order store (hoomi_orders)
         
         Returns:
             Task: Task configuration untuk package delivery
         """
         return Task(
-            description=dedent(f"""\
-                User ingin mengirim paket:
+            name="package_delivery",
+            description=dedent("""\
+                User ingin mengirim paket (order {order_id}):
                 - Dari: {pickup_address}
                 - Ke: {destination_address}
                 - Paket: {package_description}
@@ -329,7 +366,7 @@ class HoomiTasks():
                 TUGAS ANDA:
                 1. Konversi alamat ke koordinat GPS:
                    - Jika alamat pickup adalah "lokasi saat ini", gunakan 'get_user_location'
-                   - Untuk alamat manual, estimate koordinat atau gunakan geocoding API
+                   - Untuk alamat manual, gunakan tool 'geocode_address' (jangan menebak koordinat)
                 
                 2. Hitung rute dan estimasi:
                    - Gunakan tool 'calculate_route' dengan koordinat pickup & destination
@@ -339,6 +376,10 @@ class HoomiTasks():
                    - Gunakan tool 'find_driver' di lokasi pickup
                    - Pilih tipe kendaraan sesuai ukuran paket
                    - Pertimbangkan: motor (paket kecil), mobil (paket sedang), van (paket besar)
+                   - Jika ada beberapa paket pending di sekitar pickup, gunakan tool
+                     'plan_delivery_batch' untuk rute multi-stop sebelum memilih driver
+                   - Catat driver terpilih dengan tool 'assign_order_driver'
+                     ("{order_id}", driver_id dari find_driver)
                 
                 4. Berikan info lengkap:
                    - Detail rute dengan Google Maps link
@@ -355,6 +396,8 @@ class HoomiTasks():
                 ```
                 📦 PENGIRIMAN PAKET
                 
+                Order ID: {order_id}
+                
                 DETAIL PAKET:
                 Deskripsi: [Package description]
                 
@@ -390,8 +433,7 @@ class HoomiTasks():
     # Sesuai TOR Section C - Antar Jemput Penumpang
     # ==========================================
     
-    def ride_booking_task(self, agent, pickup_location: str, destination: str, 
-                         passenger_count: int = 1):
+    def ride_booking_task(self, agent):
         """
         Task untuk booking ride (transportation).
         User ingin naik kendaraan dari A ke B.
@@ -403,16 +445,21 @@ class HoomiTasks():
         
         Args:
             agent: Dispatch Agent
+        
+        Inputs:
             pickup_location: Lokasi penjemputan
             destination: Lokasi tujuan
-            passenger_count: Jumlah penumpang (default 1)
+            passenger_count: Jumlah penumpang
+            order_id: ID order di order store (hoomi_orders)
+            user_id: ID user yang memesan (rider_id untuk pooling)
         
         Returns:
             Task: Task configuration untuk ride booking
         """
         return Task(
-            description=dedent(f"""\
-                User ingin booking kendaraan:
+            name="ride_booking",
+            description=dedent("""\
+                User {user_id} ingin booking kendaraan (order {order_id}):
                 - Pickup: {pickup_location}
                 - Tujuan: {destination}
                 - Penumpang: {passenger_count} orang
@@ -420,7 +467,7 @@ class HoomiTasks():
                 TUGAS ANDA:
                 1. Dapatkan lokasi pickup:
                    - Jika "{pickup_location}" adalah "lokasi saya", gunakan 'get_user_location' (HITL!)
-                   - Jika alamat spesifik, konversi ke koordinat
+                   - Jika alamat spesifik, konversi ke koordinat dengan tool 'geocode_address'
                 
                 2. Hitung rute perjalanan:
                    - Gunakan tool 'calculate_route' untuk estimasi
@@ -432,11 +479,22 @@ class HoomiTasks():
                    - Car: 1-4 penumpang, nyaman
                    - Van: 5+ penumpang atau banyak barang
                 
-                4. Cari driver terdekat:
+                4. Tawarkan ride bersama (pooling) untuk mobil dengan kursi tersisa:
+                   - Gunakan tool 'find_ride_pool' dengan koordinat pickup, tujuan, {passenger_count},
+                     dan rider_id "{user_id}"
+                   - Jika status "pooled", tampilkan tarif pool vs tarif solo dan detour-nya
+                   - Jika status "no_match", lanjutkan dengan ride solo; gunakan wait=true
+                     hanya jika user secara eksplisit memilih menunggu pasangan
+                   - Jika status "waiting", cek hasilnya dengan find_ride_pool memakai request_id
+                     tersebut; status "expired" berarti lanjutkan dengan ride solo
+                
+                5. Cari driver terdekat:
                    - Gunakan tool 'find_driver' dengan tipe kendaraan yang sesuai
                    - Prioritas: rating tinggi, jarak dekat, ETA cepat
+                   - Catat driver terpilih dengan tool 'assign_order_driver'
+                     ("{order_id}", driver_id dari find_driver)
                 
-                5. Berikan booking confirmation:
+                6. Berikan booking confirmation:
                    - Detail perjalanan (rute, jarak, waktu)
                    - Estimasi biaya (transparan)
                    - Info driver lengkap (nama, plat, foto kendaraan)
@@ -452,6 +510,8 @@ class HoomiTasks():
                 ```
                 🚗 BOOKING KENDARAAN
                 
+                Order ID: {order_id}
+                
                 DETAIL PERJALANAN:
                 📍 Pickup: [Lokasi pickup]
                 📍 Tujuan: [Lokasi destination]
@@ -497,26 +557,31 @@ class HoomiTasks():
     # HELPER TASKS
     # ==========================================
     
-    def confirmation_task(self, agent, order_summary: str):
+    def confirmation_task(self, agent):
         """
         Task untuk final confirmation dan tracking setup.
         Digunakan setelah semua task selesai.
         
         Args:
             agent: Any agent (biasanya Storefront sebagai orchestrator)
+        
+        Inputs:
             order_summary: Summary dari semua task sebelumnya
+            order_id: ID order di order store (hoomi_orders)
         
         Returns:
             Task: Task configuration untuk confirmation
         """
         return Task(
-            description=dedent(f"""\
+            name="confirmation",
+            description=dedent("""\
                 Berikan konfirmasi final kepada user:
                 {order_summary}
                 
                 TUGAS ANDA:
                 1. Ringkas semua informasi dari task sebelumnya
-                2. Berikan order tracking information
+                2. Berikan order tracking information dari tool 'track_delivery' ("{order_id}");
+                   jangan membuat Order ID sendiri
                 3. Setup real-time tracking (jika delivery/ride)
                 4. Kirim notifikasi confirmation ke user
                 5. Berikan instruksi next steps
@@ -530,7 +595,8 @@ class HoomiTasks():
                 [Summary dari semua proses]
                 
                 TRACKING:
-                Order ID: [Order ID]
+                Order ID: {order_id}
+                Status: [Status dari track_delivery]
                 Link tracking: [URL]
                 
                 NEXT STEPS:
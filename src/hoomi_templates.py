@@ -0,0 +1,120 @@
+"""
+Hoomi Templates - Registry Template Agent/Task yang Dibangun Sekali
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Membuat Agent CrewAI (validasi pydantic, LLM wrapper, backstory panjang)
+cukup mahal jika diulang di setiap skenario. Registry ini:
+
+1. Membangun setiap template satu kali (lazy, thread-safe)
+2. Memberikan clone murah (shallow model_copy) untuk setiap request
+3. Mendukung warm-up di background thread selagi user mengisi menu
+
+Import crewai (dan litellm/langchain di belakangnya) juga ditunda sampai
+template pertama kali dibangun, sehingga menu bisa tampil lebih cepat.
+"""
+
+import threading
+import uuid
+from functools import lru_cache, partial
+
+
+class TemplateRegistry():
+    """
+    Registry factory -> template yang dibangun sekali lalu di-clone.
+
+    Contoh:
+        registry = TemplateRegistry()
+        registry.register("dispatch_agent", build_dispatch)
+        agent = registry.get("dispatch_agent")   # clone, aman dimodifikasi
+    """
+
+    def __init__(self):
+        self._factories = {}
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory):
+        """Daftarkan factory tanpa argumen untuk template `name`."""
+        with self._lock:
+            self._factories[name] = factory
+            self._templates.pop(name, None)
+
+    def names(self):
+        return list(self._factories)
+
+    def template(self, name: str):
+        """Ambil template asli (dibangun saat pertama kali diminta)."""
+        template = self._templates.get(name)
+        if template is not None:
+            return template
+
+        with self._lock:
+            if name not in self._templates:
+                if name not in self._factories:
+                    raise KeyError(f"Template '{name}' belum terdaftar")
+                self._templates[name] = self._factories[name]()
+            return self._templates[name]
+
+    def get(self, name: str):
+        """Ambil clone murah dari template `name`."""
+        return clone(self.template(name))
+
+    def prebuild(self, names=None):
+        """Bangun semua (atau sebagian) template sekarang."""
+        for name in names or self.names():
+            self.template(name)
+
+    def warm_up(self, names=None) -> threading.Thread:
+        """
+        Bangun template di background thread.
+
+        Dipanggil setelah menu tampil: import crewai dan konstruksi agent
+        berjalan selagi user masih mengetik input.
+        """
+        thread = threading.Thread(target=self._safe_prebuild, args=(names,), daemon=True,
+                                  name="hoomi-template-warmup")
+        thread.start()
+        return thread
+
+    def _safe_prebuild(self, names):
+        try:
+            self.prebuild(names)
+        except Exception:
+            # Warm-up bersifat best-effort; error akan muncul lagi saat get()
+            pass
+
+
+def clone(obj):
+    """
+    Clone murah untuk model pydantic CrewAI (Agent/Task).
+
+    Shallow copy: LLM, tools, dan string konfigurasi dipakai bersama;
+    hanya ID yang dibuat baru agar Crew tidak melihat duplikat.
+    """
+    if hasattr(obj, "model_copy"):
+        update = {"id": uuid.uuid4()} if hasattr(obj, "id") else None
+        return obj.model_copy(update=update)
+    return obj.copy()
+
+
+# ==========================================
+# TEMPLATE AGENT HOOMI
+# ==========================================
+
+HOOMI_AGENT_NAMES = ("storefront_agent", "dispatch_agent", "merchant_agent")
+
+
+@lru_cache(maxsize=None)
+def _hoomi_agents():
+    """Satu instance HoomiAgents (dan satu LLM) untuk semua template."""
+    from hoomi_agents import HoomiAgents
+    return HoomiAgents()
+
+
+def _build_hoomi_agent(method_name: str):
+    return getattr(_hoomi_agents(), method_name)()
+
+
+AGENT_TEMPLATES = TemplateRegistry()
+for _name in HOOMI_AGENT_NAMES:
+    AGENT_TEMPLATES.register(_name, partial(_build_hoomi_agent, _name))
@@ -4,13 +4,22 @@ Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
 
 Tools dibagi menjadi:
 1. Internal MCP - Commerce Tools
-2. Internal MCP - Fleet/Dispatch Tools  
+2. Internal MCP - Fleet/Dispatch Tools (termasuk geocoding offline)
 3. Guardrails HITL - Wallet Tools
 4. Guardrails HITL - Geolocation Tools
+5. Order Store - Tracking & Status Order (hoomi_orders)
 """
 
 from crewai.tools import tool
+from hoomi_geocoder import get_geocoder, is_self_location
+from hoomi_hooks import instrument_tool
+from hoomi_orders import check_order_access, current_order_id, get_order_store, request_payment
+from hoomi_pooling import RideRequest, get_pooling_engine
+from hoomi_trip_model import get_trip_model
+from hoomi_vrp import DEFAULT_CAPACITY, DEFAULT_DUE_MIN, VRPOrder, VRPVehicle, plan_batch
+import json
 import os
+import time
 
 # ==========================================
 # INTERNAL MCP - COMMERCE TOOLS
@@ -61,6 +70,31 @@ def search_product(query: str, category: str = "all") -> str:
 # INTERNAL MCP - FLEET/DISPATCH TOOLS
 # ==========================================
 
+@tool("Geocode Address")
+def geocode_address(address: str) -> str:
+    """
+    Mengubah alamat teks bebas menjadi koordinat GPS (lat/lon) dari gazetteer lokal.
+    Gunakan SEBELUM calculate_route / find_driver, jangan menebak koordinat.
+    
+    Args:
+        address: Alamat atau nama tempat (e.g., "Jl. Sudirman No. 123, Jakarta Pusat", "Stasiun Gambir")
+    
+    Returns:
+        JSON berisi lat, lon, nama tempat, kelurahan, kota, confidence, dan alternatif.
+        Untuk "lokasi saya", arahkan ke get_user_location (HITL).
+    
+    Example:
+        geocode_address("Stasiun Sudirman")
+    """
+    if is_self_location(address):
+        return json.dumps({"query": address, "found": False, "use_tool": "get_user_location",
+                           "reason": "Lokasi user saat ini memerlukan izin user (HITL)"})
+    try:
+        return json.dumps(get_geocoder().geocode(address).to_dict())
+    except OSError as e:
+        return json.dumps({"query": address, "found": False, "error": f"Gazetteer tidak tersedia: {e}"})
+
+
 @tool("Calculate Delivery Route")
 def calculate_route(pickup_lat: float, pickup_lon: float, dest_lat: float, dest_lon: float) -> str:
     """
@@ -81,12 +115,11 @@ def calculate_route(pickup_lat: float, pickup_lon: float, dest_lat: float, dest_
     """
     # TODO: Integrasi Google Maps API
     # TODO: Implementasi GNN (Graph Neural Networks) untuk optimasi rute
-    # TODO: Regression model untuk prediksi harga
-    distance_km = abs(dest_lat - pickup_lat) * 111  # Rough estimation
-    duration_min = distance_km * 3  # ~20 km/h average
-    price_idr = 5000 + (distance_km * 2000)  # Base fare + per km
+    # Jarak haversine + model ETA/harga (lihat hoomi_trip_model, baseline = tarif lama)
+    model = get_trip_model()
+    distance_km, duration_min, price_idr = model.predict_one(pickup_lat, pickup_lon, dest_lat, dest_lon)
     
-    return f'{{"pickup": {{"lat": {pickup_lat}, "lon": {pickup_lon}}}, "destination": {{"lat": {dest_lat}, "lon": {dest_lon}}}, "distance_km": {distance_km:.2f}, "duration_min": {int(duration_min)}, "price_idr": {int(price_idr)}, "route_url": "https://maps.google.com/?saddr={pickup_lat},{pickup_lon}&daddr={dest_lat},{dest_lon}", "traffic_condition": "moderate"}}'
+    return f'{{"pickup": {{"lat": {pickup_lat}, "lon": {pickup_lon}}}, "destination": {{"lat": {dest_lat}, "lon": {dest_lon}}}, "distance_km": {distance_km:.2f}, "duration_min": {int(duration_min)}, "price_idr": {int(price_idr)}, "route_url": "https://maps.google.com/?saddr={pickup_lat},{pickup_lon}&daddr={dest_lat},{dest_lon}", "traffic_condition": "moderate", "pricing_model": "{model.name}"}}'
 
 
 @tool("Find Nearest Driver")
@@ -112,12 +145,116 @@ def find_driver(latitude: float, longitude: float, vehicle_type: str = "motorcyc
     return f'{{"driver_id": "DRV123", "name": "Budi Santoso", "phone": "+62812****5678", "vehicle_type": "{vehicle_type}", "vehicle_plate": "B 1234 XYZ", "rating": 4.8, "total_trips": 1250, "distance_km": 0.8, "eta_min": 3, "current_location": {{"lat": {latitude + 0.01}, "lon": {longitude + 0.01}}}, "status": "available"}}'
 
 
+
+@tool("Plan Multi-Stop Delivery Batch")
+def plan_delivery_batch(orders: str, drivers: str = "") -> str:
+    """
+    Menggabungkan beberapa order pending menjadi rute multi-stop (satu driver
+    membawa beberapa paket) dengan memperhatikan kapasitas dan batas waktu antar.
+    Gunakan jika ada lebih dari satu order yang menunggu driver.
+    
+    Args:
+        orders: JSON list order, setiap order berisi order_id, pickup_lat, pickup_lon,
+            dest_lat, dest_lon, dan opsional size (default 1), ready_min, due_min
+            (menit dari sekarang, default 60)
+        drivers: JSON list driver opsional (driver_id, lat, lon, capacity, available_min);
+            kosong = armada default di sekitar pickup
+    
+    Returns:
+        JSON berisi rute per driver (urutan stop pickup/dropoff, ETA, muatan),
+        order yang tidak terlayani, dan penghematan km vs satu trip per order
+    
+    Example:
+        plan_delivery_batch('[{"order_id": "ORD1", "pickup_lat": -6.2088, "pickup_lon": 106.8456, "dest_lat": -6.1751, "dest_lon": 106.8650}]')
+    """
+    try:
+        batch = [
+            VRPOrder(str(o["order_id"]), (float(o["pickup_lat"]), float(o["pickup_lon"])),
+                     (float(o["dest_lat"]), float(o["dest_lon"])), int(o.get("size", 1)),
+                     float(o.get("ready_min", 0)), float(o.get("due_min", DEFAULT_DUE_MIN)))
+            for o in json.loads(orders)
+        ]
+        fleet = [
+            VRPVehicle(str(d["driver_id"]), (float(d["lat"]), float(d["lon"])),
+                       int(d.get("capacity", DEFAULT_CAPACITY)), float(d.get("available_min", 0)))
+            for d in (json.loads(drivers) if drivers and drivers.strip() else [])
+        ]
+    except (ValueError, KeyError, TypeError) as e:
+        return json.dumps({"error": f"Format orders/drivers tidak valid: {e}"})
+    return json.dumps(plan_batch(batch, fleet or None))
+
+
+@tool("Find Shared Ride Pool")
+def find_ride_pool(pickup_lat: float, pickup_lon: float, dest_lat: float, dest_lon: float,
+                   passenger_count: int = 1, rider_id: str = "", wait: bool = False,
+                   request_id: str = "") -> str:
+    """
+    Mencari penumpang lain dengan arah yang sama untuk ride bersama (pooling).
+    Jika ada pasangan yang cocok, kembalikan penawaran tarif pool untuk kedua
+    penumpang. Jika belum ada, request hanya disimpan untuk dipasangkan dengan
+    penumpang berikutnya bila wait=true (user bersedia menunggu); dengan
+    wait=false request terbuka rider ini sebelumnya juga ditarik. Penumpang
+    yang menunggu mengecek hasilnya dengan request_id dari status "waiting".
+    
+    Args:
+        pickup_lat: Latitude lokasi penjemputan
+        pickup_lon: Longitude lokasi penjemputan
+        dest_lat: Latitude lokasi tujuan
+        dest_lon: Longitude lokasi tujuan
+        passenger_count: Jumlah penumpang (kursi) dalam request ini
+        rider_id: ID user yang memesan (default: pemilik order run aktif)
+        wait: True jika user memilih menunggu pasangan alih-alih ride solo
+        request_id: request_id dari status "waiting" untuk mengecek apakah sudah dipasangkan
+    
+    Returns:
+        JSON status "pooled" (urutan stop, detour, tarif solo vs tarif pool per penumpang),
+        "waiting" (request_id dan tarif solo sebagai pembanding), "expired" (request_id
+        sudah tidak menunggu), atau "no_match" (wait=false: lanjutkan dengan ride solo)
+    
+    Example:
+        find_ride_pool(-6.2088, 106.8456, -6.1751, 106.8650, 1, "USR001")
+    """
+    rider_id = rider_id.strip() or _current_rider()
+    _, _, solo = get_trip_model().predict_one(pickup_lat, pickup_lon, dest_lat, dest_lon)
+    if request_id.strip():
+        status, found = get_pooling_engine().poll(request_id.strip(), rider_id)
+        if status == "pooled":
+            return json.dumps(dict(found.to_dict(), status="pooled"))
+        if status == "waiting":
+            return json.dumps({"status": "waiting", "request_id": found.request_id, "seats": found.seats,
+                               "solo_fare_idr": int(solo),
+                               "expires_in_s": max(int(found.expires_at - time.time()), 0),
+                               "reason": "Belum ada penumpang searah"})
+        return json.dumps({"status": "expired", "request_id": request_id.strip(), "solo_fare_idr": int(solo),
+                           "reason": "Request tidak lagi menunggu pasangan; lanjutkan dengan ride solo"})
+    
+    request = RideRequest((pickup_lat, pickup_lon), (dest_lat, dest_lon), int(passenger_count), rider_id)
+    match = get_pooling_engine().match_or_queue(request, queue=bool(wait))
+    if match is not None:
+        return json.dumps(dict(match.to_dict(), status="pooled"))
+    if not wait or not rider_id:
+        return json.dumps({"status": "no_match", "seats": request.seats, "solo_fare_idr": int(solo),
+                           "reason": "Belum ada penumpang searah; lanjutkan dengan ride solo"})
+    return json.dumps({"status": "waiting", "request_id": request.request_id, "seats": request.seats,
+                       "solo_fare_idr": int(solo), "expires_in_s": int(request.expires_at - request.created_at),
+                       "reason": "Menunggu penumpang searah; cek lagi dengan request_id, atau panggil "
+                                 "dengan wait=false untuk batal menunggu"})
+
+
+def _current_rider() -> str:
+    """user_id pemilik order run aktif (order_scope), atau "" di luar run."""
+    order_id = current_order_id()
+    if not order_id:
+        return ""
+    order = get_order_store().get(order_id)
+    return order.user_id if order is not None else ""
+
 # ==========================================
 # GUARDRAILS HITL - WALLET TOOLS
 # ==========================================
 
 @tool("Process Payment - Requires User Approval")
-def pay_wallet(amount: int, recipient: str, description: str) -> str:
+def pay_wallet(amount: int, recipient: str, description: str, order_id: str = "") -> str:
     """
     ⚠️ **TOOL INI MEMERLUKAN IZIN USER (HUMAN-IN-THE-LOOP)!**
     
@@ -128,22 +265,35 @@ def pay_wallet(amount: int, recipient: str, description: str) -> str:
         amount: Jumlah pembayaran dalam IDR
         recipient: ID merchant/driver penerima
         description: Deskripsi transaksi
+        order_id: ID pesanan yang dibayar (default: order run yang sedang berjalan)
     
     Returns:
-        JSON status pembayaran dengan transaction hash blockchain
+        JSON status pembayaran ("pending_approval" atau "rejected") dengan transaction hash blockchain
     
     Security:
-        - Requires human_input=True di Task level
+        - Tool hanya mencatat permintaan pembayaran; user menyetujuinya di akhir
+          proses (hoomi_main, main thread), baru setelah itu order ditandai paid
+        - Order lain selain order run aktif ditolak
         - Transaction recorded on Ethereum L2 BASE blockchain
         - Smart contract validation untuk escrow
     
     Example:
-        pay_wallet(50000, "MERCH001", "Pembayaran Nasi Goreng + Delivery")
+        pay_wallet(50000, "MERCH001", "Pembayaran Nasi Goreng + Delivery", "ORD1A2B3C4D5E")
     """
+    order_id = order_id.strip() or current_order_id() or ""
+    denied = check_order_access(order_id) if order_id else None
+    if denied:
+        return json.dumps({"status": "rejected", "error": denied})
+    
     # TODO: Integrasi Hoomi Wallet API
     # TODO: Smart contract execution di Ethereum L2 BASE
     # TODO: Implement escrow mechanism untuk buyer protection
-    return f'{{"status": "pending_approval", "transaction_id": "TXN{amount}ABC123", "amount_idr": {amount}, "recipient": "{recipient}", "description": "{description}", "wallet_balance": 500000, "requires_approval": true, "blockchain_network": "Ethereum L2 BASE", "gas_fee_idr": 100}}'
+    if order_id:
+        request_payment(order_id, int(amount), recipient, description)
+    return json.dumps({"status": "pending_approval", "transaction_id": f"TXN{int(amount)}ABC123",
+                       "amount_idr": int(amount), "recipient": recipient, "description": description,
+                       "order_id": order_id or None, "wallet_balance": 500000, "requires_approval": True,
+                       "blockchain_network": "Ethereum L2 BASE", "gas_fee_idr": 100})
 
 
 # ==========================================
@@ -176,27 +326,62 @@ def get_user_location() -> str:
 
 
 # ==========================================
-# ADDITIONAL MCP - IoT TOOLS (Bonus)
+# ADDITIONAL MCP - ORDER & TRACKING TOOLS
 # ==========================================
 
 @tool("Track Delivery Real-Time")
 def track_delivery(order_id: str) -> str:
     """
-    Tracking pengiriman secara real-time menggunakan GPS driver.
-    Menampilkan posisi driver, ETA update, dan status delivery.
+    Tracking pesanan dari order store Hoomi: status terkini, driver yang
+    ditugaskan, alamat pickup/tujuan, dan waktu update terakhir.
     
     Args:
         order_id: ID pesanan yang ingin ditrack
     
     Returns:
-        JSON dengan posisi real-time driver dan status pengiriman
+        JSON status order (found=false jika Order ID tidak dikenal)
     
     Example:
-        track_delivery("ORD123456")
+        track_delivery("ORD1A2B3C4D5E")
     """
-    # TODO: Integrasi dengan IoT device di kendaraan
+    order = get_order_store().get(order_id.strip())
+    if order is None:
+        return json.dumps({"order_id": order_id, "found": False,
+                           "error": "Order tidak ditemukan; gunakan Order ID dari detail pesanan"})
+    # TODO: Integrasi dengan IoT device di kendaraan (posisi & ETA real-time driver)
     # TODO: WebSocket streaming untuk real-time updates
-    return f'{{"order_id": "{order_id}", "status": "in_transit", "driver": {{"name": "Budi Santoso", "current_location": {{"lat": -6.1950, "lon": 106.8300}}, "heading": "north", "speed_kmh": 35}}, "eta_min": 12, "distance_remaining_km": 3.5, "last_update": "2024-01-15T10:32:45Z", "route_completion_percent": 65}}'
+    return json.dumps(dict(order.to_dict(), found=True))
+
+
+@tool("Assign Driver to Order")
+def assign_order_driver(order_id: str, driver_id: str) -> str:
+    """
+    Mencatat driver yang dipilih untuk order yang sedang diproses di order
+    store Hoomi (status order menjadi "assigned").
+    
+    Args:
+        order_id: ID pesanan dari detail pesanan (e.g., "ORD1A2B3C4D5E")
+        driver_id: ID driver hasil find_driver (e.g., "DRV123")
+    
+    Returns:
+        JSON order terbaru, atau error jika order tidak ada / bukan order
+        yang sedang diproses / sudah tidak bisa ditugaskan
+    
+    Example:
+        assign_order_driver("ORD1A2B3C4D5E", "DRV123")
+    """
+    order_id, driver_id = order_id.strip(), driver_id.strip()
+    denied = check_order_access(order_id)
+    if denied or not driver_id:
+        return json.dumps({"order_id": order_id, "assigned": False,
+                           "error": denied or "driver_id wajib diisi"})
+    try:
+        order = get_order_store().assign_driver(order_id, driver_id)
+    except KeyError:
+        return json.dumps({"order_id": order_id, "assigned": False, "error": "Order tidak ditemukan"})
+    except ValueError as e:
+        return json.dumps({"order_id": order_id, "assigned": False, "error": str(e)})
+    return json.dumps(dict(order.to_dict(), assigned=True))
 
 
 @tool("Send Notification to User")
@@ -218,4 +403,20 @@ def send_notification(user_id: str, message: str, notification_type: str = "info
     """
     # TODO: Integrasi dengan Firebase Cloud Messaging
     # TODO: Support untuk multi-channel (push, SMS, email)
-    return f'{{"user_id": "{user_id}", "message": "{message}", "type": "{notification_type}", "sent": true, "delivered": true, "timestamp": "2024-01-15T10:33:00Z"}}'
\ No newline at end of file
+    return f'{{"user_id": "{user_id}", "message": "{message}", "type": "{notification_type}", "sent": true, "delivered": true, "timestamp": "2024-01-15T10:33:00Z"}}'
+
+
+# ==========================================
+# INSTRUMENTASI
+# Semua tool melewati middleware hoomi_hooks (deadline, dsb)
+# ==========================================
+
+HOOMI_TOOLS = [
+    check_stock, search_product,
+    geocode_address, calculate_route, find_driver, plan_delivery_batch, find_ride_pool,
+    pay_wallet, get_user_location,
+    track_delivery, assign_order_driver, send_notification,
+]
+
+for _tool in HOOMI_TOOLS:
+    instrument_tool(_tool)
@@ -0,0 +1,385 @@
+"""
+Hoomi Tracing - Span Bertingkat untuk Run, Task, Tool, LLM, dan HITL
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+Menjawab pertanyaan "40 detik order ini habis di mana?": manager LLM,
+calculate_route milik Dispatch Agent, atau menunggu approval HITL.
+
+Struktur span per order:
+    run (skenario)
+    └── task (HoomiTasks)
+        ├── llm (agents / manager)  - durasi + token prompt/completion
+        ├── tool (hoomi_tools)      - durasi + argumen
+        └── hitl (human_input)      - waktu tunggu user
+
+Span dibuat dari dua sumber:
+1. Middleware hoomi_hooks untuk tool call & LLM call
+2. Event hoomi_events untuk run, task, dan HITL
+
+Setiap run diekspor ke file JSON kompatibel OTLP di .hoomi/traces/.
+
+Usage CLI:
+    python hoomi_tracing.py critical-path ../.hoomi/traces/<trace>.json
+    python hoomi_tracing.py summary ../.hoomi/traces/<trace>.json
+"""
+
+import argparse
+import contextvars
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+
+from hoomi_events import (
+    EVENTS, HITL_END, HITL_START, RUN_END, RUN_START, TASK_END, TASK_START, EventSink
+)
+from hoomi_hooks import LLM_CALL, TOOL, register_middleware
+
+DEFAULT_TRACE_DIR = os.getenv(
+    "HOOMI_TRACE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".hoomi", "traces")
+)
+
+SERVICE_NAME = "hoomi-orchestrator"
+
+_current_span = contextvars.ContextVar("hoomi_current_span", default=None)
+
+
+def estimate_tokens(text) -> int:
+    """
+    Estimasi jumlah token (~4 karakter per token).
+    
+    Dipakai jika usage asli dari provider tidak tersedia di hasil LLM call.
+    """
+    if not text:
+        return 0
+    return max(1, len(str(text)) // 4)
+
+
+def messages_text(messages) -> str:
+    """Gabungkan isi messages (list dict / string) menjadi satu teks."""
+    if isinstance(messages, str):
+        return messages
+    parts = []
+    for message in messages or []:
+        content = message.get("content") if isinstance(message, dict) else message
+        parts.append(content if isinstance(content, str) else json.dumps(content, default=str))
+    return "\n".join(parts)
+
+
+class Span():
+    """Satu span dengan waktu mulai/selesai (nanodetik) dan atribut."""
+    
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind",
+                 "start_ns", "end_ns", "attributes", "error")
+    
+    def __init__(self, name: str, kind: str, parent=None, attributes: dict = None):
+        self.trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes or {})
+        self.error = None
+    
+    @property
+    def duration_s(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e9
+    
+    def to_otlp(self) -> dict:
+        attributes = dict(self.attributes)
+        attributes["hoomi.kind"] = self.kind
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": [_otlp_attribute(k, v) for k, v in attributes.items() if v is not None],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class Tracer(EventSink):
+    """
+    Pengumpul span per trace + exporter OTLP JSON.
+    
+    Tracer adalah EventSink (run/task/HITL) sekaligus middleware
+    hoomi_hooks (tool/LLM).
+    """
+    
+    def __init__(self, trace_dir: str = DEFAULT_TRACE_DIR):
+        self.trace_dir = trace_dir
+        self._spans = {}
+        self._open = {}
+        self._lock = threading.Lock()
+        self.last_export = None
+    
+    def install(self, priority: int = 30):
+        """Pasang ke EVENTS dan hoomi_hooks. Returns: self."""
+        EVENTS.subscribe(self)
+        register_middleware(self.middleware, kinds=(TOOL, LLM_CALL), priority=priority)
+        return self
+    
+    # ==========================================
+    # SPAN API
+    # ==========================================
+    
+    def start_span(self, name: str, kind: str, attributes: dict = None, parent=None) -> Span:
+        parent = parent if parent is not None else _current_span.get()
+        span = Span(name, kind, parent, attributes)
+        with self._lock:
+            self._spans.setdefault(span.trace_id, []).append(span)
+        return span
+    
+    def end_span(self, span: Span, error: str = None):
+        span.end_ns = time.time_ns()
+        if error:
+            span.error = error
+    
+    def middleware(self, call, proceed):
+        """Span untuk setiap tool call & LLM call."""
+        if _current_span.get() is None:
+            return proceed()  # Di luar run yang di-trace
+        
+        attributes = {f"{call.kind}.name": call.name}
+        if call.kind == TOOL:
+            attributes["tool.args"] = _short_json(call.args, call.kwargs)
+        else:
+            attributes["llm.model"] = call.attrs.get("model")
+            messages = call.kwargs.get("messages", call.args[0] if call.args else None)
+            attributes["llm.prompt_tokens"] = estimate_tokens(messages_text(messages))
+        
+        span = self.start_span(call.name, call.kind, attributes)
+        reset_token = _current_span.set(span)
+        try:
+            result = proceed()
+        except Exception as e:
+            self.end_span(span, error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(reset_token)
+        
+        if call.kind == LLM_CALL:
+            span.attributes["llm.completion_tokens"] = estimate_tokens(result)
+            span.attributes["llm.tokens_estimated"] = True
+        self.end_span(span)
+        return result
+    
+    # ==========================================
+    # EVENT SINK: RUN, TASK, HITL
+    # ==========================================
+    
+    def on_event(self, event):
+        if event.type == RUN_START:
+            span = self.start_span(event.name or "run", "run",
+                                   {"run.id": event.run_id, "scenario": event.data.get("scenario")},
+                                   parent=None)
+            self._push(("run", event.run_id), span)
+        elif event.type == RUN_END:
+            span = self._pop(("run", event.run_id))
+            if span is not None:
+                span.attributes["run.status"] = event.data.get("status")
+                self.end_span(span, error="run failed" if event.data.get("status") == "error" else None)
+                self.last_export = self.export(span.trace_id)
+        elif event.type == TASK_START:
+            self._push(("task", event.run_id, event.name),
+                       self.start_span(event.name, "task", {"task.agent": event.data.get("agent")}))
+        elif event.type == TASK_END:
+            span = self._pop(("task", event.run_id, event.name))
+            if span is not None:
+                self.end_span(span, error=event.data.get("error"))
+        elif event.type == HITL_START:
+            self._push(("hitl", event.run_id), self.start_span("human_input", "hitl"))
+        elif event.type == HITL_END:
+            span = self._pop(("hitl", event.run_id))
+            if span is not None:
+                self.end_span(span)
+    
+    def _push(self, key, span: Span):
+        """Buka span dan jadikan parent untuk call berikutnya di context ini."""
+        with self._lock:
+            self._open[key] = (span, _current_span.get())
+        _current_span.set(span)
+    
+    def _pop(self, key):
+        with self._lock:
+            entry = self._open.pop(key, None)
+        if entry is None:
+            return None
+        span, previous = entry
+        _current_span.set(previous)
+        return span
+    
+    # ==========================================
+    # EXPORT
+    # ==========================================
+    
+    def export(self, trace_id: str) -> str:
+        """Tulis semua span trace ke file OTLP JSON. Returns: path file."""
+        with self._lock:
+            spans = self._spans.pop(trace_id, [])
+        
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{
+                    "scope": {"name": "hoomi_tracing"},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }]
+        }
+        
+        os.makedirs(self.trace_dir, exist_ok=True)
+        path = os.path.join(self.trace_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{trace_id[:8]}.json")
+        with open(path, "w") as f:
+            json.dump(payload, f, indent=1)
+        return path
+
+
+def _short_json(args, kwargs, limit: int = 200) -> str:
+    text = json.dumps({"args": list(args), "kwargs": kwargs}, default=str)
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+_tracer = None
+
+
+def install_tracing(trace_dir: str = DEFAULT_TRACE_DIR):
+    """Pasang tracer global (idempotent). Nonaktif jika HOOMI_TRACE=0."""
+    global _tracer
+    if os.getenv("HOOMI_TRACE", "1") != "1":
+        return None
+    if _tracer is None:
+        _tracer = Tracer(trace_dir).install()
+    return _tracer
+
+
+# ==========================================
+# ANALISIS: CRITICAL PATH
+# ==========================================
+
+def load_spans(path: str) -> list:
+    """Baca file OTLP JSON menjadi list dict span sederhana."""
+    with open(path) as f:
+        payload = json.load(f)
+    
+    spans = []
+    for resource in payload.get("resourceSpans", []):
+        for scope in resource.get("scopeSpans", []):
+            for raw in scope.get("spans", []):
+                attributes = {a["key"]: next(iter(a["value"].values())) for a in raw.get("attributes", [])}
+                spans.append({
+                    "id": raw["spanId"],
+                    "parent": raw.get("parentSpanId"),
+                    "name": raw["name"],
+                    "kind": attributes.get("hoomi.kind", ""),
+                    "start": int(raw["startTimeUnixNano"]),
+                    "end": int(raw["endTimeUnixNano"]),
+                    "attributes": attributes,
+                })
+    return spans
+
+
+def critical_path(spans: list) -> list:
+    """
+    Hitung critical path: rantai span yang menentukan durasi total run.
+    
+    Berjalan mundur dari akhir root span; di setiap level dipilih child
+    yang selesai paling akhir sebelum kursor, lalu kursor pindah ke awal
+    child tersebut. Waktu parent di luar child dihitung sebagai self time.
+    
+    Returns:
+        list[dict]: Segmen {name, kind, depth, self_ns, duration_ns}
+    """
+    children = {}
+    for span in spans:
+        children.setdefault(span["parent"], []).append(span)
+    roots = children.get(None, [])
+    if not roots:
+        return []
+    
+    root = max(roots, key=lambda s: s["end"] - s["start"])
+    segments = []
+    
+    def walk(span, depth):
+        cursor = span["end"]
+        on_path = []
+        for child in sorted(children.get(span["id"], []), key=lambda s: s["end"], reverse=True):
+            if child["end"] <= cursor and child["start"] >= span["start"]:
+                on_path.append(child)
+                cursor = child["start"]
+        child_time = sum(c["end"] - c["start"] for c in on_path)
+        segments.append({
+            "name": span["name"],
+            "kind": span["kind"],
+            "depth": depth,
+            "duration_ns": span["end"] - span["start"],
+            "self_ns": max(span["end"] - span["start"] - child_time, 0),
+        })
+        for child in reversed(on_path):
+            walk(child, depth + 1)
+    
+    walk(root, 0)
+    return segments
+
+
+def _print_critical_path(path: str):
+    segments = critical_path(load_spans(path))
+    if not segments:
+        print("Trace kosong.")
+        return
+    total = segments[0]["duration_ns"] or 1
+    print(f"CRITICAL PATH ({total / 1e9:.2f}s) - {os.path.basename(path)}")
+    print("-" * 72)
+    print(f"{'span':<40} {'kind':<6} {'durasi':>9} {'self':>9} {'%':>5}")
+    for seg in segments:
+        label = ("  " * seg["depth"] + seg["name"])[:40]
+        print(f"{label:<40} {seg['kind']:<6} {seg['duration_ns'] / 1e9:>8.2f}s "
+              f"{seg['self_ns'] / 1e9:>8.2f}s {seg['self_ns'] / total:>5.0%}")
+
+
+def _print_summary(path: str):
+    totals = {}
+    for span in load_spans(path):
+        key = (span["kind"], span["name"])
+        count, duration = totals.get(key, (0, 0))
+        totals[key] = (count + 1, duration + span["end"] - span["start"])
+    print(f"{'kind':<6} {'span':<40} {'count':>6} {'total':>9}")
+    for (kind, name), (count, duration) in sorted(totals.items(), key=lambda item: -item[1][1]):
+        print(f"{kind:<6} {name[:40]:<40} {count:>6} {duration / 1e9:>8.2f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analisis trace Hoomi (OTLP JSON)")
+    parser.add_argument("command", choices=["critical-path", "summary"])
+    parser.add_argument("trace_file", help="File trace di .hoomi/traces/")
+    args = parser.parse_args(argv)
+    
+    if args.command == "critical-path":
+        _print_critical_path(args.trace_file)
+    else:
+        _print_summary(args.trace_file)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
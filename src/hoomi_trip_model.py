@@ -0,0 +1,537 @@
+"""
+Hoomi Trip Model - Prediksi ETA & Harga Perjalanan (Vectorized)
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+calculate_route sebelumnya memakai konstanta linear (5000 + 2000/km,
+3 menit/km) di atas selisih lintang saja. Modul ini menyediakan model
+prediksi yang bisa diganti tanpa mengubah tool:
+
+1. Fitur - jarak haversine, jam (sin/cos + flag jam sibuk/malam), akhir
+   pekan, zona pickup & tujuan (centroid terdekat, one-hot)
+2. Model - linear (least squares) atau gradient-boosted trees, disimpan
+   sebagai JSON (HOOMI_TRIP_MODEL, default .hoomi/models/trip_model.json).
+   Tanpa file, dipakai baseline linear yang setara tarif lama
+3. Inferensi - predict_batch() vectorized NumPy untuk banyak trip sekaligus,
+   predict_one() jalur Python murni tanpa alokasi array (mikrodetik)
+4. Training - dari CSV histori trip:
+
+    python hoomi_trip_model.py train trips.csv --kind gbt
+    python hoomi_trip_model.py synth trips.csv --rows 20000   # data sintetis
+    python hoomi_trip_model.py bench
+
+Kolom CSV: pickup_lat, pickup_lon, dest_lat, dest_lon, pickup_time (ISO 8601)
+atau hour (+ weekday opsional), duration_min, price_idr. pickup_time dengan
+zona waktu (Z / +00:00) dikonversi ke Asia/Jakarta; tanpa zona dianggap WIB.
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+DEFAULT_MODEL_PATH = os.getenv(
+    "HOOMI_TRIP_MODEL",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".hoomi", "models", "trip_model.json")
+)
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Fitur jam/hari memakai waktu lokal Asia/Jakarta (WIB, UTC+7 tanpa DST)
+try:
+    from zoneinfo import ZoneInfo
+    LOCAL_TZ = ZoneInfo("Asia/Jakarta")
+except Exception:
+    LOCAL_TZ = timezone(timedelta(hours=7), "WIB")
+
+# Centroid zona (lat, lon); titik > ZONE_MAX_KM dari semua centroid = "luar"
+ZONES = (
+    ("pusat", -6.1800, 106.8300),
+    ("selatan", -6.2600, 106.8100),
+    ("utara", -6.1300, 106.8600),
+    ("barat", -6.1700, 106.7500),
+    ("timur", -6.2300, 106.9000),
+)
+ZONE_NAMES = tuple(name for name, _, _ in ZONES) + ("luar",)
+ZONE_MAX_KM = 12.0
+
+FEATURES = (
+    "distance_km", "distance_x_rush", "hour_sin", "hour_cos",
+    "rush_morning", "rush_evening", "night", "weekend",
+) + tuple(f"pickup_{z}" for z in ZONE_NAMES) + tuple(f"dest_{z}" for z in ZONE_NAMES)
+
+TARGETS = ("duration_min", "price_idr")
+
+_ZONE_LAT = np.array([lat for _, lat, _ in ZONES])
+_ZONE_LON = np.array([lon for _, _, lon in ZONES])
+_COS_JAKARTA = math.cos(math.radians(-6.2))
+
+
+# ==========================================
+# FITUR
+# ==========================================
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def haversine_km_batch(lat1, lon1, lat2, lon2) -> np.ndarray:
+    p1, p2 = np.radians(lat1), np.radians(lat2)
+    dp, dl = p2 - p1, np.radians(np.asarray(lon2) - np.asarray(lon1))
+    a = np.sin(dp / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def zone_of(lat: float, lon: float) -> int:
+    best, best_d2 = len(ZONES), (ZONE_MAX_KM / 111.32) ** 2
+    for i, (_, zlat, zlon) in enumerate(ZONES):
+        d2 = (lat - zlat) ** 2 + ((lon - zlon) * _COS_JAKARTA) ** 2
+        if d2 < best_d2:
+            best, best_d2 = i, d2
+    return best
+
+
+def zone_of_batch(lat, lon) -> np.ndarray:
+    d2 = ((np.asarray(lat)[:, None] - _ZONE_LAT) ** 2
+          + ((np.asarray(lon)[:, None] - _ZONE_LON) * _COS_JAKARTA) ** 2)
+    nearest = d2.argmin(axis=1)
+    outside = d2[np.arange(len(nearest)), nearest] > (ZONE_MAX_KM / 111.32) ** 2
+    return np.where(outside, len(ZONES), nearest)
+
+
+def features_one(pickup_lat: float, pickup_lon: float, dest_lat: float, dest_lon: float,
+                 hour: float, weekday: int = 0) -> list:
+    """Vektor fitur satu trip sebagai list Python (urutan = FEATURES)."""
+    distance = haversine_km(pickup_lat, pickup_lon, dest_lat, dest_lon)
+    rush_morning = 1.0 if 7 <= hour < 10 else 0.0
+    rush_evening = 1.0 if 16 <= hour < 20 else 0.0
+    angle = 2 * math.pi * hour / 24
+    row = [
+        distance, distance * (rush_morning + rush_evening), math.sin(angle), math.cos(angle),
+        rush_morning, rush_evening, 1.0 if hour >= 22 or hour < 5 else 0.0, 1.0 if weekday >= 5 else 0.0,
+    ]
+    zones = [0.0] * (2 * len(ZONE_NAMES))
+    zones[zone_of(pickup_lat, pickup_lon)] = 1.0
+    zones[len(ZONE_NAMES) + zone_of(dest_lat, dest_lon)] = 1.0
+    return row + zones
+
+
+def features_batch(pickup_lat, pickup_lon, dest_lat, dest_lon, hour, weekday=None) -> np.ndarray:
+    """Matriks fitur (n_trip x len(FEATURES)) vectorized."""
+    hour = np.asarray(hour, dtype=float)
+    n = hour.shape[0]
+    weekday = np.zeros(n) if weekday is None else np.asarray(weekday, dtype=float)
+    X = np.zeros((n, len(FEATURES)))
+    distance = haversine_km_batch(pickup_lat, pickup_lon, dest_lat, dest_lon)
+    rush_morning = ((hour >= 7) & (hour < 10)).astype(float)
+    rush_evening = ((hour >= 16) & (hour < 20)).astype(float)
+    angle = 2 * np.pi * hour / 24
+    X[:, 0] = distance
+    X[:, 1] = distance * (rush_morning + rush_evening)
+    X[:, 2] = np.sin(angle)
+    X[:, 3] = np.cos(angle)
+    X[:, 4] = rush_morning
+    X[:, 5] = rush_evening
+    X[:, 6] = ((hour >= 22) | (hour < 5)).astype(float)
+    X[:, 7] = (weekday >= 5).astype(float)
+    rows = np.arange(n)
+    X[rows, 8 + zone_of_batch(pickup_lat, pickup_lon)] = 1.0
+    X[rows, 8 + len(ZONE_NAMES) + zone_of_batch(dest_lat, dest_lon)] = 1.0
+    return X
+
+
+# ==========================================
+# MODEL
+# ==========================================
+
+class LinearTarget():
+    def __init__(self, intercept: float, weights: list):
+        self.intercept = float(intercept)
+        self.weights = [float(w) for w in weights]
+        self._w = np.array(self.weights)
+    
+    def predict_one(self, x: list) -> float:
+        return self.intercept + sum(w * v for w, v in zip(self.weights, x) if w)
+    
+    def predict_batch(self, X: np.ndarray) -> np.ndarray:
+        return self.intercept + X @ self._w
+    
+    def to_dict(self) -> dict:
+        return {"intercept": self.intercept, "weights": self.weights}
+
+
+class TreeEnsembleTarget():
+    """
+    Gradient-boosted regression trees.
+    
+    Tree disimpan sebagai array node (feature, threshold, left, right, value);
+    feature = -1 menandai leaf. Saat load, setiap tree dikompilasi menjadi
+    pohon biner lengkap sedalam `depth` (layout heap, anak = 2i+1 / 2i+2;
+    leaf dangkal diteruskan dengan threshold +inf) sehingga inferensi batch
+    cukup `depth` langkah tanpa cabang, serentak untuk semua tree. Jalur
+    single-trip memakai ekspresi Python hasil kompilasi tree (_codegen).
+    """
+    
+    BATCH_CHUNK = 1024
+    
+    def __init__(self, base: float, learning_rate: float, trees: list):
+        self.base = float(base)
+        self.learning_rate = float(learning_rate)
+        self.trees = trees
+        self._compile()
+    
+    def _compile(self):
+        self.depth = max((_tree_depth(t) for t in self.trees), default=0)
+        inner, leaves = 2 ** self.depth - 1, 2 ** self.depth
+        feature = [[0] * inner for _ in self.trees]
+        threshold = [[math.inf] * inner for _ in self.trees]
+        value = [[0.0] * leaves for _ in self.trees]
+        
+        def fill(t, tree, node, pos, level):
+            if level == self.depth:
+                value[t][pos - inner] = tree["value"][node]
+                return
+            if tree["feature"][node] >= 0:
+                feature[t][pos] = tree["feature"][node]
+                threshold[t][pos] = tree["threshold"][node]
+                fill(t, tree, tree["left"][node], 2 * pos + 1, level + 1)
+                fill(t, tree, tree["right"][node], 2 * pos + 2, level + 1)
+            else:
+                fill(t, tree, node, 2 * pos + 1, level + 1)
+                fill(t, tree, node, 2 * pos + 2, level + 1)
+        
+        for t, tree in enumerate(self.trees):
+            fill(t, tree, 0, 0, 0)
+        # Array flat (tree * node) untuk inferensi batch
+        self._feature = np.array(feature, dtype=np.int64).ravel()
+        self._threshold = np.array(threshold, dtype=float).ravel()
+        self._value = np.array(value, dtype=float).ravel()
+        self._tree_offset = (np.arange(len(self.trees)) * inner)[:, None]
+        self._leaf_offset = (np.arange(len(self.trees)) * leaves - inner)[:, None]
+        # Jalur single-trip: tree dikompilasi jadi satu ekspresi Python (tanpa NumPy)
+        self._predict_one = _codegen(self.trees)
+    
+    def predict_one(self, x: list) -> float:
+        return self.base + self.learning_rate * self._predict_one(x)
+    
+    def predict_batch(self, X: np.ndarray) -> np.ndarray:
+        out = np.full(X.shape[0], self.base)
+        if not self.trees:
+            return out
+        for start in range(0, X.shape[0], self.BATCH_CHUNK):
+            chunk = X[start:start + self.BATCH_CHUNK]
+            m = chunk.shape[0]
+            # Gather flat (feature * m + baris) jauh lebih murah dari fancy indexing 2D
+            columns = np.ascontiguousarray(chunk.T).ravel()
+            cols = np.arange(m)[None, :]
+            node = np.zeros((len(self.trees), m), dtype=np.int64)
+            for _ in range(self.depth):
+                flat = self._tree_offset + node
+                right = columns[self._feature[flat] * m + cols] > self._threshold[flat]
+                node = 2 * node + 1
+                node += right
+            leaf_sum = self._value[self._leaf_offset + node].sum(axis=0)
+            out[start:start + m] += self.learning_rate * leaf_sum
+        return out
+    
+    def to_dict(self) -> dict:
+        return {"base": self.base, "learning_rate": self.learning_rate, "trees": self.trees}
+
+
+def _codegen(trees: list):
+    """Kompilasi trees menjadi fungsi x -> jumlah nilai leaf (ekspresi kondisional bersarang)."""
+    def expression(tree, node):
+        if tree["feature"][node] < 0:
+            return repr(float(tree["value"][node]))
+        return (f"({expression(tree, tree['left'][node])} "
+                f"if x[{int(tree['feature'][node])}] <= {float(tree['threshold'][node])!r} "
+                f"else {expression(tree, tree['right'][node])})")
+    
+    body = " + ".join(expression(tree, 0) for tree in trees) or "0.0"
+    namespace = {}
+    exec(compile(f"def predict(x):\n    return {body}\n", "<hoomi_trip_model>", "exec"), namespace)
+    return namespace["predict"]
+
+
+def _tree_depth(tree: dict, node: int = 0) -> int:
+    if tree["feature"][node] < 0:
+        return 0
+    return 1 + max(_tree_depth(tree, tree["left"][node]), _tree_depth(tree, tree["right"][node]))
+
+
+class TripModel():
+    """
+    Model ETA (menit) dan harga (IDR) per trip.
+    
+    Args:
+        kind: "linear" atau "gbt"
+        targets: {"duration_min": target, "price_idr": target}
+        name: Label model (muncul di output calculate_route)
+        metrics: Metrik evaluasi saat training (MAE holdout)
+    """
+    
+    def __init__(self, kind: str, targets: dict, name: str = None, metrics: dict = None):
+        self.kind = kind
+        self.targets = targets
+        self.name = name or kind
+        self.metrics = metrics or {}
+        self._eta = targets["duration_min"]
+        self._price = targets["price_idr"]
+    
+    @classmethod
+    def baseline(cls):
+        """Setara tarif lama: 3 menit/km, Rp5.000 + Rp2.000/km."""
+        zeros = [0.0] * (len(FEATURES) - 1)
+        return cls("linear", {
+            "duration_min": LinearTarget(0.0, [3.0] + zeros),
+            "price_idr": LinearTarget(5000.0, [2000.0] + zeros),
+        }, name="baseline")
+    
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if list(data.get("features", FEATURES)) != list(FEATURES):
+            raise ValueError(f"Fitur model {path} tidak cocok dengan versi kode ini")
+        target_cls = LinearTarget if data["kind"] == "linear" else TreeEnsembleTarget
+        targets = {name: target_cls(**spec) for name, spec in data["targets"].items()}
+        return cls(data["kind"], targets, name=data.get("name"), metrics=data.get("metrics"))
+    
+    def save(self, path: str = DEFAULT_MODEL_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": 1, "kind": self.kind, "name": self.name, "features": list(FEATURES),
+                "metrics": self.metrics,
+                "targets": {name: target.to_dict() for name, target in self.targets.items()},
+            }, f)
+    
+    def predict_one(self, pickup_lat: float, pickup_lon: float, dest_lat: float, dest_lon: float,
+                    when: datetime = None) -> tuple:
+        """(distance_km, duration_min, price_idr) untuk satu trip."""
+        when = _local_time(when or datetime.now(LOCAL_TZ))
+        x = features_one(pickup_lat, pickup_lon, dest_lat, dest_lon,
+                         when.hour + when.minute / 60, when.weekday())
+        return x[0], max(self._eta.predict_one(x), 1.0), max(self._price.predict_one(x), 0.0)
+    
+    def predict_batch(self, pickup_lat, pickup_lon, dest_lat, dest_lon, hour, weekday=None) -> tuple:
+        """(distance_km, duration_min, price_idr) sebagai array untuk banyak trip sekaligus."""
+        X = features_batch(pickup_lat, pickup_lon, dest_lat, dest_lon, hour, weekday)
+        return (X[:, 0], np.maximum(self._eta.predict_batch(X), 1.0),
+                np.maximum(self._price.predict_batch(X), 0.0))
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_trip_model() -> TripModel:
+    """Model bersama per proses; baseline jika file model belum ada."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = TripModel.load(DEFAULT_MODEL_PATH) if os.path.exists(DEFAULT_MODEL_PATH) else TripModel.baseline()
+        return _model
+
+
+# ==========================================
+# TRAINING
+# ==========================================
+
+def _local_time(when: datetime) -> datetime:
+    """Waktu aware dikonversi ke Asia/Jakarta; naive dianggap sudah waktu lokal."""
+    return when.astimezone(LOCAL_TZ) if when.tzinfo is not None else when
+
+
+def load_trips(path: str) -> dict:
+    columns = {name: [] for name in ("pickup_lat", "pickup_lon", "dest_lat", "dest_lon",
+                                     "hour", "weekday", "duration_min", "price_idr")}
+    with open(path, encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if row.get("pickup_time"):
+                when = _local_time(datetime.fromisoformat(row["pickup_time"].replace("Z", "+00:00")))
+                hour, weekday = when.hour + when.minute / 60, when.weekday()
+            else:
+                hour, weekday = float(row["hour"]), int(row.get("weekday") or 0)
+            for name in ("pickup_lat", "pickup_lon", "dest_lat", "dest_lon", "duration_min", "price_idr"):
+                columns[name].append(float(row[name]))
+            columns["hour"].append(hour)
+            columns["weekday"].append(weekday)
+    return {name: np.array(values) for name, values in columns.items()}
+
+
+def fit_linear(X: np.ndarray, y: np.ndarray, ridge: float = 1e-3) -> LinearTarget:
+    A = np.hstack([np.ones((X.shape[0], 1)), X])
+    coef = np.linalg.solve(A.T @ A + ridge * np.eye(A.shape[1]), A.T @ y)
+    return LinearTarget(coef[0], coef[1:].tolist())
+
+
+def fit_gbt(X: np.ndarray, y: np.ndarray, n_trees: int = 100, max_depth: int = 4,
+            learning_rate: float = 0.1, min_leaf: int = 20, n_bins: int = 32) -> TreeEnsembleTarget:
+    """Gradient boosting (squared loss) dengan split histogram per fitur."""
+    edges = [np.unique(np.quantile(X[:, f], np.linspace(0, 1, n_bins + 1)[1:-1])) for f in range(X.shape[1])]
+    binned = np.stack([np.searchsorted(edges[f], X[:, f], side="left") for f in range(X.shape[1])], axis=1)
+    base = float(y.mean())
+    prediction = np.full(y.shape[0], base)
+    trees = []
+    for _ in range(n_trees):
+        residual = y - prediction
+        tree = {"feature": [], "threshold": [], "left": [], "right": [], "value": []}
+        _grow(tree, np.arange(y.shape[0]), residual, binned, edges, 0, max_depth, min_leaf)
+        trees.append(tree)
+        prediction += learning_rate * TreeEnsembleTarget(0.0, 1.0, [tree]).predict_batch(X)
+    return TreeEnsembleTarget(base, learning_rate, trees)
+
+
+def _grow(tree: dict, idx: np.ndarray, residual: np.ndarray, binned: np.ndarray, edges: list,
+          depth: int, max_depth: int, min_leaf: int) -> int:
+    node = len(tree["feature"])
+    for key in ("feature", "left", "right"):
+        tree[key].append(-1)
+    tree["threshold"].append(0.0)
+    tree["value"].append(float(residual[idx].mean()))
+    if depth >= max_depth or len(idx) < 2 * min_leaf:
+        return node
+    
+    r = residual[idx]
+    total_sum, total_n = r.sum(), len(idx)
+    best = (0.0, None, None)
+    for f, feature_edges in enumerate(edges):
+        if not len(feature_edges):
+            continue
+        bins = binned[idx, f]
+        counts = np.bincount(bins, minlength=len(feature_edges) + 1)[:-1].cumsum()
+        sums = np.bincount(bins, weights=r, minlength=len(feature_edges) + 1)[:-1].cumsum()
+        valid = (counts >= min_leaf) & (total_n - counts >= min_leaf)
+        if not valid.any():
+            continue
+        gain = np.where(valid, sums ** 2 / np.maximum(counts, 1)
+                        + (total_sum - sums) ** 2 / np.maximum(total_n - counts, 1), -np.inf)
+        b = int(gain.argmax())
+        if gain[b] - total_sum ** 2 / total_n > best[0]:
+            best = (gain[b] - total_sum ** 2 / total_n, f, b)
+    
+    _, f, b = best
+    if f is None:
+        return node
+    go_left = binned[idx, f] <= b
+    tree["feature"][node] = f
+    tree["threshold"][node] = float(edges[f][b])
+    tree["left"][node] = _grow(tree, idx[go_left], residual, binned, edges, depth + 1, max_depth, min_leaf)
+    tree["right"][node] = _grow(tree, idx[~go_left], residual, binned, edges, depth + 1, max_depth, min_leaf)
+    return node
+
+
+def train(trips: dict, kind: str = "gbt", holdout: float = 0.2, seed: int = 7, **gbt_params) -> TripModel:
+    X = features_batch(trips["pickup_lat"], trips["pickup_lon"], trips["dest_lat"], trips["dest_lon"],
+                       trips["hour"], trips["weekday"])
+    order = np.random.default_rng(seed).permutation(X.shape[0])
+    cut = int(len(order) * (1 - holdout))
+    fit_idx, test_idx = order[:cut], order[cut:]
+    
+    targets, metrics = {}, {"rows": int(X.shape[0])}
+    for name in TARGETS:
+        y = trips[name]
+        if kind == "linear":
+            targets[name] = fit_linear(X[fit_idx], y[fit_idx])
+        else:
+            targets[name] = fit_gbt(X[fit_idx], y[fit_idx], **gbt_params)
+        if len(test_idx):
+            metrics[f"{name}_mae"] = float(np.abs(targets[name].predict_batch(X[test_idx]) - y[test_idx]).mean())
+    return TripModel(kind, targets, name=f"{kind}-{time.strftime('%Y%m%d')}", metrics=metrics)
+
+
+def synth_trips(rows: int, seed: int = 7) -> dict:
+    """Trip sintetis Jakarta (kecepatan turun di jam sibuk, surge harga)."""
+    rng = np.random.default_rng(seed)
+    trips = {
+        "pickup_lat": rng.uniform(-6.35, -6.10, rows), "pickup_lon": rng.uniform(106.70, 106.95, rows),
+        "dest_lat": rng.uniform(-6.35, -6.10, rows), "dest_lon": rng.uniform(106.70, 106.95, rows),
+        "hour": rng.uniform(0, 24, rows), "weekday": rng.integers(0, 7, rows),
+    }
+    distance = haversine_km_batch(trips["pickup_lat"], trips["pickup_lon"], trips["dest_lat"], trips["dest_lon"])
+    hour = trips["hour"]
+    rush = ((hour >= 7) & (hour < 10)) | ((hour >= 16) & (hour < 20))
+    night = (hour >= 22) | (hour < 5)
+    speed_kmh = np.where(rush, 14.0, np.where(night, 32.0, 22.0)) * rng.lognormal(0, 0.15, rows)
+    road_km = distance * 1.35
+    trips["duration_min"] = 2 + road_km / speed_kmh * 60
+    trips["price_idr"] = (5000 + 2000 * road_km) * np.where(rush, 1.25, 1.0) + rng.normal(0, 500, rows)
+    return trips
+
+
+# ==========================================
+# CLI
+# ==========================================
+
+def _bench(model: TripModel, n: int = 100_000):
+    pickup = (-6.2088, 106.8456)
+    dest = (-6.1751, 106.8650)
+    when = datetime(2024, 1, 15, 8, 30)
+    repeat = 20_000
+    start = time.perf_counter()
+    for _ in range(repeat):
+        model.predict_one(pickup[0], pickup[1], dest[0], dest[1], when)
+    single_us = (time.perf_counter() - start) / repeat * 1e6
+    
+    trips = synth_trips(n)
+    start = time.perf_counter()
+    model.predict_batch(trips["pickup_lat"], trips["pickup_lon"], trips["dest_lat"], trips["dest_lon"],
+                        trips["hour"], trips["weekday"])
+    batch_s = time.perf_counter() - start
+    print(f"⏱️ Model {model.name} ({model.kind})")
+    print(f"   single trip : {single_us:.1f} µs/trip")
+    print(f"   batch {n:,}: {batch_s * 1000:.1f} ms ({batch_s / n * 1e6:.2f} µs/trip)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Training & benchmark model ETA/harga trip Hoomi")
+    parser.add_argument("command", choices=["train", "synth", "bench"])
+    parser.add_argument("csv", nargs="?", help="CSV histori trip (train) / output (synth)")
+    parser.add_argument("--kind", choices=["linear", "gbt"], default="gbt")
+    parser.add_argument("--out", default=DEFAULT_MODEL_PATH, help="Path file model")
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=20000, help="Jumlah trip sintetis")
+    args = parser.parse_args(argv)
+    
+    if args.command == "synth":
+        if not args.csv:
+            parser.error("synth membutuhkan path CSV output")
+        trips = synth_trips(args.rows)
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(list(trips))
+            writer.writerows(zip(*trips.values()))
+        print(f"📝 {args.rows:,} trip sintetis -> {args.csv}")
+        return
+    
+    if args.command == "bench":
+        _bench(TripModel.load(args.out) if os.path.exists(args.out) else TripModel.baseline())
+        return
+    
+    if not args.csv:
+        parser.error("train membutuhkan path CSV histori trip")
+    trips = load_trips(args.csv)
+    params = {"n_trees": args.trees, "max_depth": args.depth} if args.kind == "gbt" else {}
+    start = time.perf_counter()
+    model = train(trips, args.kind, **params)
+    model.save(args.out)
+    print(f"✅ Model {model.name} dilatih dari {model.metrics['rows']:,} trip "
+          f"dalam {time.perf_counter() - start:.1f}s -> {args.out}")
+    for name in TARGETS:
+        if f"{name}_mae" in model.metrics:
+            print(f"   MAE {name}: {model.metrics[f'{name}_mae']:,.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
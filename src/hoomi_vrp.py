@@ -0,0 +1,335 @@
+"""
+Hoomi VRP - Batching Pengiriman Multi-Stop (Capacitated VRP + Time Window)
+Sesuai TOR Hiliriset AI Agent Social Commerce dan Ride Fleet
+
+package_delivery_task dan delivery_setup_task memperlakukan setiap order
+sebagai trip sendiri. Jika beberapa order keluar dari area merchant yang
+sama dalam selisih menit, satu driver bisa membawa semuanya. Modul ini
+menyelesaikan pickup & delivery VRP dengan kapasitas dan time window:
+
+1. Model - setiap order punya titik pickup dan dropoff (pickup harus lebih
+   dulu, di kendaraan yang sama), ukuran, waktu siap, dan batas waktu antar;
+   setiap kendaraan punya posisi awal, kapasitas, dan waktu tersedia
+2. Waktu tempuh - matriks haversine x faktor jalan / kecepatan rata-rata,
+   dihitung sekali per solve (vectorized)
+3. Konstruksi - cheapest insertion berurut deadline; order dibuka di
+   kendaraan baru hanya jika lebih murah dari disisipkan ke rute yang ada
+   (biaya tetap per kendaraan = HOOMI_VRP_VEHICLE_COST_MIN)
+4. Local search - relocate order antar rute sampai tidak ada perbaikan atau
+   batas waktu habis; rute yang kosong otomatis dilepas
+
+Hasil dipakai Dispatch Agent lewat tool plan_delivery_batch.
+"""
+
+import math
+import os
+import time
+
+from hoomi_trip_model import haversine_km_batch
+
+ROAD_FACTOR = 1.35
+SPEED_KMH = float(os.getenv("HOOMI_VRP_SPEED_KMH", 22))
+VEHICLE_COST_MIN = float(os.getenv("HOOMI_VRP_VEHICLE_COST_MIN", 15))
+DEFAULT_CAPACITY = int(os.getenv("HOOMI_VRP_CAPACITY", 4))
+DEFAULT_DUE_MIN = float(os.getenv("HOOMI_VRP_DUE_MIN", 60))
+
+
+class VRPOrder():
+    """Satu order: pickup (lat, lon) -> dropoff (lat, lon), waktu dalam menit dari sekarang."""
+    
+    def __init__(self, order_id: str, pickup: tuple, dropoff: tuple, size: int = 1,
+                 ready_min: float = 0.0, due_min: float = None, service_min: float = 2.0):
+        self.order_id = order_id
+        self.pickup = pickup
+        self.dropoff = dropoff
+        self.size = size
+        self.ready_min = ready_min
+        self.due_min = due_min
+        self.service_min = service_min
+
+
+class VRPVehicle():
+    def __init__(self, vehicle_id: str, start: tuple, capacity: int = DEFAULT_CAPACITY,
+                 available_min: float = 0.0):
+        self.vehicle_id = vehicle_id
+        self.start = start
+        self.capacity = capacity
+        self.available_min = available_min
+
+
+class VRPSolution():
+    def __init__(self, solver, routes: dict, unassigned: list, solve_s: float, iterations: int):
+        self.solver = solver
+        self.routes = routes
+        self.unassigned = unassigned
+        self.solve_s = solve_s
+        self.iterations = iterations
+    
+    @property
+    def vehicles_used(self) -> int:
+        return sum(1 for stops in self.routes.values() if stops)
+    
+    def to_dict(self) -> dict:
+        s = self.solver
+        routes, total_min = [], 0.0
+        for v, stops in self.routes.items():
+            if not stops:
+                continue
+            schedule = s.schedule(v, stops)
+            travel = s.route_travel(v, stops)
+            total_min += travel
+            routes.append({
+                "driver_id": s.vehicles[v].vehicle_id,
+                "orders": sorted({s.orders[i].order_id for i, _ in stops}),
+                "distance_km": round(s.minutes_to_km(travel), 2),
+                "duration_min": round(schedule[-1]["eta_min"] - s.vehicles[v].available_min, 1),
+                "stops": schedule,
+            })
+        unassigned = set(self.unassigned)
+        solo_min = sum(s.solo_travel(i) for i in range(len(s.orders)) if i not in unassigned)
+        return {
+            "routes": routes,
+            "unassigned": [s.orders[i].order_id for i in self.unassigned],
+            "stats": {
+                "orders": len(s.orders),
+                "vehicles_used": self.vehicles_used,
+                "total_km": round(s.minutes_to_km(total_min), 2),
+                "solo_km": round(s.minutes_to_km(solo_min), 2),
+                "savings_pct": round(100 * (1 - total_min / solo_min), 1) if solo_min else 0.0,
+                "solve_ms": round(self.solve_s * 1000, 2),
+                "local_search_iterations": self.iterations,
+            },
+        }
+
+
+class VRPSolver():
+    """
+    Solver pickup & delivery VRP dengan kapasitas dan time window.
+    
+    Node matriks: 0..V-1 posisi awal kendaraan, V + 2i pickup order i,
+    V + 2i + 1 dropoff order i. Stop rute berupa (index_order, is_pickup).
+    
+    Args:
+        orders: List VRPOrder
+        vehicles: List VRPVehicle
+        speed_kmh: Kecepatan rata-rata untuk waktu tempuh
+        vehicle_cost_min: Biaya tetap (menit setara) setiap kendaraan dipakai
+        max_route_min: Durasi maksimum satu rute
+    """
+    
+    def __init__(self, orders: list, vehicles: list, speed_kmh: float = SPEED_KMH,
+                 vehicle_cost_min: float = VEHICLE_COST_MIN, max_route_min: float = 180.0):
+        self.orders = orders
+        self.vehicles = vehicles
+        self.speed_kmh = speed_kmh
+        self.vehicle_cost_min = vehicle_cost_min
+        self.max_route_min = max_route_min
+        self._v = len(vehicles)
+        self._t = self._travel_matrix()
+    
+    def _travel_matrix(self) -> list:
+        points = [v.start for v in self.vehicles]
+        for order in self.orders:
+            points += [order.pickup, order.dropoff]
+        if not points:
+            return []
+        lat = [p[0] for p in points]
+        lon = [p[1] for p in points]
+        km = haversine_km_batch([[x] for x in lat], [[x] for x in lon], [lat], [lon])
+        return (km * ROAD_FACTOR / self.speed_kmh * 60).tolist()
+    
+    def minutes_to_km(self, minutes: float) -> float:
+        return minutes * self.speed_kmh / 60 / ROAD_FACTOR
+    
+    def _node(self, order: int, is_pickup: bool) -> int:
+        return self._v + 2 * order + (0 if is_pickup else 1)
+    
+    # ==========================================
+    # EVALUASI RUTE
+    # ==========================================
+    
+    def route_travel(self, v: int, stops: list) -> float:
+        t, prev, total = self._t, v, 0.0
+        for order, is_pickup in stops:
+            node = self._node(order, is_pickup)
+            total += t[prev][node]
+            prev = node
+        return total
+    
+    def feasible(self, v: int, stops: list) -> bool:
+        vehicle, t = self.vehicles[v], self._t
+        clock, load, prev = vehicle.available_min, 0, v
+        for order_index, is_pickup in stops:
+            order = self.orders[order_index]
+            node = self._node(order_index, is_pickup)
+            clock += t[prev][node]
+            if is_pickup:
+                clock = max(clock, order.ready_min)
+                load += order.size
+                if load > vehicle.capacity:
+                    return False
+            else:
+                load -= order.size
+                if order.due_min is not None and clock > order.due_min:
+                    return False
+            clock += order.service_min
+            prev = node
+        return clock - vehicle.available_min <= self.max_route_min
+    
+    def schedule(self, v: int, stops: list) -> list:
+        vehicle, t = self.vehicles[v], self._t
+        clock, load, prev, out = vehicle.available_min, 0, v, []
+        for order_index, is_pickup in stops:
+            order = self.orders[order_index]
+            node = self._node(order_index, is_pickup)
+            clock += t[prev][node]
+            if is_pickup:
+                clock = max(clock, order.ready_min)
+            load += order.size if is_pickup else -order.size
+            lat, lon = order.pickup if is_pickup else order.dropoff
+            out.append({"order_id": order.order_id, "type": "pickup" if is_pickup else "dropoff",
+                        "lat": lat, "lon": lon, "eta_min": round(clock, 1), "load": load})
+            clock += order.service_min
+            prev = node
+        return out
+    
+    def solo_travel(self, order: int) -> float:
+        """Waktu tempuh jika order diantar sendiri oleh kendaraan terdekat."""
+        pickup, dropoff = self._node(order, True), self._node(order, False)
+        nearest = min((self._t[v][pickup] for v in range(self._v)), default=0.0)
+        return nearest + self._t[pickup][dropoff]
+    
+    # ==========================================
+    # INSERTION
+    # ==========================================
+    
+    def best_insertion(self, v: int, stops: list, order: int, limit: float = math.inf):
+        """(delta, stops_baru) termurah untuk menyisipkan order ke rute v, atau (inf, None)."""
+        t = self._t
+        P, D = self._node(order, True), self._node(order, False)
+        seq = [v] + [self._node(o, p) for o, p in stops]
+        m = len(stops)
+        best, best_stops = limit, None
+        for i in range(m + 1):
+            a = seq[i]
+            b = seq[i + 1] if i < m else None
+            add_p = t[a][P] + (t[P][b] - t[a][b] if b is not None else 0.0)
+            if add_p >= best:
+                continue
+            for j in range(i, m + 1):
+                if j == i:
+                    delta = t[a][P] + t[P][D] + (t[D][b] - t[a][b] if b is not None else 0.0)
+                else:
+                    c = seq[j]
+                    d = seq[j + 1] if j < m else None
+                    delta = add_p + t[c][D] + (t[D][d] - t[c][d] if d is not None else 0.0)
+                if delta >= best:
+                    continue
+                candidate = stops[:i] + [(order, True)] + stops[i:j] + [(order, False)] + stops[j:]
+                if self.feasible(v, candidate):
+                    best, best_stops = delta, candidate
+        return best, best_stops
+    
+    def _best_move(self, routes: dict, order: int, candidates, limit: float, allow_new: bool):
+        best, best_v, best_stops = limit, None, None
+        for v in candidates:
+            delta, candidate = self.best_insertion(v, routes[v], order, best)
+            if candidate is not None:
+                best, best_v, best_stops = delta, v, candidate
+        if allow_new:
+            for v, stops in routes.items():
+                if stops:
+                    continue
+                delta, candidate = self.best_insertion(v, [], order, best - self.vehicle_cost_min)
+                if candidate is not None:
+                    best, best_v, best_stops = delta + self.vehicle_cost_min, v, candidate
+        return best_v, best_stops
+    
+    def _neighbors(self, k: int) -> list:
+        """k order dengan pickup terdekat untuk setiap order (granular neighborhood)."""
+        n = len(self.orders)
+        if n <= k + 1:
+            return [[o for o in range(n) if o != i] for i in range(n)]
+        pickups = [self._node(i, True) for i in range(n)]
+        out = []
+        for i in range(n):
+            row = self._t[pickups[i]]
+            out.append(sorted((o for o in range(n) if o != i), key=lambda o: row[pickups[o]])[:k])
+        return out
+    
+    # ==========================================
+    # SOLVE
+    # ==========================================
+    
+    def solve(self, time_limit_s: float = 1.0, neighbors: int = None) -> VRPSolution:
+        """
+        Konstruksi cheapest insertion + local search relocate.
+        
+        Insertion dan relocate hanya mencoba rute milik `neighbors` order
+        dengan pickup terdekat (HOOMI_VRP_NEIGHBORS, default 12), sehingga
+        biaya per langkah tidak tumbuh dengan jumlah rute.
+        """
+        started = time.perf_counter()
+        deadline = started + time_limit_s
+        if neighbors is None:
+            neighbors = int(os.getenv("HOOMI_VRP_NEIGHBORS", 12))
+        near = self._neighbors(neighbors)
+        routes = {v: [] for v in range(self._v)}
+        owner, unassigned = {}, []
+        
+        # Konstruksi: deadline paling awal lebih dulu
+        order_seq = sorted(range(len(self.orders)), key=lambda i: (
+            self.orders[i].due_min if self.orders[i].due_min is not None else math.inf, self.orders[i].ready_min))
+        for order in order_seq:
+            candidates = {owner[o] for o in near[order] if o in owner}
+            v, stops = self._best_move(routes, order, candidates, math.inf, allow_new=True)
+            if v is None:
+                unassigned.append(order)
+                continue
+            routes[v] = stops
+            owner[order] = v
+        
+        # Local search: relocate order bila total biaya turun
+        iterations, improved = 0, True
+        while improved and time.perf_counter() < deadline:
+            improved = False
+            for order in list(owner):
+                if time.perf_counter() >= deadline:
+                    break
+                iterations += 1
+                v = owner[order]
+                stops = routes[v]
+                remaining = [s for s in stops if s[0] != order]
+                saving = self.route_travel(v, stops) - self.route_travel(v, remaining)
+                if not remaining:
+                    saving += self.vehicle_cost_min
+                
+                routes[v] = remaining
+                candidates = {owner[o] for o in near[order] if o in owner and routes[owner[o]]}
+                best_v, best_stops = self._best_move(routes, order, candidates, saving - 1e-6, allow_new=False)
+                if best_v is None or (best_v == v and best_stops == stops):
+                    routes[v] = stops
+                    continue
+                routes[best_v] = best_stops
+                owner[order] = best_v
+                improved = True
+        
+        return VRPSolution(self, routes, unassigned, time.perf_counter() - started, iterations)
+
+
+def default_fleet(orders: list, capacity: int = DEFAULT_CAPACITY) -> list:
+    """Armada default: satu kendaraan per dua order, mulai di pickup order yang tersebar."""
+    count = max(1, math.ceil(len(orders) / 2))
+    step = max(1, len(orders) // count)
+    return [VRPVehicle(f"DRV{n + 1:03d}", orders[min(n * step, len(orders) - 1)].pickup, capacity)
+            for n in range(count)]
+
+
+def plan_batch(orders: list, vehicles: list = None, time_limit_s: float = None) -> dict:
+    """Rencanakan rute multi-stop untuk order pending; hasil siap di-serialize ke JSON."""
+    if not orders:
+        return {"routes": [], "unassigned": [], "stats": {"orders": 0, "vehicles_used": 0}}
+    if time_limit_s is None:
+        time_limit_s = float(os.getenv("HOOMI_VRP_TIME_LIMIT_S", 0.5))
+    solver = VRPSolver(orders, vehicles or default_fleet(orders))
+    return solver.solve(time_limit_s).to_dict()
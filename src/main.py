@@ -1,49 +1,102 @@
+import sys
+import threading
 from dotenv import load_dotenv
-from crewai import Crew
-from task import MeetingPrepTasks
-from agents import MeetingPrepAgents
 
-def main():
-        load_dotenv()
+def warm_up():
+        # Import crewai (and litellm/langchain behind it) while the user is typing
+        threading.Thread(target=_import_crew_modules, daemon=True, name="meeting-prep-warmup").start()
 
-        print("## Welcome to the Meeting Prep Crew")
-        print('-------------------------------')
-        meeting_participants = input("What are the emails for the participants (other than you) in the meet")
-        meeting_context = input("What is the context of the meeting?\n")
-        meeting_objective = input("What is your objective for this meeting?\n")
+def _import_crew_modules():
+        try:
+                import crewai  # noqa: F401
+                import task  # noqa: F401
+                import agents  # noqa: F401
+        except Exception:
+                pass
+
+def prepare_meeting(tasks, agents, meeting_participants, meeting_context, meeting_objective, dossier=None):
+        """Run the pipeline for one meeting and return the briefing text.
+
+        dossier can be passed in when participant research was already done (batch mode).
+        """
+        from crewai import Crew
+        from research_fanout import parse_participants, research_participants
+        from compaction import compact_outputs, task_text
+        from briefing_archive import archive_enabled, get_briefing_archive
 
-        tasks = MeetingPrepTasks()
-        agents = MeetingPrepAgents()
         #create agents
-        research_agent = agents.research_agent()
         industry_analysis_agent = agents.industry_analysis_agent()
         meeting_strategy_agent = agents.meeting_strategy_agent()
         summary_and_briefing_agent = agents.summary_and_briefing_agent()
+
+        #research every participant/company concurrently, merged into one dossier
+        if dossier is None:
+                subjects = parse_participants(meeting_participants)
+                print(f"Researching {len(subjects)} participants/companies in parallel...")
+                dossier = research_participants(agents.research_agent, tasks, subjects, meeting_context)
+
         #create tasks
-        research_task = tasks.research_task(research_agent, meeting_participants, meeting_context)
         industry_analysis_task = tasks.industry_analysis_task(industry_analysis_agent, meeting_participants, meeting_context)
-        meeting_strategy_task = tasks.meeting_strategy_task(meeting_strategy_agent, meeting_context, meeting_objective)
-        summary_and_briefing_task = tasks.summary_and_briefing_task(summary_and_briefing_agent, meeting_context, meeting_objective)
+        meeting_strategy_task = tasks.meeting_strategy_task(meeting_strategy_agent, meeting_context, meeting_objective, dossier.to_markdown())
 
-        meeting_strategy_task.context= [research_task, industry_analysis_task]
-        summary_and_briefing_task.context= [research_task, industry_analysis_task, meeting_strategy_task]
+        meeting_strategy_task.context= [industry_analysis_task]
 
         #make the crew
         crew =  Crew(
             agents=[
-                  research_agent,
                     industry_analysis_agent,
                     meeting_strategy_agent,
-                    summary_and_briefing_agent,
             ],
             tasks=[
-                  research_task,
                     industry_analysis_task,
                     meeting_strategy_task,
-                    summary_and_briefing_task,
             ],
         )
-        result = crew.kickoff()
+        crew.kickoff()
+
+        #compact upstream outputs into a token-budgeted digest with chunk citations
+        digest = compact_outputs(agents.llm, {
+                "Participant dossier": dossier.to_markdown(),
+                "Industry analysis": task_text(industry_analysis_task),
+                "Meeting strategy": task_text(meeting_strategy_task),
+        })
+        summary_and_briefing_task = tasks.summary_and_briefing_task(summary_and_briefing_agent, meeting_context, meeting_objective, digest)
+        briefing_crew = Crew(
+            agents=[summary_and_briefing_agent],
+            tasks=[summary_and_briefing_task],
+        )
+        result = briefing_crew.kickoff()
+
+        #archive the briefing so later meetings with the same people start from it
+        if archive_enabled():
+                get_briefing_archive().add_briefing(meeting_context, meeting_objective, meeting_participants, str(result), dossier)
+        return str(result)
+
+def main():
+        load_dotenv()
+
+        #one shared Gemini rate limiter (RPM/TPM + adaptive concurrency) for every agent LLM
+        from hoomi_ratelimit import install_rate_limiter
+        install_rate_limiter()
+
+        #batch mode: python main.py --batch calendar.ics|meetings.csv [output_dir]
+        if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+                from batch_prep import main as batch_main
+                return batch_main(sys.argv[2:])
+
+        print("## Welcome to the Meeting Prep Crew")
+        print('-------------------------------')
+        warm_up()
+        meeting_participants = input("What are the emails for the participants (other than you) in the meet")
+        meeting_context = input("What is the context of the meeting?\n")
+        meeting_objective = input("What is your objective for this meeting?\n")
+
+        from task import MeetingPrepTasks
+        from agents import MeetingPrepAgents
+
+        tasks = MeetingPrepTasks()
+        agents = MeetingPrepAgents()
+        result = prepare_meeting(tasks, agents, meeting_participants, meeting_context, meeting_objective)
 
 if __name__ == "__main__":
     main()
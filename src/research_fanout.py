@@ -0,0 +1,203 @@
+"""
+Per-participant research fan-out for the Meeting Prep crew.
+
+Instead of one research_task looping over every participant, the raw
+participants string is parsed into subjects (people and their companies),
+one small research task runs per subject on a thread pool capped by
+RESEARCH_MAX_CONCURRENCY (default 4), and the results are merged into a
+structured dossier that meeting_strategy_task consumes.
+"""
+
+import contextvars
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+# Email domains that say nothing about the participant's company
+FREEMAIL_DOMAINS = frozenset((
+    "gmail.com", "googlemail.com", "yahoo.com", "outlook.com", "hotmail.com", "live.com",
+    "icloud.com", "me.com", "aol.com", "proton.me", "protonmail.com", "yandex.com",
+))
+
+# Public suffixes with a second level (acme.co.id -> acme, not "Co")
+SECOND_LEVEL_SUFFIXES = frozenset((
+    "co.id", "ac.id", "or.id", "go.id", "web.id", "my.id", "biz.id", "sch.id",
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "ltd.uk", "plc.uk",
+    "com.au", "net.au", "org.au", "edu.au", "co.nz", "org.nz",
+    "com.sg", "edu.sg", "com.my", "com.ph", "com.vn", "co.th", "in.th",
+    "co.jp", "ne.jp", "or.jp", "co.kr", "or.kr", "com.cn", "com.hk", "com.tw",
+    "co.in", "com.br", "com.mx", "com.ar", "co.za", "com.tr", "com.sa", "co.il",
+))
+
+_EMAIL_RE = re.compile(r"([\w.+\-]+)@([\w\-]+(?:\.[\w\-]+)+)")
+_SPLIT_RE = re.compile(r"[,;\n]+")
+_CONJUNCTION_RE = re.compile(r"\s+(?:and|dan|&)\s+", re.I)
+_NAME_WITH_COMPANY_RE = re.compile(r"^(.+?)\s*[\(\[]\s*(.+?)\s*[\)\]]$")
+_COMPANY_RE = re.compile(r"\b(inc|corp|corporation|ltd|llc|gmbh|pt|tbk|co|company|group|labs|bank)\b\.?", re.I)
+
+
+class Subject():
+    def __init__(self, name: str, kind: str, email: str = None, company: str = None):
+        self.name = name
+        self.kind = kind  # "person" or "company"
+        self.email = email
+        self.company = company
+
+    @property
+    def key(self) -> str:
+        return (self.email or f"{self.kind}:{self.name}").lower()
+
+    def label(self) -> str:
+        parts = [self.name]
+        if self.email:
+            parts.append(f"<{self.email}>")
+        if self.kind == "person" and self.company:
+            parts.append(f"({self.company})")
+        return " ".join(parts)
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "kind": self.kind, "email": self.email, "company": self.company}
+
+
+def _company_from_domain(domain: str) -> str:
+    domain = domain.lower()
+    if domain in FREEMAIL_DOMAINS:
+        return None
+    labels = domain.split(".")
+    if len(labels) < 2:
+        return None
+    # Registrable domain: acme.co.id -> acme, eng.ibm.com -> ibm, mail.acme.com -> acme
+    suffix_len = 2 if ".".join(labels[-2:]) in SECOND_LEVEL_SUFFIXES else 1
+    if len(labels) <= suffix_len:
+        return None
+    return labels[-suffix_len - 1].replace("-", " ").title()
+
+
+def _split_entries(text: str) -> list:
+    """Split on separators; "and"/"dan" only splits when every side has an email,
+    so company names like "Johnson and Johnson" stay whole."""
+    entries = []
+    for chunk in _SPLIT_RE.split(text or ""):
+        parts = _CONJUNCTION_RE.split(chunk)
+        if len(parts) > 1 and all(_EMAIL_RE.search(part) for part in parts):
+            entries.extend(parts)
+        else:
+            entries.append(chunk)
+    return entries
+
+
+def _name_from_local(local: str) -> str:
+    parts = [p for p in re.split(r"[._\-+]+", local) if p and not p.isdigit()]
+    return " ".join(p.capitalize() for p in parts) or local
+
+
+def parse_participants(text) -> list:
+    """Split the participants string into people and the companies behind them.
+
+    text may also be a list with one participant per item (e.g. calendar
+    attendees); items are never re-split, so "Doe, John <john@acme.com>"
+    stays one person.
+    """
+    people, companies = [], {}
+    entries = _split_entries(text) if isinstance(text, str) or text is None else list(text)
+    for raw in entries:
+        entry = raw.strip().strip("<>\"'")
+        if not entry:
+            continue
+
+        email_match = _EMAIL_RE.search(entry)
+        if email_match:
+            email = email_match.group(0).lower()
+            name = entry[:email_match.start()].strip().strip("<>\"' ") or _name_from_local(email_match.group(1))
+            company = _company_from_domain(email_match.group(2))
+            people.append(Subject(name, "person", email=email, company=company))
+        else:
+            match = _NAME_WITH_COMPANY_RE.match(entry)
+            if match:
+                people.append(Subject(match.group(1), "person", company=match.group(2)))
+            elif _COMPANY_RE.search(entry):
+                companies.setdefault(entry.lower(), Subject(entry, "company"))
+                continue
+            else:
+                people.append(Subject(entry, "person"))
+
+        company = people[-1].company
+        if company:
+            companies.setdefault(company.lower(), Subject(company, "company"))
+
+    subjects, seen = [], set()
+    for subject in people + list(companies.values()):
+        if subject.key not in seen:
+            seen.add(subject.key)
+            subjects.append(subject)
+    return subjects
+
+
+class Dossier():
+    def __init__(self):
+        self.entries = []
+
+    def add(self, subject: Subject, findings: str, error: str = None):
+        self.entries.append({"subject": subject, "findings": findings, "error": error})
+
+    def subset(self, subjects: list):
+        """Dossier restricted to subjects (by key), e.g. one meeting of a batch."""
+        keys = {subject.key for subject in subjects}
+        dossier = Dossier()
+        dossier.entries = [entry for entry in self.entries if entry["subject"].key in keys]
+        return dossier
+
+    def to_dict(self) -> dict:
+        return {"participants": [
+            dict(entry["subject"].to_dict(), findings=entry["findings"], error=entry["error"])
+            for entry in self.entries
+        ]}
+
+    def to_markdown(self) -> str:
+        lines = ["# Participant Dossier"]
+        for kind, title in (("person", "People"), ("company", "Companies")):
+            entries = [e for e in self.entries if e["subject"].kind == kind]
+            if not entries:
+                continue
+            lines.append(f"\n## {title}")
+            for entry in entries:
+                lines.append(f"\n### {entry['subject'].label()}")
+                if entry["error"]:
+                    lines.append(f"_Research failed: {entry['error']}_")
+                else:
+                    lines.append(entry["findings"].strip())
+        return "\n".join(lines)
+
+
+def research_participants(make_agent, tasks, subjects: list, meeting_context: str,
+                          max_concurrency: int = None) -> Dossier:
+    """Run one research subtask per subject concurrently and merge into a Dossier.
+
+    make_agent is called once per subtask so agents never share executor state.
+    meeting_context may also be a {subject.key: context} dict when subjects
+    come from several meetings.
+    """
+    if max_concurrency is None:
+        max_concurrency = int(os.getenv("RESEARCH_MAX_CONCURRENCY", 4))
+
+    def research(subject):
+        agent = make_agent()
+        context = meeting_context.get(subject.key, "") if isinstance(meeting_context, dict) else meeting_context
+        task = tasks.participant_research_task(agent, subject.label(), subject.kind, context)
+        return str(agent.execute_task(task))
+
+    dossier = Dossier()
+    if not subjects:
+        return dossier
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(subjects))),
+                            thread_name_prefix="meeting-research") as pool:
+        # Copy the caller's context per task so the rate-limit session follows into the workers
+        futures = [(subject, pool.submit(contextvars.copy_context().run, research, subject))
+                   for subject in subjects]
+        for subject, future in futures:
+            try:
+                dossier.add(subject, future.result())
+            except Exception as e:
+                dossier.add(subject, "", error=str(e))
+    return dossier
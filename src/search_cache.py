@@ -0,0 +1,231 @@
+"""
+Shared on-disk cache for Exa searches used by the Meeting Prep crew.
+
+research_agent and industry_analysis_agent often issue overlapping queries
+about the same participants and companies, within one run and across
+briefings. Results are stored in a small SQLite file keyed by a normalized
+query so both agents and every later run reuse them:
+
+- Keys: lowercase, NFKC, punctuation stripped, tokens de-duplicated and
+  sorted ("Acme Corp news" == "news: ACME corp"), plus any extra search
+  arguments (dates, domains)
+- TTL: EXA_CACHE_TTL_HOURS (default 12h); queries asking for news/latest
+  use EXA_CACHE_NEWS_TTL_HOURS (default 2h) so fresh items are re-fetched
+- Size bound: EXA_CACHE_MAX_MB (default 50), least recently used first
+- EXA_CACHE=0 disables the cache, EXA_FAKE=1 swaps Exa for FakeExaBackend
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+DEFAULT_CACHE_PATH = os.getenv(
+    "EXA_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".hoomi", "exa_cache.db")
+)
+
+_NEWS_WORDS = frozenset(("news", "latest", "recent", "today", "announcement", "announces", "this week"))
+_TOKEN_RE = re.compile(r"[\w@.\-]+", re.UNICODE)
+
+
+def normalize_query(query: str) -> str:
+    text = unicodedata.normalize("NFKC", str(query or "")).lower()
+    tokens = {token.strip(".-") for token in _TOKEN_RE.findall(text)}
+    return " ".join(sorted(token for token in tokens if token))
+
+
+def cache_key(query: str, options: dict = None) -> str:
+    payload = {"q": normalize_query(query)}
+    for name, value in sorted((options or {}).items()):
+        if value in (None, "", [], ()):
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = sorted(str(v).lower() for v in value)
+        payload[name] = value
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class SearchCache():
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: float = 12 * 3600,
+                 news_ttl_seconds: float = 2 * 3600, max_bytes: int = 50 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.news_ttl_seconds = news_ttl_seconds
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        self._inflight = {}
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS searches (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS searches_lru ON searches(last_access)")
+        self._conn.commit()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            ttl_seconds=float(os.getenv("EXA_CACHE_TTL_HOURS", 12)) * 3600,
+            news_ttl_seconds=float(os.getenv("EXA_CACHE_NEWS_TTL_HOURS", 2)) * 3600,
+            max_bytes=int(float(os.getenv("EXA_CACHE_MAX_MB", 50)) * 1024 * 1024),
+        )
+
+    def ttl_for(self, query: str) -> float:
+        lowered = str(query or "").lower()
+        if any(word in lowered for word in _NEWS_WORDS):
+            return min(self.news_ttl_seconds, self.ttl_seconds)
+        return self.ttl_seconds
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, expires_at FROM searches WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM searches WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats["expired"] += 1
+                return None
+            self._conn.execute("UPDATE searches SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key: str, query: str, result: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, str(query), result, now, now + self.ttl_for(query), now, len(result.encode()))
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        self._conn.execute("DELETE FROM searches WHERE expires_at <= ?", (now,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM searches").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+                "SELECT key, size FROM searches ORDER BY last_access ASC").fetchall():
+            self._conn.execute("DELETE FROM searches WHERE key = ?", (key,))
+            self.stats["evicted"] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def fetch(self, query: str, options: dict, search):
+        """Return the cached result for query/options, or run search() and store it.
+
+        Concurrent callers asking for the same key wait for the first search
+        instead of hitting Exa twice.
+        """
+        key = cache_key(query, options)
+        cached = self.get(key)
+        if cached is not None:
+            self._count("hits")
+            return cached
+
+        with self._lock:
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._inflight[key] = threading.Event()
+        if not owner:
+            pending.wait()
+            cached = self.get(key)
+            if cached is not None:
+                self._count("hits")
+                return cached
+
+        self._count("misses")
+        try:
+            result = search()
+            text = result if isinstance(result, str) else _to_text(result)
+            self.put(key, query, text)
+            return text
+        finally:
+            if owner:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                pending.set()
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM searches")
+            self._conn.commit()
+
+    def summary(self) -> str:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        ratio = self.stats["hits"] / lookups if lookups else 0.0
+        return (f"Search cache: {self.stats['hits']} hits / {self.stats['misses']} misses "
+                f"({ratio:.0%} hit rate, {self.stats['expired']} expired, {self.stats['evicted']} evicted)")
+
+
+def _to_text(result) -> str:
+    try:
+        return json.dumps(result, default=str)
+    except (TypeError, ValueError):
+        return str(result)
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    # One cache per process, shared by every agent's search tool
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = SearchCache.from_env()
+        return _shared_cache
+
+
+class FakeExaBackend():
+    """Deterministic offline stand-in for Exa (tests, benchmarks, demos)."""
+
+    def __init__(self, latency_seconds: float = 0.0, results_per_query: int = 3):
+        self.latency_seconds = latency_seconds
+        self.results_per_query = results_per_query
+        self.calls = 0
+
+    def search(self, search_query: str, **options) -> str:
+        self.calls += 1
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        seed = int(hashlib.sha1(normalize_query(search_query).encode()).hexdigest()[:8], 16)
+        rng = random.Random(seed)
+        subject = search_query.strip() or "unknown"
+        results = []
+        for i in range(self.results_per_query):
+            day = rng.randint(1, 28)
+            results.append({
+                "title": f"{subject} - update #{i + 1}",
+                "url": f"https://example.com/{seed:x}/{i + 1}",
+                "published_date": f"2024-{rng.randint(1, 12):02d}-{day:02d}",
+                "text": (f"{subject} was mentioned in a report about partnerships, funding "
+                         f"and product launches (item {i + 1})."),
+            })
+        return json.dumps({"query": search_query, "results": results})
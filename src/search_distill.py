@@ -0,0 +1,278 @@
+"""
+Distill raw Exa results into a few relevant passages before the agent sees them.
+
+Exa returns whole page texts, most of it navigation, cookie banners and
+near-identical syndicated copies of the same article. For every search:
+
+1. Results are parsed (JSON, Exa SearchResponse objects or their
+   "Title:/URL:/Text:" string form)
+2. Boilerplate lines are stripped: known nav/cookie/subscribe phrases
+   and short menu-like lines
+3. Near-duplicate articles are dropped with 64-bit SimHash over word
+   shingles (Hamming distance <= DISTILL_SIMHASH_DISTANCE, default 3);
+   only then are lines repeated across the remaining (distinct) results
+   stripped, so syndicated copies cannot erase each other's content
+4. Texts are split into ~DISTILL_PASSAGE_WORDS word passages on sentence
+   boundaries and ranked with BM25 against the query (+ title match)
+5. The best passages with a non-zero score are kept under
+   DISTILL_TOKEN_BUDGET (default 600)
+
+DISTILL=0 passes results through unchanged.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_FIELD_RE = re.compile(r"^(Title|URL|Url|ID|Score|Published Date|Author|Text|Highlights|Summary):\s?(.*)$")
+_BOILERPLATE_RE = re.compile(
+    r"cookie|subscribe|sign up|sign in|log in|newsletter|all rights reserved|privacy policy|"
+    r"terms of (use|service)|advertisement|share this|follow us|read more|click here|"
+    r"accept all|skip to (main )?content|related articles|back to top",
+    re.I,
+)
+_STOPWORDS = frozenset((
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "at", "by", "from",
+    "is", "are", "was", "were", "be", "as", "that", "this", "it", "its", "about", "into",
+))
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text or "") // 4 + 1
+
+
+def _terms(text: str) -> list:
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+
+
+# ==========================================
+# PARSING
+# ==========================================
+
+def parse_results(raw) -> list:
+    """Normalize any Exa result shape into [{title, url, published, text}]."""
+    if hasattr(raw, "results"):
+        return [_from_object(item) for item in raw.results]
+    if isinstance(raw, (list, dict)):
+        items = raw.get("results", [raw]) if isinstance(raw, dict) else raw
+        return [_from_mapping(item) for item in items if isinstance(item, dict)]
+
+    text = str(raw or "")
+    try:
+        decoded = json.loads(text)
+    except ValueError:
+        decoded = None
+    if isinstance(decoded, (list, dict)):
+        return parse_results(decoded)
+    if isinstance(decoded, str):
+        text = decoded  # json.dumps(str(SearchResponse)) from the search cache
+    return _from_text(text)
+
+
+def _from_object(item) -> dict:
+    text = getattr(item, "text", None) or " ".join(getattr(item, "highlights", None) or [])
+    return {
+        "title": getattr(item, "title", "") or "",
+        "url": getattr(item, "url", "") or "",
+        "published": getattr(item, "published_date", "") or "",
+        "text": text or "",
+    }
+
+
+def _from_mapping(item: dict) -> dict:
+    text = item.get("text") or " ".join(item.get("highlights") or []) or item.get("summary") or ""
+    return {
+        "title": item.get("title") or "",
+        "url": item.get("url") or "",
+        "published": item.get("published_date") or item.get("publishedDate") or "",
+        "text": text,
+    }
+
+
+def _from_text(text: str) -> list:
+    documents, current, field = [], None, None
+    for line in text.splitlines():
+        match = _FIELD_RE.match(line.strip())
+        if match:
+            name, value = match.group(1).lower(), match.group(2)
+            if name == "title":
+                current = {"title": value, "url": "", "published": "", "text": ""}
+                documents.append(current)
+                field = None
+                continue
+            if current is None:
+                current = {"title": "", "url": "", "published": "", "text": ""}
+                documents.append(current)
+            if name in ("url",):
+                current["url"] = value
+            elif name == "published date":
+                current["published"] = value
+            elif name in ("text", "highlights", "summary"):
+                current["text"] += value + "\n"
+                field = "text"
+            continue
+        if current is not None and field == "text":
+            current["text"] += line + "\n"
+    if not documents and text.strip():
+        documents.append({"title": "", "url": "", "published": "", "text": text})
+    return documents
+
+
+# ==========================================
+# BOILERPLATE & NEAR-DUPLICATES
+# ==========================================
+
+def _strip_lines(doc: dict, keep=lambda line: True):
+    kept = []
+    for line in doc["text"].splitlines():
+        stripped = line.strip()
+        if stripped and keep(stripped):
+            kept.append(stripped)
+    doc["text"] = "\n".join(kept)
+
+
+def _is_content_line(line: str) -> bool:
+    words = line.split()
+    if len(words) < 15 and _BOILERPLATE_RE.search(line):
+        return False
+    if len(words) < 4 and not line.endswith((".", "!", "?")):
+        return False  # Menu items, breadcrumbs, bylines
+    return True
+
+
+def strip_repeated(documents: list) -> list:
+    """Drop short lines shared by several results (site headers/footers).
+
+    Run on de-duplicated documents only: near-duplicate copies of one
+    article share their whole body, not just the chrome around it.
+    """
+    line_docs = Counter()
+    for doc in documents:
+        for line in {l.strip().lower() for l in doc["text"].splitlines() if l.strip()}:
+            line_docs[line] += 1
+
+    repeated_threshold = 2 if len(documents) >= 3 else len(documents) + 1
+    for doc in documents:
+        _strip_lines(doc, lambda line: line_docs[line.lower()] < repeated_threshold or len(line.split()) >= 30)
+    return documents
+
+
+def strip_boilerplate(documents: list) -> list:
+    """Drop nav/cookie/subscribe and menu-like lines within each result.
+
+    Per-document only; lines repeated across results are left to
+    strip_repeated, after dedupe.
+    """
+    for doc in documents:
+        _strip_lines(doc, _is_content_line)
+    return documents
+
+
+def simhash(text: str, shingle: int = 3) -> int:
+    words = _terms(text)
+    weights = [0] * 64
+    grams = [" ".join(words[i:i + shingle]) for i in range(max(len(words) - shingle + 1, 1))]
+    for gram in grams:
+        h = int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def dedupe(documents: list, max_distance: int = 3) -> list:
+    kept, hashes = [], []
+    for doc in documents:
+        if not doc["text"].strip():
+            continue
+        fingerprint = simhash(doc["text"])
+        if any(bin(fingerprint ^ other).count("1") <= max_distance for other in hashes):
+            continue
+        hashes.append(fingerprint)
+        kept.append(doc)
+    return kept
+
+
+# ==========================================
+# PASSAGES & RANKING
+# ==========================================
+
+def split_passages(doc: dict, max_words: int = 90) -> list:
+    passages, current, size = [], [], 0
+    for sentence in _SENTENCE_RE.split(doc["text"].replace("\n", " ")):
+        words = len(sentence.split())
+        if current and size + words > max_words:
+            passages.append(" ".join(current))
+            current, size = [], 0
+        current.append(sentence.strip())
+        size += words
+    if current:
+        passages.append(" ".join(current))
+    return [{"doc": doc, "text": p} for p in passages if p]
+
+
+def rank_passages(query: str, passages: list, k1: float = 1.2, b: float = 0.75) -> list:
+    query_terms = set(_terms(query))
+    if not passages:
+        return []
+    tokenized = [_terms(p["text"]) for p in passages]
+    avg_len = sum(len(t) for t in tokenized) / len(tokenized) or 1
+    df = Counter(term for terms in tokenized for term in set(terms) & query_terms)
+    n = len(passages)
+
+    for passage, terms in zip(passages, tokenized):
+        tf = Counter(terms)
+        score = 0.0
+        for term in query_terms:
+            if not tf[term]:
+                continue
+            idf = math.log(1 + (n - df[term] + 0.5) / (df[term] + 0.5))
+            score += idf * tf[term] * (k1 + 1) / (tf[term] + k1 * (1 - b + b * len(terms) / avg_len))
+        title_terms = set(_terms(passage["doc"]["title"]))
+        passage["score"] = score + 0.5 * len(query_terms & title_terms)
+    return sorted(passages, key=lambda p: -p["score"])
+
+
+def distill(query: str, raw, token_budget: int = None, max_per_doc: int = 2) -> str:
+    """Top passages for query from raw Exa results, formatted for the agent."""
+    if os.getenv("DISTILL", "1") == "0":
+        return raw if isinstance(raw, str) else str(raw)
+    token_budget = token_budget or int(os.getenv("DISTILL_TOKEN_BUDGET", 600))
+    max_words = int(os.getenv("DISTILL_PASSAGE_WORDS", 90))
+    max_distance = int(os.getenv("DISTILL_SIMHASH_DISTANCE", 3))
+
+    documents = strip_boilerplate(parse_results(raw))
+    documents = strip_repeated(dedupe(documents, max_distance))
+    passages = [p for doc in documents for p in split_passages(doc, max_words)]
+    ranked = [p for p in rank_passages(query, passages) if p["score"] > 0]
+
+    selected, per_doc, used, seen = [], Counter(), 0, set()
+    for passage in ranked:
+        doc_id = id(passage["doc"])
+        cost = estimate_tokens(passage["text"])
+        if per_doc[doc_id] >= max_per_doc or used + cost > token_budget or passage["text"] in seen:
+            continue
+        seen.add(passage["text"])
+        selected.append(passage)
+        per_doc[doc_id] += 1
+        used += cost
+
+    if not selected:
+        return f"No relevant results for: {query}"
+
+    # Group by source, in rank order of each source's best passage
+    order = []
+    for passage in selected:
+        if passage["doc"] not in order:
+            order.append(passage["doc"])
+    blocks = []
+    for i, doc in enumerate(order, start=1):
+        meta = ", ".join(part for part in (doc["url"], doc["published"][:10]) if part)
+        lines = [f"[{i}] {doc['title'] or 'Untitled'}" + (f" ({meta})" if meta else "")]
+        lines += [f"- {p['text']}" for p in selected if p["doc"] is doc]
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
@@ -43,21 +43,40 @@ class MeetingPrepTasks():
             agent=agent
         )
 
-    def meeting_strategy_task(self, agent, meeting_context, meeting_objective):
+    def participant_research_task(self, agent, subject, subject_kind, meeting_context):
+        return Task(
+            description=dedent(f"""\
+                Research this single {subject_kind} ahead of the meeting. Gather
+                recent news, achievements, professional background and any
+                business activities relevant to the meeting context. Stay focused
+                on this {subject_kind} only.
+                If the BriefingArchiveSearch tool is available, query it first
+                (with the email or company when known) and use the internet search
+                only for missing facts or archived items marked STALE.
+
+                Subject: {subject}
+                Meeting Context: {meeting_context}"""),
+            expected_output=dedent("""\
+                A concise bullet list of key facts about the subject, each with
+                its source URL when available."""),
+            agent=agent
+        )
+
+    def meeting_strategy_task(self, agent, meeting_context, meeting_objective, dossier=None):
         return Task(
             description=dedent(f"""\
                 Develop strategic talking points, questions, and discussion angles
                 for the meeting based on the research and industry analysis conducted
 
                 Meeting Context: {meeting_context}
-                Meeting Objective: {meeting_objective}"""),
+                Meeting Objective: {meeting_objective}""") + _extra_section(dossier),
             expected_output=dedent("""\
                 Complete report with a list of key talking points, strategic questions
                 to ask to help achieve the meetings objective during the meeting."""),
             agent=agent
         )
 
-    def summary_and_briefing_task(self, agent, meeting_context, meeting_objective):
+    def summary_and_briefing_task(self, agent, meeting_context, meeting_objective, digest=None):
         return Task(
             description=dedent(f"""\
                 Compile all the research findings, industry analysis, and strategic
@@ -67,10 +86,17 @@ class MeetingPrepTasks():
                 participants with all necessary information and strategies.
 
                 Meeting Context: {meeting_context}
-                Meeting Objective: {meeting_objective}"""),
+                Meeting Objective: {meeting_objective}""") + _extra_section(digest),
             expected_output=dedent("""\
                 A well-structured briefing document that includes sections for
                 participant bios, industry overview, talking points, and
                 strategic recommendations."""),
             agent=agent
-        )
\ No newline at end of file
+        )
+
+
+def _extra_section(text):
+    # Dossier (research_fanout) or compacted digest (compaction) appended to a description
+    if not text:
+        return ""
+    return "\n\n" + text
@@ -1,5 +1,61 @@
 import os
+from functools import lru_cache
+from typing import Optional, Type
+
+from crewai.tools import BaseTool
 from crewai_tools import EXASearchTool
+from pydantic import BaseModel, Field
+
+from briefing_archive import archive_enabled, format_hits, get_briefing_archive
+from search_cache import FakeExaBackend, get_search_cache
+from search_distill import distill
+
+
+class _CachedSearch():
+    # Routes every search through the shared on-disk cache (see search_cache.py),
+    # then hands the agent only the top passages (see search_distill.py)
+    def _run(self, *args, **kwargs):
+        query = kwargs.get("search_query", args[0] if args else "")
+        options = {k: v for k, v in kwargs.items() if k != "search_query"}
+        parent_run = super()._run
+        raw = get_search_cache().fetch(query, options, lambda: parent_run(*args, **kwargs))
+        return distill(query, raw)
+
+
+class CachedEXASearchTool(_CachedSearch, EXASearchTool):
+    pass
+
+
+class FakeExaSearchSchema(BaseModel):
+    search_query: str = Field(..., description="Mandatory search query you want to use to search the internet")
+
+
+class FakeExaSearchTool(BaseTool):
+    name: str = "EXASearchTool"
+    description: str = "Search the internet using Exa (offline fake backend)"
+    args_schema: Type[BaseModel] = FakeExaSearchSchema
+
+    def _run(self, search_query: str, **options) -> str:
+        return _fake_backend().search(search_query, **options)
+
+
+class CachedFakeExaSearchTool(_CachedSearch, FakeExaSearchTool):
+    pass
+
+
+@lru_cache(maxsize=None)
+def _fake_backend():
+    return FakeExaBackend(latency_seconds=float(os.getenv("EXA_FAKE_LATENCY_S", 0)))
+
+
+@lru_cache(maxsize=None)
+def _search_tool():
+    # A single instance is shared by research_agent and industry_analysis_agent
+    fake = os.getenv("EXA_FAKE", "0") == "1"
+    if os.getenv("EXA_CACHE", "1") == "0":
+        return FakeExaSearchTool() if fake else EXASearchTool()
+    return CachedFakeExaSearchTool() if fake else CachedEXASearchTool()
+
 
 class ExaSearchToolSet():
     @staticmethod
@@ -7,5 +63,31 @@ class ExaSearchToolSet():
         # Use the built-in EXASearchTool from crewai_tools
         # It will automatically use the EXA_API_KEY from environment variables
         return [
-            EXASearchTool(),
-        ]
\ No newline at end of file
+            _search_tool(),
+        ]
+
+
+class BriefingArchiveSchema(BaseModel):
+    query: str = Field(..., description="What you want to know, e.g. a name, company or topic")
+    email: Optional[str] = Field(None, description="Participant email to restrict the lookup to")
+    company: Optional[str] = Field(None, description="Company name to restrict the lookup to")
+
+
+class BriefingArchiveTool(BaseTool):
+    name: str = "BriefingArchiveSearch"
+    description: str = (
+        "Search briefings from earlier meetings before searching the internet. "
+        "Results marked STALE, and anything not found, should be checked with the Exa search tool."
+    )
+    args_schema: Type[BaseModel] = BriefingArchiveSchema
+
+    def _run(self, query: str, email: Optional[str] = None, company: Optional[str] = None) -> str:
+        hits = get_briefing_archive().search(query, email=email, company=company)
+        return format_hits(hits, query)
+
+
+class BriefingArchiveToolSet():
+    @staticmethod
+    def tools():
+        # Local archive of past briefings, queried before Exa (see briefing_archive.py)
+        return [BriefingArchiveTool()] if archive_enabled() else []